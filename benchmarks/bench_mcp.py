@@ -0,0 +1,370 @@
+"""
+Load test the orchestrator MCP server over its streamable HTTP transport.
+
+Virtual users each open an MCP session and call tools picked from a weighted
+mix until the request budget or the duration is spent; throughput and
+p50/p95/p99 latency are reported per tool.
+
+By default the server is started locally with benchmarks/stub_server.py and a
+stub `java` first on PATH, so no JVM, browser or network is needed:
+
+    python benchmarks/bench_mcp.py --concurrency 16 --requests 2000
+    python benchmarks/bench_mcp.py --mix compile_workflow=3,get_schema_rules=1
+    python benchmarks/bench_mcp.py --url http://localhost:8000/mcp --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+from fastmcp import Client
+
+ROOT = Path(__file__).parent.parent
+EXAMPLES_DIR = ROOT / "tools" / "examples"
+STUBS_DIR = Path(__file__).parent / "stubs"
+
+TOOL_PREFIX = "orchestrator_"
+
+DEFAULT_MIX = (
+    "compile_workflow=4,validate_workflow_schema=3,preview_workflow=2,"
+    "get_schema_rules=2,creation_workflow_rules=1,get_sample_workflow=1,"
+    "search_sample_workflows=1"
+)
+
+SEARCH_QUERIES = [
+    "call a REST API and retry on failure",
+    "loop over a list of users",
+    "run a job every night at midnight",
+    "branch on the request status",
+]
+
+
+def extract_workflow(example_output: str) -> dict:
+    """The workflow of an example answer, i.e. its fenced JSON block."""
+    match = re.search(r"```json\n(.*?)```", example_output, re.DOTALL)
+    return json.loads(match.group(1) if match else example_output)
+
+
+class Workload:
+    """Arguments for every tool, built from the example workflows."""
+
+    def __init__(self, cache_miss_ratio: float, rng: random.Random):
+        self.cache_miss_ratio = cache_miss_ratio
+        self.rng = rng
+        self.categories = sorted(
+            path.name.removesuffix("_output.txt")
+            for path in EXAMPLES_DIR.glob("*_output.txt")
+        )
+        self.workflows = [
+            extract_workflow((EXAMPLES_DIR / f"{category}_output.txt").read_text())
+            for category in self.categories
+        ]
+
+    def workflow(self) -> str:
+        # A unique description changes the content hash, i.e. misses every cache
+        workflow = dict(self.rng.choice(self.workflows))
+        if self.rng.random() < self.cache_miss_ratio:
+            workflow["description"] = f"bench {uuid.uuid4()}"
+        return json.dumps(workflow)
+
+    def arguments(self, tool: str, session_id: str) -> dict:
+        args = {"session_id": session_id}
+        if tool in ("compile_workflow", "validate_workflow_schema"):
+            args["workflow"] = self.workflow()
+        elif tool == "preview_workflow":
+            args["workflow"] = self.workflow()
+            args["mode"] = self.rng.choice(["full", "fast"])
+        elif tool == "compile_workflows_batch":
+            args["workflows"] = [self.workflow() for _ in range(4)]
+        elif tool == "get_schema_rules":
+            if self.rng.random() < 0.5:
+                args["state_types"] = [self.rng.choice(["operation", "switch"])]
+        elif tool == "creation_workflow_rules":
+            args["summary"] = self.rng.random() < 0.5
+        elif tool == "get_sample_workflow":
+            args["category"] = self.rng.choice(self.categories)
+        elif tool == "search_sample_workflows":
+            args["query"] = self.rng.choice(SEARCH_QUERIES)
+        return args
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        tool, _, weight = item.strip().partition("=")
+        weights[tool.removeprefix(TOOL_PREFIX)] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Results:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.first_error: dict[str, str] = {}
+
+    def record(self, tool: str, latency: float, error: str | None = None):
+        self.latencies[tool].append(latency)
+        if error is not None:
+            self.errors[tool] += 1
+            self.first_error.setdefault(tool, error)
+
+    def summary(self, elapsed: float) -> dict:
+        tools = {}
+        for tool in sorted(self.latencies):
+            latencies = sorted(self.latencies[tool])
+            tools[tool] = {
+                "requests": len(latencies),
+                "errors": self.errors[tool],
+                "throughput": len(latencies) / elapsed,
+                "mean_ms": sum(latencies) / len(latencies) * 1000,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "max_ms": latencies[-1] * 1000,
+            }
+        total = sum(len(latencies) for latencies in self.latencies.values())
+        return {
+            "elapsed": elapsed,
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "throughput": total / elapsed if elapsed else 0.0,
+            "tools": tools,
+            "first_errors": self.first_error,
+        }
+
+
+def print_summary(summary: dict):
+    header = (
+        f"{'tool':<28} {'reqs':>7} {'errs':>5} {'req/s':>8} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    for tool, stats in summary["tools"].items():
+        print(
+            f"{tool:<28} {stats['requests']:>7} {stats['errors']:>5} "
+            f"{stats['throughput']:>8.1f} {stats['p50_ms']:>9.1f} "
+            f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+            f"{stats['max_ms']:>9.1f}"
+        )
+    print("-" * len(header))
+    print(
+        f"{summary['requests']} requests, {summary['errors']} errors in "
+        f"{summary['elapsed']:.1f}s: {summary['throughput']:.1f} req/s"
+    )
+    for tool, error in summary["first_errors"].items():
+        print(f"first {tool} error: {error[:200]}")
+
+
+async def virtual_user(
+    user: int,
+    url: str,
+    workload: Workload,
+    weights: dict[str, float],
+    budget: "Budget",
+    results: Results,
+):
+    tools = list(weights)
+    session_id = f"bench-{user}"
+    async with Client(url, timeout=120) as client:
+        while budget.take():
+            tool = workload.rng.choices(tools, weights=list(weights.values()))[0]
+            arguments = workload.arguments(tool, session_id)
+            started = time.perf_counter()
+            error = None
+            try:
+                result = await client.call_tool_mcp(TOOL_PREFIX + tool, arguments)
+                if result.isError:
+                    error = " ".join(
+                        getattr(content, "text", "") for content in result.content
+                    )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            results.record(tool, time.perf_counter() - started, error)
+
+
+class Budget:
+    """Stops the virtual users after `requests` calls or `duration` seconds."""
+
+    def __init__(self, requests: int | None, duration: float | None):
+        self.remaining = requests
+        self.deadline = time.monotonic() + duration if duration else None
+
+    def take(self) -> bool:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return False
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+        return True
+
+
+async def check_tools(url: str, weights: dict[str, float]):
+    async with Client(url) as client:
+        available = {
+            tool.name.removeprefix(TOOL_PREFIX) for tool in await client.list_tools()
+        }
+    unknown = sorted(set(weights) - available)
+    if unknown:
+        raise SystemExit(
+            f"Unknown tools in --mix: {', '.join(unknown)}; "
+            f"available: {', '.join(sorted(available))}"
+        )
+
+
+async def run(args) -> dict:
+    weights = parse_mix(args.mix)
+    await check_tools(args.url, weights)
+
+    workload = Workload(args.cache_miss_ratio, random.Random(args.seed))
+
+    if args.warmup:
+        await asyncio.gather(
+            *(
+                virtual_user(
+                    -1, args.url, workload, {tool: 1}, Budget(1, None), Results()
+                )
+                for tool in weights
+            )
+        )
+
+    results = Results()
+    budget = Budget(args.requests if not args.duration else None, args.duration)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            virtual_user(user, args.url, workload, weights, budget, results)
+            for user in range(args.concurrency)
+        )
+    )
+    summary = results.summary(time.perf_counter() - started)
+    summary["config"] = {
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "cache_miss_ratio": args.cache_miss_ratio,
+        "seed": args.seed,
+    }
+    return summary
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, log) -> subprocess.Popen:
+    env = dict(os.environ)
+    env["PATH"] = f"{STUBS_DIR}{os.pathsep}{env.get('PATH', '')}"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(Path(__file__).parent / "stub_server.py"),
+            "--port",
+            str(port),
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"Server exited with code {process.returncode}")
+        try:
+            # Ready once the subsystems in ORCHESTRATOR_PREWARM are warm
+            if httpx.get(f"http://127.0.0.1:{port}/ready", timeout=1).is_success:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("Server was not ready within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--url", help="MCP endpoint of a running server, e.g. http://host:8000/mcp"
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users")
+    parser.add_argument("--requests", type=int, default=500, help="total tool calls")
+    parser.add_argument(
+        "--duration", type=float, help="run for this many seconds instead"
+    )
+    parser.add_argument(
+        "--mix", default=DEFAULT_MIX, help="tool=weight pairs, comma separated"
+    )
+    parser.add_argument(
+        "--cache-miss-ratio",
+        type=float,
+        default=0.2,
+        help="share of workflows made unique so they miss the caches",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        dest="warmup",
+        action="store_false",
+        help="do not call every tool once before measuring",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    parser.add_argument(
+        "--server-log",
+        type=Path,
+        default=Path("bench_server.log"),
+        help="output of the server started by the benchmark",
+    )
+    args = parser.parse_args()
+
+    server = None
+    log = None
+    if args.url is None:
+        port = free_port()
+        log = args.server_log.open("w")
+        server = start_server(port, log)
+        args.url = f"http://127.0.0.1:{port}/mcp"
+
+    try:
+        summary = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+            log.close()
+
+    print_summary(summary)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n")
+    sys.exit(1 if summary["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
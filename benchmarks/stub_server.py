@@ -0,0 +1,65 @@
+"""
+The MCP server of mcp_server.py with the browser renderer replaced by a stub,
+for load testing without Chromium. Compilation goes through whatever `java`
+is first on PATH; bench_mcp.py puts benchmarks/stubs first.
+
+    python benchmarks/stub_server.py --port 8000
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import sys
+from pathlib import Path
+
+import uvicorn
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import mcp_server  # noqa: E402
+from tools import orchestrator_workflow_renderer  # noqa: E402
+
+# Seconds spent per render, roughly what a warm editor page takes
+RENDER_LATENCY = float(os.environ.get("STUB_RENDER_LATENCY", "0.2"))
+
+# 1x1 transparent PNG
+PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA"
+    "60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class StubRenderer(orchestrator_workflow_renderer.WorkflowRenderer):
+    """
+    Keeps the render cache and in-flight deduplication of the real renderer,
+    only the browser and the rasterization are replaced by a fixed delay.
+    """
+
+    @property
+    def ready(self):
+        # There is no browser to start, the stub is always warm
+        return True
+
+    async def warm_up(self):
+        pass
+
+    async def _render_png_file(self, workflow_data: str, native: bool) -> str:
+        await asyncio.sleep(RENDER_LATENCY / 10 if native else RENDER_LATENCY)
+        png_path = self.artifacts.new_path(".png")
+        png_path.write_bytes(PNG)
+        return str(png_path)
+
+
+orchestrator_workflow_renderer._renderer = StubRenderer()
+
+app = mcp_server.app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -1,10 +1,30 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager, suppress
+from typing import Literal
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastmcp import FastMCP
 
+from tools.orchestrator_artifact_store import artifact_store
+from tools.orchestrator_compile_workflow import (
+    compile_cache,
+    compile_daemons_running,
+    compile_queue,
+    stop_compile_daemons,
+    warm_up_compiler,
+)
+from tools.orchestrator_example_store import example_store
+from tools.orchestrator_get_schema_rules import get_schema_index
+from tools.orchestrator_metrics import CONTENT_TYPE, ToolMetricsMiddleware, metrics
+from tools.orchestrator_prewarm import Prewarmer, Subsystem
+from tools.orchestrator_schema_artifact import get_schema_artifact
 from tools.orchestrator_service import orchestrator_mcp
+from tools.orchestrator_session_workspace import workspaces
+from tools.orchestrator_validate_workflow_schema import get_schema_validator
+from tools.orchestrator_workflow_renderer import get_renderer, stop_renderer
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -13,9 +33,233 @@ logger = logging.getLogger(__name__)
 
 mcp = FastMCP(name="Current Date and Time", port=8000)
 mcp.mount(orchestrator_mcp, prefix="orchestrator")
+mcp.add_middleware(ToolMetricsMiddleware())
 
 mcp_app = mcp.http_app()
 
-app = FastAPI(lifespan=mcp_app.lifespan)
-app.mount("/static", StaticFiles(directory="assets/workflows/"), name="static")
+
+def _load_schema():
+    get_schema_artifact()
+    get_schema_index()
+    get_schema_validator()
+
+
+prewarmer = Prewarmer(
+    [
+        Subsystem(
+            "schema",
+            lambda: asyncio.to_thread(_load_schema),
+            lambda: get_schema_validator.cache_info().currsize > 0,
+        ),
+        Subsystem(
+            "examples",
+            lambda: asyncio.to_thread(example_store.categories),
+            lambda: example_store.reloads > 0,
+        ),
+        Subsystem(
+            "browser",
+            lambda: get_renderer().warm_up(),
+            lambda: get_renderer().ready,
+        ),
+        Subsystem("compiler", warm_up_compiler, compile_daemons_running),
+    ]
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prewarmer.start()
+    sweeper = asyncio.create_task(artifact_store.run_sweeper())
+    async with mcp_app.lifespan(app):
+        yield
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+        await prewarmer.stop()
+        await stop_compile_daemons()
+        await stop_renderer()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/health")
+def health():
+    """Liveness: the server answers, warm or not."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness: every subsystem in ORCHESTRATOR_PREWARM is warm."""
+    is_ready, subsystems = prewarmer.status()
+    return JSONResponse(
+        {"ready": is_ready, "subsystems": subsystems},
+        status_code=200 if is_ready else 503,
+    )
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "compile_cache": compile_cache.stats(),
+        "compile_queue": compile_queue.stats(),
+        "render_cache": get_renderer().cache_stats(),
+        "rasterizer": get_renderer().raster_stats(),
+        "browser": get_renderer().browser_stats(),
+        "artifacts": artifact_store.stats(),
+        "schema": get_schema_artifact().stats(),
+        "sessions": workspaces.stats(),
+    }
+
+
+@metrics.collector
+def collect_stats():
+    """Expose the counters behind /stats as metrics."""
+    renderer = get_renderer()
+    caches = {"compile": compile_cache.stats(), "render": renderer.cache_stats()}
+    queue = compile_queue.stats()
+    raster = renderer.raster_stats()
+    artifacts = artifact_store.stats()
+    sessions = workspaces.stats()
+
+    def per_cache(key):
+        return [({"cache": name}, stats[key]) for name, stats in caches.items()]
+
+    return [
+        ("orchestrator_cache_hits_total", "counter", "Cache hits", per_cache("hits")),
+        (
+            "orchestrator_cache_misses_total",
+            "counter",
+            "Cache misses",
+            per_cache("misses"),
+        ),
+        (
+            "orchestrator_cache_hit_ratio",
+            "gauge",
+            "Share of cache lookups that hit since startup",
+            per_cache("hit_rate"),
+        ),
+        (
+            "orchestrator_cache_entries",
+            "gauge",
+            "Entries in the in-memory cache",
+            [
+                ({"cache": "compile"}, caches["compile"]["memory"]["entries"]),
+                ({"cache": "render"}, caches["render"]["memory"]["entries"]),
+            ],
+        ),
+        (
+            "orchestrator_queue_running",
+            "gauge",
+            "Jobs holding a slot",
+            [({"queue": "compile"}, queue["running"])],
+        ),
+        (
+            "orchestrator_queue_waiting",
+            "gauge",
+            "Jobs waiting for a slot",
+            [({"queue": "compile"}, queue["waiting"])],
+        ),
+        (
+            "orchestrator_queue_rejected_total",
+            "counter",
+            "Jobs rejected because every slot and the wait queue were taken",
+            [
+                ({"queue": "compile"}, queue["rejected"]),
+                ({"queue": "raster"}, raster["rejected"]),
+            ],
+        ),
+        (
+            "orchestrator_raster_pending",
+            "gauge",
+            "Rasterizations running or waiting for a worker",
+            [({}, raster["pending"])],
+        ),
+        (
+            "orchestrator_render_inflight",
+            "gauge",
+            "Distinct previews being rendered",
+            [({}, caches["render"]["inflight"])],
+        ),
+        (
+            "orchestrator_render_inflight_joins_total",
+            "counter",
+            "Preview calls that waited for an identical render already running",
+            [({}, caches["render"]["inflight_joins"])],
+        ),
+        (
+            "orchestrator_artifacts_bytes",
+            "gauge",
+            "Disk space used by preview files",
+            [({}, artifacts["bytes"])],
+        ),
+        (
+            "orchestrator_artifacts_files",
+            "gauge",
+            "Preview files on disk",
+            [({}, artifacts["files"])],
+        ),
+        (
+            "orchestrator_session_workspaces",
+            "gauge",
+            "Sessions with a workflow workspace in memory",
+            [({}, sessions["sessions"])],
+        ),
+        (
+            "orchestrator_session_workspaces_evicted_total",
+            "counter",
+            "Session workspaces dropped for being idle or over the limit",
+            [({}, sessions["evicted"])],
+        ),
+    ]
+
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00")
+    return False
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+@app.get("/schemas/workflow.json")
+def workflow_schema(request: Request, variant: Literal["raw", "min"] = "min"):
+    """
+    The consolidated workflow schema, as generated ("raw") or without
+    whitespace ("min"), gzip-compressed when the client accepts it. Clients
+    sending back the ETag in If-None-Match get a 304 while it is unchanged.
+    """
+    artifact = get_schema_artifact()
+    representation = artifact.variant(variant, _accepts_gzip(request))
+    headers = {
+        "ETag": representation.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "X-Schema-Version": artifact.version,
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), representation.etag):
+        return Response(status_code=304, headers=headers)
+
+    if representation.encoding:
+        headers["Content-Encoding"] = representation.encoding
+    return Response(
+        content=representation.body, media_type="application/json", headers=headers
+    )
+
+
+app.mount("/static", StaticFiles(directory=artifact_store.directory), name="static")
 app.mount("/", mcp_app)
@@ -3,12 +3,265 @@
 JSON Schema Consolidation Script
 Consolidates all Serverless Workflow JSON schemas starting from workflow.json
 by resolving $ref references and merging definitions into a single schema.
+
+With --incremental, content hashes of the schema files and the intermediate
+results are kept in a state file, and only the files that changed (and the
+ones referencing them) are resolved again on the next run.
+
+Next to the output, <output>.manifest.json records the version and content
+hash of the artifact, which the MCP server checks when it loads it.
 """
 
+import argparse
+import copy
+import hashlib
 import json
 import os
+import re
 from pathlib import Path
-from typing import Any, Dict, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+STATE_VERSION = 4
+
+DEFINITIONS_REF = "#/definitions/"
+
+# Draft-07 keywords whose value is a schema, a list of schemas or a map of
+# schemas; anything else (enum, const, default, ...) is data and is left alone
+SCHEMA_KEYWORDS = {
+    "additionalItems",
+    "additionalProperties",
+    "contains",
+    "else",
+    "if",
+    "items",
+    "not",
+    "propertyNames",
+    "then",
+}
+SCHEMA_LIST_KEYWORDS = {"allOf", "anyOf", "items", "oneOf"}
+SCHEMA_MAP_KEYWORDS = {"dependencies", "patternProperties", "properties"}
+
+# Keywords written next to a $ref in the source schemas. Draft-07 ignores the
+# siblings of a $ref, so they only document the reference and are kept
+REF_SIBLING_KEYWORDS = {"$comment", "description", "examples", "title", "type"}
+
+# Keywords that only document a schema, carried over to an inlined reference
+# target that does not have its own
+ANNOTATION_KEYWORDS = {"$comment", "description", "examples", "title"}
+
+# Smallest saving, in bytes, worth an indirection for the schema reader
+MIN_SHARED_SAVING = 256
+
+
+def canonical(node: Any) -> str:
+    """Compact serialization that is the same for structurally identical nodes."""
+    return json.dumps(node, sort_keys=True, separators=(",", ":"))
+
+
+def subschemas(node: Any) -> List[Tuple[Any, Any, str]]:
+    """
+    The schemas directly nested in a schema, as (container, key, hint) so they
+    can be replaced in place; the hint is the property name, if any.
+    """
+    found: List[Tuple[Any, Any, str]] = []
+    if not isinstance(node, dict):
+        return found
+    for keyword, value in node.items():
+        if keyword in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            for name, child in value.items():
+                if isinstance(child, dict):
+                    found.append((value, name, name))
+        elif keyword in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            for i, child in enumerate(value):
+                if isinstance(child, dict):
+                    found.append((value, i, ""))
+        elif keyword in SCHEMA_KEYWORDS and isinstance(value, dict):
+            found.append((node, keyword, ""))
+    return found
+
+
+def definition_hint(name: str) -> str:
+    """Name of a consolidated definition without the file it comes from."""
+    short = name.split("_", 1)[-1]
+    return short if short.isidentifier() else name
+
+
+def shared_name(found: List[Tuple[Any, Any, str]]) -> str:
+    """
+    Name for a subtree hoisted from the given occurrences: the name most of
+    them are found under, the first one alphabetically on a tie, so the
+    result does not depend on the order the schema is walked in.
+    """
+    names = [name for _, _, name in found if name.isidentifier()]
+    if not names:
+        return "shared"
+    return min(set(names), key=lambda name: (-names.count(name), name))
+
+
+def local_refs(node: Any) -> Set[str]:
+    """Names of the definitions referenced anywhere under `node`."""
+    names: Set[str] = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str) and ref.startswith(DEFINITIONS_REF):
+                names.add(ref[len(DEFINITIONS_REF) :].split("/")[0])
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return names
+
+
+class SchemaMinimizer:
+    """
+    Shrinks a consolidated schema without changing what it validates:
+    identical definitions are merged, subtrees repeated in schema positions
+    are replaced by a $ref to an existing or new shared definition when that
+    saves space, and definitions unreachable from the root are dropped.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = copy.deepcopy(schema)
+        self.definitions: Dict[str, Any] = self.schema.setdefault("definitions", {})
+
+    def minimize(self) -> Dict[str, Any]:
+        before = len(canonical(self.schema))
+        self.merge_identical_definitions()
+        self.share_subtrees()
+        self.drop_unreachable_definitions()
+        after = len(canonical(self.schema))
+        print(
+            f"Minimized schema: {before} -> {after} bytes, "
+            f"{len(self.definitions)} definitions"
+        )
+        return self.schema
+
+    def reachable_definitions(self) -> Set[str]:
+        root = {k: v for k, v in self.schema.items() if k != "definitions"}
+        reachable: Set[str] = set()
+        pending = list(local_refs(root))
+        while pending:
+            name = pending.pop()
+            if name in self.definitions and name not in reachable:
+                reachable.add(name)
+                pending.extend(local_refs(self.definitions[name]))
+        return reachable
+
+    def drop_unreachable_definitions(self):
+        reachable = self.reachable_definitions()
+        for name in list(self.definitions):
+            if name not in reachable:
+                del self.definitions[name]
+                print(f"Dropped unreachable definition: {name}")
+
+    def rename_refs(self, renames: Dict[str, str]):
+        stack: List[Any] = [self.schema]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                ref = current.get("$ref")
+                if isinstance(ref, str) and ref.startswith(DEFINITIONS_REF):
+                    name, _, rest = ref[len(DEFINITIONS_REF) :].partition("/")
+                    if name in renames:
+                        current["$ref"] = DEFINITIONS_REF + renames[name]
+                        if rest:
+                            current["$ref"] += "/" + rest
+                stack.extend(current.values())
+            elif isinstance(current, list):
+                stack.extend(current)
+
+    def merge_identical_definitions(self):
+        while True:
+            # The referenced copy is the one kept
+            reachable = self.reachable_definitions()
+            names = sorted(self.definitions, key=lambda name: name not in reachable)
+
+            keep: Dict[str, str] = {}
+            renames: Dict[str, str] = {}
+            for name in names:
+                definition = self.definitions[name]
+                key = canonical(definition)
+                if key in keep:
+                    renames[name] = keep[key]
+                else:
+                    keep[key] = name
+            if not renames:
+                return
+            for name, kept in renames.items():
+                del self.definitions[name]
+                print(f"Merged definition {name} into {kept}")
+            # Merging can make definitions referencing them identical too
+            self.rename_refs(renames)
+
+    def count_subtrees(self) -> Dict[str, List[Tuple[Any, Any, str]]]:
+        """
+        Every subtree in a schema position, grouped by canonical form, as
+        (container, key, name): the name is the closest property or
+        definition enclosing the subtree, the file prefix of a definition
+        left out (`timeouts_workflowExecTimeout` gives `workflowExecTimeout`).
+        """
+        occurrences: Dict[str, List[Tuple[Any, Any, str]]] = {}
+        stack: List[Tuple[Any, str]] = [(self.schema, "")]
+        stack.extend((d, definition_hint(name)) for name, d in self.definitions.items())
+        while stack:
+            node, name = stack.pop()
+            for container, key, hint in subschemas(node):
+                child = container[key]
+                if "$ref" not in child:
+                    occurrences.setdefault(canonical(child), []).append(
+                        (container, key, hint or name)
+                    )
+                stack.append((child, hint or name))
+        return occurrences
+
+    def share_subtrees(self):
+        """
+        Greedily replace the repeated subtree saving the most bytes by a $ref
+        until no replacement saves anything. A subtree equal to a definition
+        refers to it, other ones are hoisted into a new definition named
+        after the properties or definitions they were found under.
+        """
+        while True:
+            bodies = {canonical(d): name for name, d in self.definitions.items()}
+
+            best = None
+            best_saving = MIN_SHARED_SAVING - 1
+            for key, found in self.count_subtrees().items():
+                name = bodies.get(key)
+                ref_size = len(canonical({"$ref": DEFINITIONS_REF + (name or "")}))
+                if name is not None:
+                    saving = len(found) * (len(key) - ref_size)
+                elif len(found) > 1:
+                    hint_size = len(canonical({shared_name(found): None}))
+                    saving = (len(found) - 1) * len(key) - len(found) * (
+                        ref_size + hint_size
+                    )
+                else:
+                    continue
+                if saving > best_saving:
+                    best, best_saving = (key, found, name), saving
+
+            if best is None:
+                return
+
+            key, found, name = best
+            if name is None:
+                name = self.new_definition_name(shared_name(found))
+                self.definitions[name] = copy.deepcopy(found[0][0][found[0][1]])
+                print(f"Shared definition: {name} ({len(found)} uses)")
+            for container, index, _ in found:
+                container[index] = {"$ref": DEFINITIONS_REF + name}
+
+    def new_definition_name(self, hint: str) -> str:
+        """`hint`, numbered from 2 when a definition already has the name."""
+        suffix = 2
+        candidate = hint
+        while candidate in self.definitions:
+            candidate = f"{hint}_{suffix}"
+            suffix += 1
+        return candidate
 
 
 class SchemaConsolidator:
@@ -17,6 +270,15 @@ class SchemaConsolidator:
         self.schemas: Dict[str, Dict[str, Any]] = {}
         self.processed_refs: Set[str] = set()
         self.consolidated_definitions: Dict[str, Any] = {}
+        # (file, path) -> (resolved target, files whose definitions it pulls in)
+        self.resolved_refs: Dict[Tuple[str, str], Tuple[Any, List[str]]] = {}
+        # file -> [(definition key, resolved definition, files it pulls in)]
+        self.file_definitions: Dict[str, List[Tuple[str, Any, List[str]]]] = {}
+        # file -> files it references
+        self.dependencies: Dict[str, Set[str]] = {}
+        self.processed_files: Set[str] = set()
+        # Output options and artifact hash recorded by the previous run
+        self.previous_output: Optional[Dict[str, Any]] = None
 
     def load_schema(self, filename: str) -> Dict[str, Any]:
         """Load a JSON schema file and cache it."""
@@ -48,15 +310,36 @@ class SchemaConsolidator:
         return ""
 
     def resolve_external_refs(
-        self, schema: Dict[str, Any], current_file: str = ""
+        self,
+        schema: Dict[str, Any],
+        current_file: str = "",
+        pulled: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Recursively resolve external $ref references."""
+        """
+        Recursively resolve external $ref references.
+
+        The files whose definitions the resolved targets need are appended to
+        `pulled`; without it their definitions are processed right away.
+        """
+        if pulled is None:
+            pulled = []
+            resolved = self.resolve_external_refs(schema, current_file, pulled)
+            for filename in pulled:
+                self.process_file_definitions(filename)
+            return resolved
+
         if isinstance(schema, dict):
             if "$ref" in schema:
                 ref = schema["$ref"]
 
-                # Skip internal references (starting with #)
+                # Internal references point to the definitions of the file
+                # they are written in, which are merged under a prefixed name
                 if ref.startswith("#"):
+                    if current_file and ref.startswith("#/definitions/"):
+                        def_name = ref.replace("#/definitions/", "")
+                        return self.annotate_ref(
+                            schema, self.definition_ref(current_file, def_name)
+                        )
                     return schema
 
                 # Extract filename and path
@@ -64,87 +347,142 @@ class SchemaConsolidator:
                 ref_path = self.extract_ref_path(ref)
 
                 if ref_file and ref_file != current_file:
-                    # Load the referenced schema
-                    ref_schema = self.load_schema(ref_file)
-
-                    if ref_schema:
-                        # Navigate to the specific path in the referenced schema
-                        target = ref_schema
-                        if ref_path:
-                            path_parts = ref_path.strip("/").split("/")
-                            for part in path_parts:
-                                if part in target:
-                                    target = target[part]
-                                else:
-                                    print(
-                                        f"Warning: Path {ref_path} not found in "
-                                        f"{ref_file}"
-                                    )
-                                    return schema
-
-                        # Recursively resolve refs in the target
-                        resolved_target = self.resolve_external_refs(target, ref_file)
-
-                        # Also process the entire referenced schema for definitions
-                        self.process_schema_definitions(ref_schema, ref_file)
-
-                        return resolved_target
+                    if current_file:
+                        self.dependencies.setdefault(current_file, set()).add(ref_file)
+
+                    # Every target is resolved once, whatever the number of
+                    # references to it
+                    key = (ref_file, ref_path)
+                    if key not in self.resolved_refs:
+                        self.resolved_refs[key] = self.resolve_ref_target(
+                            ref_file, ref_path
+                        )
+                    target, target_pulled = self.resolved_refs[key]
+                    if target is None:
+                        return schema
+
+                    pulled.extend(target_pulled)
+                    return self.annotate_target(schema, target)
 
                 return schema
             else:
                 # Recursively process all dictionary values
                 resolved = {}
                 for key, value in schema.items():
-                    resolved[key] = self.resolve_external_refs(value, current_file)
+                    resolved[key] = self.resolve_external_refs(
+                        value, current_file, pulled
+                    )
                 return resolved
 
         elif isinstance(schema, list):
             # Recursively process all list items
-            return [self.resolve_external_refs(item, current_file) for item in schema]
+            return [
+                self.resolve_external_refs(item, current_file, pulled)
+                for item in schema
+            ]
 
         return schema
 
+    def annotate_ref(self, schema: Dict[str, Any], ref: str) -> Dict[str, Any]:
+        """A reference rewritten to `ref`, with the keywords documenting it."""
+        annotated = {k: v for k, v in schema.items() if k in REF_SIBLING_KEYWORDS}
+        annotated["$ref"] = ref
+        return annotated
+
+    def annotate_target(self, schema: Dict[str, Any], target: Any) -> Any:
+        """
+        An inlined reference target, with the annotations written next to the
+        reference. Next to a $ref every documenting keyword is kept, else only
+        the ones the target lacks that cannot change what it validates.
+        """
+        if not isinstance(target, dict):
+            return target
+        if "$ref" in target:
+            keep = REF_SIBLING_KEYWORDS
+        else:
+            keep = ANNOTATION_KEYWORDS
+        annotations = {
+            k: v
+            for k, v in schema.items()
+            if k in keep and k != "$ref" and k not in target
+        }
+        if not annotations:
+            return target
+        return {**annotations, **target}
+
+    def resolve_ref_target(self, ref_file: str, ref_path: str) -> Tuple[Any, List[str]]:
+        """
+        Resolve the node an external reference points to.
+
+        Returns:
+            (resolved target or None if it does not exist, files whose
+            definitions it pulls in, the referenced file last)
+        """
+        # Load the referenced schema
+        ref_schema = self.load_schema(ref_file)
+        if not ref_schema:
+            return None, []
+
+        # Navigate to the specific path in the referenced schema
+        target = ref_schema
+        if ref_path:
+            path_parts = ref_path.strip("/").split("/")
+            for part in path_parts:
+                if part in target:
+                    target = target[part]
+                else:
+                    print(f"Warning: Path {ref_path} not found in {ref_file}")
+                    return None, []
+
+        # Recursively resolve refs in the target
+        pulled: List[str] = []
+        resolved_target = self.resolve_external_refs(target, ref_file, pulled)
+
+        # Also process the entire referenced schema for definitions
+        pulled.append(ref_file)
+        return resolved_target, pulled
+
+    def process_file_definitions(self, filename: str):
+        """
+        Merge the definitions of a schema file into consolidated definitions.
+        Each file is processed once; its resolved definitions are reused when
+        already known (incremental mode).
+        """
+        if filename in self.processed_files:
+            return
+        self.processed_files.add(filename)
+
+        entries = self.file_definitions.get(filename)
+        if entries is None:
+            schema = self.load_schema(filename)
+            entries = []
+            for def_name, def_value in schema.get("definitions", {}).items():
+                unique_key = self.definition_key(filename, def_name)
+                pulled: List[str] = []
+                resolved = self.resolve_external_refs(def_value, filename, pulled)
+                entries.append((unique_key, resolved, pulled))
+            self.file_definitions[filename] = entries
+
+        for unique_key, resolved, pulled in entries:
+            # Referenced files come first, as when they were resolved inline
+            for dependency in pulled:
+                self.process_file_definitions(dependency)
+            self.consolidated_definitions[unique_key] = resolved
+            print(f"Added definition: {unique_key}")
+
     def process_schema_definitions(self, schema: Dict[str, Any], filename: str):
         """Extract and merge definitions from a schema into consolidated definitions."""
-        if "definitions" in schema:
-            for def_name, def_value in schema["definitions"].items():
-                # Create unique key to avoid conflicts
-                unique_key = f"{filename.replace('.json', '')}_{def_name}"
-                self.consolidated_definitions[unique_key] = self.resolve_external_refs(
-                    def_value, filename
-                )
-                print(f"Added definition: {unique_key}")
-
-    def update_internal_refs(
-        self, schema: Dict[str, Any], filename: str
-    ) -> Dict[str, Any]:
-        """Update internal references to point to consolidated definitions."""
-        if isinstance(schema, dict):
-            if "$ref" in schema:
-                ref = schema["$ref"]
+        self.schemas.setdefault(filename, schema)
+        self.process_file_definitions(filename)
 
-                # Handle internal references
-                if ref.startswith("#/definitions/"):
-                    def_name = ref.replace("#/definitions/", "")
-                    # Update to use the prefixed definition name
-                    new_ref = (
-                        f"#/definitions/{filename.replace('.json', '')}_{def_name}"
-                    )
-                    return {"$ref": new_ref}
+    def definition_key(self, filename: str, def_name: str) -> str:
+        """Name of a file's definition in the consolidated schema."""
+        prefix = filename.replace(".json", "").replace("/", "_")
+        return f"{prefix}_{def_name}"
 
-                return schema
-            else:
-                # Recursively process all dictionary values
-                resolved = {}
-                for key, value in schema.items():
-                    resolved[key] = self.update_internal_refs(value, filename)
-                return resolved
-
-        elif isinstance(schema, list):
-            # Recursively process all list items
-            return [self.update_internal_refs(item, filename) for item in schema]
-
-        return schema
+    def definition_ref(self, filename: str, def_name: str) -> str:
+        """Reference to a file's definition in the consolidated schema."""
+        return f"#/definitions/{self.definition_key(filename, def_name)}"
 
     def consolidate(self, main_schema_file: str = "workflow.json") -> Dict[str, Any]:
         """Main consolidation method."""
@@ -157,18 +495,15 @@ class SchemaConsolidator:
 
         # First pass: collect all definitions from all referenced schemas
         print("\n--- Collecting definitions from all schemas ---")
-        for filename in os.listdir(self.schema_dir):
+        # Sorted, so the output does not depend on the file system order
+        for filename in sorted(os.listdir(self.schema_dir)):
             if filename.endswith(".json"):
-                schema = self.load_schema(filename)
-                self.process_schema_definitions(schema, filename)
+                self.process_file_definitions(filename)
 
-        # Second pass: resolve external references
+        # Second pass: resolve external references, internal references are
+        # updated to use consolidated definitions
         print("\n--- Resolving external references ---")
-        resolved_main = self.resolve_external_refs(main_schema, main_schema_file)
-
-        # Third pass: update internal references to use consolidated definitions
-        print("\n--- Updating internal references ---")
-        final_schema = self.update_internal_refs(resolved_main, main_schema_file)
+        final_schema = self.resolve_external_refs(main_schema, main_schema_file)
 
         # Add all consolidated definitions
         if "definitions" not in final_schema:
@@ -181,33 +516,237 @@ class SchemaConsolidator:
 
         return final_schema
 
+    def file_hashes(self) -> Dict[str, str]:
+        """Content hash of every schema file, extensions included."""
+        return {
+            path.relative_to(self.schema_dir).as_posix(): hashlib.sha256(
+                path.read_bytes()
+            ).hexdigest()
+            for path in sorted(self.schema_dir.rglob("*.json"))
+        }
+
+    def affected_files(
+        self,
+        previous_hashes: Dict[str, str],
+        hashes: Dict[str, str],
+        dependencies: Dict[str, Set[str]],
+    ) -> Set[str]:
+        """Files changed, added or removed, and every file referencing them."""
+        affected = {
+            filename
+            for filename in previous_hashes.keys() | hashes.keys()
+            if previous_hashes.get(filename) != hashes.get(filename)
+        }
+
+        dependents: Dict[str, Set[str]] = {}
+        for filename, referenced in dependencies.items():
+            for dependency in referenced:
+                dependents.setdefault(dependency, set()).add(filename)
+
+        pending = list(affected)
+        while pending:
+            for dependent in dependents.get(pending.pop(), ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    pending.append(dependent)
+        return affected
+
+    def load_state(
+        self, state_file: str, main_schema_file: str, hashes: Dict[str, str]
+    ) -> Optional[Set[str]]:
+        """
+        Reuse the results of a previous run for the files not affected by
+        changes since then.
+
+        Returns:
+            The affected files, or None when there is no usable state
+        """
+        try:
+            with open(state_file, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            state.get("version") != STATE_VERSION
+            or state.get("main") != main_schema_file
+        ):
+            return None
+        self.previous_output = state.get("output")
+
+        dependencies = {
+            filename: set(referenced)
+            for filename, referenced in state["dependencies"].items()
+        }
+        affected = self.affected_files(state["hashes"], hashes, dependencies)
+
+        for filename, referenced in dependencies.items():
+            if filename not in affected:
+                self.dependencies[filename] = referenced
+        for filename, entries in state["definitions"].items():
+            if filename not in affected:
+                self.file_definitions[filename] = [
+                    (unique_key, resolved, pulled)
+                    for unique_key, resolved, pulled in entries
+                ]
+        for ref_file, ref_path, target, pulled in state["refs"]:
+            if ref_file not in affected:
+                self.resolved_refs[(ref_file, ref_path)] = (target, pulled)
+
+        return affected
+
+    def output_state(self, output_file: str, **options: bool) -> Dict[str, Any]:
+        """
+        Describe an output: the options it is built with and the content hash
+        of the file, None when it does not exist.
+        """
+        try:
+            with open(output_file, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            digest = None
+        return {
+            "file": os.path.abspath(output_file),
+            "options": options,
+            "sha256": digest,
+        }
+
+    def save_state(
+        self,
+        state_file: str,
+        main_schema_file: str,
+        hashes: Dict[str, str],
+        output: Optional[Dict[str, Any]] = None,
+    ):
+        """Save what the next incremental run needs."""
+        state = {
+            "version": STATE_VERSION,
+            "main": main_schema_file,
+            "hashes": hashes,
+            "output": output,
+            "dependencies": {
+                filename: sorted(referenced)
+                for filename, referenced in self.dependencies.items()
+            },
+            "definitions": self.file_definitions,
+            "refs": [
+                [ref_file, ref_path, target, pulled]
+                for (ref_file, ref_path), (target, pulled) in self.resolved_refs.items()
+            ],
+        }
+        with open(state_file, "w") as f:
+            json.dump(state, f)
+
     def save_consolidated_schema(
-        self, consolidated_schema: Dict[str, Any], output_file: str
+        self,
+        consolidated_schema: Dict[str, Any],
+        output_file: str,
+        compact: bool = False,
     ):
         """Save the consolidated schema to a file."""
         output_path = output_file
         with open(output_path, "w") as f:
-            json.dump(consolidated_schema, f, indent=2)
+            if compact:
+                json.dump(consolidated_schema, f, separators=(",", ":"))
+            else:
+                json.dump(consolidated_schema, f, indent=2)
         print(f"Consolidated schema saved to: {output_path}")
 
+    def save_manifest(
+        self,
+        consolidated_schema: Dict[str, Any],
+        output_file: str,
+        hashes: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Describe the saved schema in <output>.manifest.json: specification
+        version, content hash of the artifact and of every source schema.
+        """
+        with open(output_file, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        schema_id = consolidated_schema.get("$id", "")
+        match = re.search(r"/schemas/([^/]+)/", schema_id)
+        spec_version = match.group(1) if match else "0"
+
+        manifest = {
+            "artifact": os.path.basename(output_file),
+            "schema_id": schema_id,
+            "version": f"{spec_version}+{digest[:12]}",
+            "sha256": digest,
+            "sources": hashes if hashes is not None else self.file_hashes(),
+        }
+        manifest_file = str(Path(output_file).with_suffix(".manifest.json"))
+        with open(manifest_file, "w") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        print(f"Manifest saved to: {manifest_file} (version {manifest['version']})")
+
 
 def main():
     """Main function to run the consolidation."""
-    schema_dir = "schema"
+    parser = argparse.ArgumentParser(description="Consolidate the workflow schemas")
+    parser.add_argument("--schema-dir", default="schema")
+    parser.add_argument("--output", default="consolidated_workflow_schema.json")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only resolve the schema files changed since the previous run",
+    )
+    parser.add_argument("--state-file", default=".consolidation_state.json")
+    parser.add_argument(
+        "--minimize",
+        action="store_true",
+        help="share repeated subtrees and drop unreachable definitions",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="write JSON without whitespace"
+    )
+    args = parser.parse_args()
 
     print("JSON Schema Consolidation Tool")
     print("=" * 50)
 
-    consolidator = SchemaConsolidator(schema_dir)
+    consolidator = SchemaConsolidator(args.schema_dir)
+
+    options = {"minimize": args.minimize, "compact": args.compact}
 
     try:
+        hashes = None
+        if args.incremental:
+            hashes = consolidator.file_hashes()
+            affected = consolidator.load_state(args.state_file, "workflow.json", hashes)
+            output = consolidator.output_state(args.output, **options)
+            if affected is None:
+                print("No previous state, consolidating everything")
+            elif (
+                not affected
+                and output["sha256"] is not None
+                and output == consolidator.previous_output
+            ):
+                print(f"No schema changes, {args.output} is up to date")
+                return 0
+            elif not affected:
+                print(f"{args.output} missing, edited or built with other options")
+            else:
+                print(f"Changed or affected schemas: {sorted(affected)}")
+
         # Consolidate starting from workflow.json
         consolidated = consolidator.consolidate("workflow.json")
+        if args.minimize:
+            consolidated = SchemaMinimizer(consolidated).minimize()
 
         # Save the result
         consolidator.save_consolidated_schema(
-            consolidated, "consolidated_workflow_schema.json"
+            consolidated, args.output, compact=args.compact
         )
+        consolidator.save_manifest(consolidated, args.output, hashes)
+        if hashes is not None:
+            consolidator.save_state(
+                args.state_file,
+                "workflow.json",
+                hashes,
+                consolidator.output_state(args.output, **options),
+            )
         print("\nConsolidation completed successfully!")
     except Exception as e:
         print(f"Error during consolidation: {e}")
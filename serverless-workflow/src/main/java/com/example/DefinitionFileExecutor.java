@@ -5,27 +5,130 @@ import org.kie.kogito.serverless.workflow.models.JsonNodeModel;
 import org.kie.kogito.serverless.workflow.utils.ServerlessWorkflowUtils;
 import org.kie.kogito.serverless.workflow.utils.WorkflowFormat;
 import io.serverlessworkflow.api.Workflow;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ObjectNode;
 import org.kie.kogito.process.Process;
 
+import java.io.BufferedInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.DataInputStream;
 import java.io.FileReader;
 import java.io.IOException;
+import java.io.InputStream;
+import java.io.PrintStream;
 import java.io.Reader;
+import java.io.StringReader;
+import java.lang.management.ManagementFactory;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.time.Duration;
+import java.time.Instant;
+import java.util.ArrayList;
 import java.util.Collections;
 import java.util.List;
+import java.util.Locale;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicBoolean;
 import java.util.stream.Collectors;
+import java.util.stream.Stream;
 
 public class DefinitionFileExecutor {
 
+    // Prefix of every result header written in daemon and batch modes, so the client can
+    // tell protocol frames apart from anything else that ends up on stdout.
+    static final String FRAME_MARKER = "@@workflow-result@@";
+
+    // Prefix of the phase timing lines written in the logs of every compilation,
+    // folded into the caller's trace:
+    // "@@workflow-phase@@ <phase> <OK|ERROR> <start epoch ns> <duration ns>"
+    static final String PHASE_MARKER = "@@workflow-phase@@";
+
+    private static final ObjectMapper MAPPER = new ObjectMapper();
+
+    /** What a compilation does once the workflow is built. */
+    enum CompileMode {
+        // Parse and process the workflow without running anything
+        VALIDATE,
+        // Also execute it, with every function replaced by a no-op expression
+        EXECUTE_STUBBED;
+
+        static CompileMode of(String name) {
+            return valueOf(name.toUpperCase(Locale.ROOT));
+        }
+    }
+
     public static void main(String[] args) throws IOException {
-        System.out.printf("Initialize the workflow: %s\n", args[0]);
+        if (args.length > 0 && "--daemon".equals(args[0])) {
+            runDaemon();
+            return;
+        }
+        if (args.length > 0 && "--batch".equals(args[0])) {
+            System.exit(runBatch(args));
+        }
+
+        // Time from the JVM launch to main, only paid by one-shot compilations
+        writePhase(System.out, "jvm-start", "OK",
+                Instant.ofEpochMilli(ManagementFactory.getRuntimeMXBean().getStartTime()));
+
+        // [--mode validate|execute_stubbed] <file>, flags first then the one positional
+        CompileMode mode = CompileMode.VALIDATE;
+        String file = null;
+        try {
+            for (int i = 0; i < args.length; i++) {
+                if ("--mode".equals(args[i]) && i + 1 < args.length) {
+                    mode = CompileMode.of(args[++i]);
+                } else if (file == null && !args[i].startsWith("--")) {
+                    file = args[i];
+                } else {
+                    throw new IllegalArgumentException("Unexpected argument: " + args[i]);
+                }
+            }
+        } catch (IllegalArgumentException e) {
+            System.err.println("[ERROR] " + e.getMessage());
+            file = null;
+        }
+        if (file == null) {
+            System.err.println("Usage: DefinitionFileExecutor [--mode validate|execute_stubbed] <file>");
+            System.exit(2);
+        }
 
-        try (Reader reader = new FileReader(args[0]);
-             StaticWorkflowApplication application = StaticWorkflowApplication.create()) {
-             Workflow workflow = ServerlessWorkflowUtils.getWorkflow(reader, WorkflowFormat.JSON);
-             application.process(workflow);
+        System.out.printf("Initialize the workflow: %s\n", file);
 
-            JsonNodeModel result = application.execute(workflow, Collections.emptyMap());
-            System.out.printf("Execution information: %s\n", result);
+        try (Reader reader = new FileReader(file)) {
+            if (!compile(reader, mode, System.out, System.err)) {
+                System.exit(1);
+            }
+        }
+    }
+
+    static boolean compile(Reader reader, CompileMode mode, PrintStream out, PrintStream err) {
+        PhaseTimer phases = new PhaseTimer(out, "create");
+        // One application per compilation, even in a daemon: process() keeps the first
+        // process built for a workflow id and returns it for any later workflow with the
+        // same id, with no way to unregister it. A shared application would validate an
+        // edited workflow against its first version and keep every process alive.
+        try (StaticWorkflowApplication application = StaticWorkflowApplication.create()) {
+            phases.next("parse");
+            if (mode == CompileMode.EXECUTE_STUBBED) {
+                reader = stubFunctions(reader);
+            }
+            Workflow workflow = ServerlessWorkflowUtils.getWorkflow(reader, WorkflowFormat.JSON);
+            phases.next("process");
+            application.process(workflow);
+
+            if (mode == CompileMode.EXECUTE_STUBBED) {
+                phases.next("execute");
+                JsonNodeModel result = application.execute(workflow, Collections.emptyMap());
+                phases.end("OK");
+                out.printf("Execution information: %s\n", result);
+            } else {
+                phases.end("OK");
+            }
 
             List<String> registeredStates = workflow.getStates().stream()
                                         .map(p -> p.getName())
@@ -35,15 +138,214 @@ public class DefinitionFileExecutor {
                                         .map(p -> p.getName())
                                         .collect(Collectors.toList());
 
-            System.out.println("Registered functions:");
-            System.out.println(registeredFunctions);
+            out.println("Registered functions:");
+            out.println(registeredFunctions);
 
-            System.out.println("Registered states:");
-            System.out.println(registeredStates);
-            System.out.println("Workflow is correct and compiled successfully");
+            out.println("Registered states:");
+            out.println(registeredStates);
+            out.println("Workflow is correct and compiled successfully");
+            return true;
         } catch (Exception e) {
-            System.err.println("[ERROR] Workflow is not valid: " + e.getMessage());
-            System.exit(1);
+            phases.end("ERROR");
+            err.println("[ERROR] Workflow is not valid: " + e.getMessage());
+            return false;
+        }
+    }
+
+    /**
+     * Make a workflow safe to execute: every function becomes a jq expression
+     * returning its input, so no REST, gRPC or custom call leaves the JVM, and
+     * state sleeps are dropped. Event and callback states still wait for their
+     * events.
+     */
+    static Reader stubFunctions(Reader reader) throws IOException {
+        JsonNode root = MAPPER.readTree(reader);
+        for (JsonNode function : root.path("functions")) {
+            if (function.isObject()) {
+                ((ObjectNode) function).put("type", "expression").put("operation", ".");
+            }
+        }
+        for (JsonNode state : root.path("states")) {
+            if (state.isObject()) {
+                ObjectNode node = (ObjectNode) state;
+                node.remove("sleep");
+                if ("sleep".equals(node.path("type").asText())) {
+                    node.put("duration", "PT0S");
+                }
+            }
+        }
+        return new StringReader(MAPPER.writeValueAsString(root));
+    }
+
+    /** Writes one PHASE_MARKER line per phase of a compilation. */
+    static final class PhaseTimer {
+        private final PrintStream out;
+        private String phase;
+        private Instant start;
+
+        PhaseTimer(PrintStream out, String first) {
+            this.out = out;
+            this.phase = first;
+            this.start = Instant.now();
+        }
+
+        void next(String phase) {
+            end("OK");
+            this.phase = phase;
+            this.start = Instant.now();
+        }
+
+        void end(String status) {
+            if (phase != null) {
+                writePhase(out, phase, status, start);
+                phase = null;
+            }
+        }
+    }
+
+    static void writePhase(PrintStream out, String phase, String status, Instant start) {
+        long startNanos = start.getEpochSecond() * 1_000_000_000L + start.getNano();
+        long durationNanos = Duration.between(start, Instant.now()).toNanos();
+        out.printf("%s %s %s %d %d\n", PHASE_MARKER, phase, status, startNanos, durationNanos);
+    }
+
+    /**
+     * Keep one warm JVM and compile every workflow received on stdin.
+     *
+     * Request:  "<length>[ <mode>]\n" followed by <length> bytes of UTF-8 workflow
+     *           JSON; mode is validate (the default) or execute_stubbed.
+     * Response: "@@workflow-result@@ <OK|ERROR> <length>\n" followed by <length>
+     *           bytes of UTF-8 logs.
+     *
+     * The loop ends when stdin is closed.
+     */
+    static void runDaemon() throws IOException {
+        PrintStream protocol = System.out;
+        // Anything Kogito prints on its own goes to stderr, stdout is only frames
+        System.setOut(System.err);
+
+        DataInputStream in = new DataInputStream(new BufferedInputStream(System.in));
+        String header;
+        while ((header = readLine(in)) != null) {
+            header = header.trim();
+            if (header.isEmpty()) {
+                continue;
+            }
+
+            String[] fields = header.split(" ");
+            byte[] payload = new byte[Integer.parseInt(fields[0])];
+            in.readFully(payload);
+
+            ByteArrayOutputStream logs = new ByteArrayOutputStream();
+            boolean success;
+            try (PrintStream log = new PrintStream(logs, true, StandardCharsets.UTF_8)) {
+                CompileMode mode;
+                try {
+                    mode = fields.length > 1 ? CompileMode.of(fields[1]) : CompileMode.VALIDATE;
+                } catch (IllegalArgumentException e) {
+                    log.println("[ERROR] Unknown compile mode: " + fields[1]);
+                    mode = null;
+                }
+                success = mode != null && compile(
+                        new StringReader(new String(payload, StandardCharsets.UTF_8)), mode, log, log);
+            }
+
+            writeFrame(protocol, success, logs.toByteArray(), null);
+        }
+    }
+
+    /**
+     * Validate many workflows in this JVM.
+     *
+     * Usage: --batch [--parallel N] [--mode validate|execute_stubbed] <file or directory>...
+     *
+     * Directories are searched recursively for *.sw.json files. One frame per
+     * workflow is written as soon as it is validated, in completion order,
+     * with the file path appended to the header:
+     * "@@workflow-result@@ <OK|ERROR> <length> <path>\n" + <length> bytes of logs.
+     *
+     * Returns the exit code: 0 when every workflow is valid.
+     */
+    static int runBatch(String[] args) throws IOException {
+        int parallel = 1;
+        CompileMode mode = CompileMode.VALIDATE;
+        List<Path> files = new ArrayList<>();
+        for (int i = 1; i < args.length; i++) {
+            if ("--parallel".equals(args[i])) {
+                parallel = Integer.parseInt(args[++i]);
+            } else if ("--mode".equals(args[i])) {
+                mode = CompileMode.of(args[++i]);
+            } else {
+                Path path = Paths.get(args[i]);
+                if (Files.isDirectory(path)) {
+                    try (Stream<Path> walk = Files.walk(path)) {
+                        walk.filter(p -> p.toString().endsWith(".sw.json"))
+                            .sorted()
+                            .forEach(files::add);
+                    }
+                } else {
+                    files.add(path);
+                }
+            }
+        }
+
+        PrintStream protocol = System.out;
+        System.setOut(System.err);
+
+        CompileMode batchMode = mode;
+        AtomicBoolean allValid = new AtomicBoolean(true);
+        ExecutorService pool = Executors.newFixedThreadPool(Math.max(1, parallel));
+        for (Path file : files) {
+            pool.submit(() -> {
+                ByteArrayOutputStream logs = new ByteArrayOutputStream();
+                boolean success;
+                try (PrintStream log = new PrintStream(logs, true, StandardCharsets.UTF_8)) {
+                    log.printf("Initialize the workflow: %s\n", file);
+                    try (Reader reader = Files.newBufferedReader(file, StandardCharsets.UTF_8)) {
+                        success = compile(reader, batchMode, log, log);
+                    } catch (IOException e) {
+                        log.println("[ERROR] Workflow is not valid: " + e.getMessage());
+                        success = false;
+                    }
+                }
+                if (!success) {
+                    allValid.set(false);
+                }
+                synchronized (protocol) {
+                    writeFrame(protocol, success, logs.toByteArray(), file.toString());
+                }
+            });
+        }
+
+        pool.shutdown();
+        try {
+            pool.awaitTermination(Long.MAX_VALUE, TimeUnit.SECONDS);
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            return 1;
+        }
+        return allValid.get() ? 0 : 1;
+    }
+
+    private static void writeFrame(PrintStream protocol, boolean success, byte[] body, String name) {
+        String header = String.format("%s %s %d", FRAME_MARKER, success ? "OK" : "ERROR", body.length);
+        if (name != null) {
+            header += " " + name;
+        }
+        protocol.print(header + "\n");
+        protocol.write(body, 0, body.length);
+        protocol.flush();
+    }
+
+    private static String readLine(InputStream in) throws IOException {
+        ByteArrayOutputStream line = new ByteArrayOutputStream();
+        int c;
+        while ((c = in.read()) != -1) {
+            if (c == '\n') {
+                return line.toString(StandardCharsets.UTF_8);
+            }
+            line.write(c);
         }
+        return line.size() > 0 ? line.toString(StandardCharsets.UTF_8) : null;
     }
 }
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tools.orchestrator_compile_daemon import (
+    FRAME_MARKER,
+    PHASE_MARKER,
+    CompileDaemon,
+    CompileDaemonError,
+    read_frame,
+)
+
+EXECUTOR = (
+    Path(__file__).parent.parent
+    / "serverless-workflow/src/main/java/com/example/DefinitionFileExecutor.java"
+)
+PROJECT_JAR = (
+    Path(__file__).parent.parent
+    / "serverless-workflow/target/my-workflow-project-1.0-SNAPSHOT.jar"
+)
+
+needs_jvm = pytest.mark.skipif(
+    shutil.which("java") is None or not PROJECT_JAR.exists(),
+    reason="needs java and the executor built with `mvn package`",
+)
+
+
+def _frame(success: bool, logs: bytes, name: str | None = None) -> bytes:
+    """A frame as DefinitionFileExecutor.writeFrame writes it."""
+    header = f"{FRAME_MARKER.decode()} {'OK' if success else 'ERROR'} {len(logs)}"
+    if name is not None:
+        header += f" {name}"
+    return header.encode() + b"\n" + logs
+
+
+def _read_frames(data: bytes) -> list:
+    async def read():
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        frames = []
+        while (frame := await read_frame(stream)) is not None:
+            frames.append(frame)
+        return frames
+
+    return asyncio.run(read())
+
+
+def test_markers_match_the_executor():
+    source = EXECUTOR.read_text()
+    markers = dict(re.findall(r'String (\w+_MARKER) = "([^"]+)";', source))
+    assert markers == {
+        "FRAME_MARKER": FRAME_MARKER.decode(),
+        "PHASE_MARKER": PHASE_MARKER,
+    }
+
+
+def test_daemon_frames_are_read_in_order():
+    logs = "Workflow is correct\nregistered: [Start]\n".encode()
+    data = _frame(True, logs) + _frame(False, b"[ERROR] Workflow is not valid\n")
+    assert _read_frames(data) == [
+        (True, logs.decode(), ""),
+        (False, "[ERROR] Workflow is not valid\n", ""),
+    ]
+
+
+def test_batch_frames_carry_the_file_name():
+    # Logs may hold anything, the marker included, without breaking the framing
+    logs = f"{FRAME_MARKER.decode()} OK 3\nnot a frame\n".encode()
+    data = b"Kogito noise\n" + _frame(True, logs, "/tmp/a dir/1.sw.json")
+    assert _read_frames(data) == [(True, logs.decode(), "/tmp/a dir/1.sw.json")]
+
+
+def test_truncated_frame_is_an_error():
+    with pytest.raises(CompileDaemonError):
+        _read_frames(_frame(True, b"complete logs")[:-3])
+
+
+@needs_jvm
+def test_daemon_compiles_through_the_executor():
+    from tools.orchestrator_compile_workflow import WARMUP_WORKFLOW, get_command
+
+    async def compile_twice():
+        daemon = CompileDaemon(get_command() + ["--daemon"])
+        try:
+            valid = await daemon.compile(WARMUP_WORKFLOW, timeout=120)
+            invalid = await daemon.compile("{}", timeout=30)
+        finally:
+            await daemon.stop()
+        return valid, invalid
+
+    (valid, logs), (invalid, _) = asyncio.run(compile_twice())
+    assert valid, logs
+    assert "compiled successfully" in logs
+    assert not invalid
+
+
+@needs_jvm
+def test_batch_writes_one_named_frame_per_file(tmp_path):
+    from tools.orchestrator_compile_workflow import WARMUP_WORKFLOW, get_command
+
+    (tmp_path / "valid.sw.json").write_text(WARMUP_WORKFLOW)
+    (tmp_path / "invalid.sw.json").write_text("{}")
+
+    async def batch():
+        process = await asyncio.create_subprocess_exec(
+            *get_command(),
+            "--batch",
+            str(tmp_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        frames = []
+        while (frame := await read_frame(process.stdout)) is not None:
+            frames.append(frame)
+        return await process.wait(), frames
+
+    returncode, frames = asyncio.run(batch())
+    assert returncode == 1
+    assert sorted((Path(name).name, success) for success, _, name in frames) == [
+        ("invalid.sw.json", False),
+        ("valid.sw.json", True),
+    ]
+
+
+@needs_jvm
+@pytest.mark.parametrize(
+    "arguments, returncode",
+    [
+        (["--mode", "validate", "{file}"], 0),
+        (["{file}", "--mode", "validate"], 0),
+        (["{file}"], 0),
+        (["--mode", "validate"], 2),
+        ([], 2),
+    ],
+)
+def test_oneshot_parses_flags_before_the_file(tmp_path, arguments, returncode):
+    from tools.orchestrator_compile_workflow import WARMUP_WORKFLOW, get_command
+
+    workflow = tmp_path / "warmup.sw.json"
+    workflow.write_text(WARMUP_WORKFLOW)
+    arguments = [argument.format(file=workflow) for argument in arguments]
+    process = subprocess.run(get_command() + arguments, capture_output=True)
+    assert process.returncode == returncode, process.stderr
@@ -0,0 +1,39 @@
+import pytest
+
+from tools.orchestrator_example_store import ExampleStore, tokenize
+
+
+@pytest.fixture(scope="module")
+def store():
+    return ExampleStore()
+
+
+@pytest.mark.parametrize(
+    "singular, plural",
+    [
+        ("user", "users"),
+        ("retry", "retries"),
+        ("schedule", "schedules"),
+        ("iterate", "iterating"),
+        ("process", "processes"),
+    ],
+)
+def test_word_forms_share_a_stem(singular, plural):
+    assert tokenize(singular) == tokenize(plural)
+
+
+@pytest.mark.parametrize(
+    "singular, plural",
+    [
+        ("call a REST API and retry on error", "call REST APIs and retries on errors"),
+        ("iterate over an array of user", "iterating over arrays of users"),
+        ("a job running on a cron schedule", "jobs running on cron schedules"),
+    ],
+)
+def test_singular_and_plural_queries_find_the_same_example(store, singular, plural):
+    singular_results = store.search(singular, k=1)
+    plural_results = store.search(plural, k=1)
+    assert singular_results
+    assert [example.category for example, _ in singular_results] == [
+        example.category for example, _ in plural_results
+    ]
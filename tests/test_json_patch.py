@@ -0,0 +1,94 @@
+import pytest
+
+from tools.orchestrator_json_patch import JsonPatchError, apply_patch, parse_pointer
+
+DOCUMENT = {
+    "states": [{"name": "A", "actions": [1, 2]}, {"name": "B"}],
+    "a/b": {"m~n": 1},
+    "flag": True,
+    "count": 1,
+}
+
+
+def test_pointer_tokens_are_unescaped():
+    assert parse_pointer("/a~1b/m~0n") == ["a/b", "m~n"]
+    assert (
+        apply_patch(DOCUMENT, [{"op": "remove", "path": "/a~1b/m~0n"}])[0]["a/b"] == {}
+    )
+
+
+def test_dash_appends_to_an_array():
+    patch = [{"op": "add", "path": "/states/0/actions/-", "value": 3}]
+    result, changed = apply_patch(DOCUMENT, patch)
+    assert result["states"][0]["actions"] == [1, 2, 3]
+    assert changed == ["/states/0/actions/-"]
+    # The input document is never modified
+    assert DOCUMENT["states"][0]["actions"] == [1, 2]
+
+
+@pytest.mark.parametrize("op", ["replace", "remove"])
+def test_dash_only_appends(op):
+    with pytest.raises(JsonPatchError):
+        apply_patch(DOCUMENT, [{"op": op, "path": "/states/-", "value": {}}])
+
+
+@pytest.mark.parametrize("index", ["2", "01", "-1", "x"])
+def test_invalid_array_indexes_are_rejected(index):
+    with pytest.raises(JsonPatchError):
+        apply_patch(
+            DOCUMENT, [{"op": "replace", "path": f"/states/{index}", "value": 1}]
+        )
+
+
+def test_move_into_its_own_child_is_rejected():
+    with pytest.raises(JsonPatchError, match="children"):
+        apply_patch(DOCUMENT, [{"op": "move", "from": "/states", "path": "/states/0"}])
+
+
+def test_move_into_a_sibling_child_reports_both_locations():
+    patch = [{"op": "move", "from": "/states/1", "path": "/states/0/next"}]
+    result, changed = apply_patch(DOCUMENT, patch)
+    assert result["states"] == [{"name": "A", "actions": [1, 2], "next": {"name": "B"}}]
+    assert changed == ["/states/1", "/states/0/next"]
+
+
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        ("/count", 1.0),
+        ("/flag", True),
+        ("/a~1b", {"m~n": 1}),
+        ("/states/0", {"actions": [1, 2], "name": "A"}),
+    ],
+)
+def test_test_passes_on_json_equal_values(path, value):
+    result, changed = apply_patch(
+        DOCUMENT, [{"op": "test", "path": path, "value": value}]
+    )
+    assert result == DOCUMENT
+    assert changed == []
+
+
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        ("/count", True),
+        ("/flag", 1),
+        ("/count", "1"),
+        ("/states/0/actions", [2, 1]),
+        ("/states/0", {"name": "A"}),
+    ],
+)
+def test_test_fails_on_different_values(path, value):
+    with pytest.raises(JsonPatchError, match="test failed"):
+        apply_patch(DOCUMENT, [{"op": "test", "path": path, "value": value}])
+
+
+def test_failed_operation_leaves_nothing_applied():
+    patch = [
+        {"op": "replace", "path": "/count", "value": 2},
+        {"op": "test", "path": "/count", "value": 1},
+    ]
+    with pytest.raises(JsonPatchError):
+        apply_patch(DOCUMENT, patch)
+    assert DOCUMENT["count"] == 1
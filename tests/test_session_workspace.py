@@ -0,0 +1,80 @@
+import asyncio
+import copy
+import json
+
+import pytest
+
+from tests.test_workflow_validator import WORKFLOW
+from tools.orchestrator_cache import SQLiteCache
+from tools.orchestrator_session_workspace import SessionWorkspace, WorkspaceStore
+from tools.orchestrator_workflow_validator import validate_workflow
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    return tmp_path / "shared.db"
+
+
+def _store(shared_path) -> WorkspaceStore:
+    """A store like the one of a worker process, sharing `shared_path`."""
+    return WorkspaceStore(shared=SQLiteCache(shared_path, "session", 1 << 20))
+
+
+def _replace(path: str, value) -> list[dict]:
+    return [{"op": "replace", "path": path, "value": value}]
+
+
+def test_workers_see_each_other_edits(shared_path):
+    first, second = _store(shared_path), _store(shared_path)
+
+    async def edit():
+        await first.record("s", json.dumps(WORKFLOW))
+        await second.patch("s", _replace("/name", "Edited"))
+        return await first.get("s")
+
+    workspace = asyncio.run(edit())
+    assert workspace.workflow["name"] == "Edited"
+    assert workspace.version == 2
+
+
+def test_concurrent_edits_are_both_kept(shared_path, monkeypatch):
+    first, second = _store(shared_path), _store(shared_path)
+
+    async def edit():
+        await first.record("s", json.dumps(WORKFLOW))
+        await second.get("s")
+        # The second worker reads the shared copy before the first one saves
+        stale = second.shared.get("s")
+        monkeypatch.setattr(second.shared, "get", lambda key, default=None: stale)
+
+        await first.patch("s", _replace("/name", "First"))
+        await second.patch("s", _replace("/version", "2.0"))
+        return await _store(shared_path).get("s")
+
+    workspace = asyncio.run(edit())
+    assert workspace.workflow["name"] == "First"
+    assert workspace.workflow["version"] == "2.0"
+    assert workspace.version == 3
+
+
+def test_patch_revalidates_only_the_touched_states():
+    workspace = SessionWorkspace("s")
+    workspace.set_workflow(copy.deepcopy(WORKFLOW))
+    assert workspace.validate() == []
+    assert workspace.revalidated == len(WORKFLOW["states"])
+
+    workspace.apply_patch(_replace("/states/3/actions/0/eventRef/triggerEventRef", "x"))
+    issues = workspace.validate()
+    assert workspace.revalidated == 1
+    assert [issue.path for issue in issues] == [
+        "/states/3/actions/0/eventRef/triggerEventRef"
+    ]
+    assert issues == validate_workflow(workspace.workflow)
+
+    # Renaming a state can break references from any other state
+    workspace.apply_patch(_replace("/states/1/name", "Route"))
+    issues = workspace.validate()
+    assert workspace.revalidated == len(WORKFLOW["states"])
+    assert issues == validate_workflow(workspace.workflow)
+    assert workspace.validate() is issues
+    assert workspace.revalidated == 0
@@ -0,0 +1,234 @@
+import copy
+import json
+
+import pytest
+
+from tools.orchestrator_workflow_validator import (
+    ValidationIssue,
+    format_issues,
+    has_errors,
+    validate_workflow,
+)
+
+WORKFLOW = {
+    "id": "order",
+    "version": "1.0",
+    "specVersion": "0.8",
+    "name": "Order",
+    "start": "Receive",
+    "functions": [{"name": "charge", "operation": "specs/pay.yaml#charge"}],
+    "errors": [{"name": "declined", "code": "402"}],
+    "events": [{"name": "paid", "source": "pay", "type": "paid"}],
+    "states": [
+        {
+            "name": "Receive",
+            "type": "event",
+            "onEvents": [
+                {
+                    "eventRefs": ["paid"],
+                    "actions": [{"functionRef": {"refName": "charge"}}],
+                }
+            ],
+            "transition": "Check",
+        },
+        {
+            "name": "Check",
+            "type": "switch",
+            "dataConditions": [{"condition": ".ok", "transition": "Charge"}],
+            "eventConditions": [{"eventRef": "paid", "transition": "Charge"}],
+            "defaultCondition": {"transition": {"nextState": "Done"}},
+        },
+        {
+            "name": "Charge",
+            "type": "parallel",
+            "branches": [{"name": "b", "actions": [{"functionRef": "charge"}]}],
+            "onErrors": [{"errorRef": "declined", "transition": "Done"}],
+            "compensatedBy": "Done",
+            "transition": "Done",
+        },
+        {
+            "name": "Done",
+            "type": "operation",
+            "actions": [{"eventRef": {"triggerEventRef": "paid"}}],
+            "end": True,
+        },
+    ],
+}
+
+# Values of every JSON type, substituted for each value of the workflow
+WRONG_VALUES = [["A"], [["A"]], [{"x": 1}], {"x": ["A"]}, {}, "x", 1, True, None]
+
+
+def _paths(value, path=()):
+    yield path
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _paths(item, path + (key,))
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from _paths(item, path + (i,))
+
+
+def _replace(document, path, value):
+    document = copy.deepcopy(document)
+    parent = document
+    for key in path[:-1]:
+        parent = parent[key]
+    parent[path[-1]] = value
+    return document
+
+
+def _corpus():
+    for path in _paths(WORKFLOW):
+        if path:
+            for value in WRONG_VALUES:
+                yield _replace(WORKFLOW, path, value)
+
+
+def test_valid_workflow_has_no_issues():
+    assert validate_workflow(WORKFLOW) == []
+
+
+def test_malformed_corpus_never_raises():
+    count = 0
+    for workflow in _corpus():
+        issues = validate_workflow(json.dumps(workflow))
+        assert all(isinstance(issue, ValidationIssue) for issue in issues)
+        count += 1
+    assert count > 500
+
+
+@pytest.mark.parametrize(
+    "path, value, pointer, message",
+    [
+        (("states", 0, "name"), ["A"], "/states/0/name", "state name must be"),
+        (("states", 0, "transition"), ["B"], "/states/0/transition", "state name"),
+        (("states", 3, "actions"), ["x"], "/states/3/actions/0", "action must be"),
+        (("states", 2, "onErrors"), ["x"], "/states/2/onErrors/0", "must be an object"),
+        (("states", 2, "branches"), ["x"], "/states/2/branches/0", "branch must be"),
+        (("states", 0, "onEvents"), ["x"], "/states/0/onEvents/0", "must be an object"),
+        (("states", 3, "actions"), "x", "/states/3/actions", "must be an array"),
+        (("states", 1), "x", "/states/1", "state must be an object"),
+        (("start",), ["Receive"], "/start", "start must be a state name"),
+        (
+            ("states", 3, "actions", 0, "eventRef", "triggerEventRef"),
+            ["paid"],
+            "/states/3/actions/0/eventRef/triggerEventRef",
+            "event name",
+        ),
+    ],
+)
+def test_wrong_types_are_reported(path, value, pointer, message):
+    issues = validate_workflow(_replace(WORKFLOW, path, value))
+    assert any(
+        issue.path == pointer and message in issue.message for issue in issues
+    ), issues
+
+
+def test_missing_version_is_only_a_warning():
+    workflow = {key: value for key, value in WORKFLOW.items() if key != "version"}
+    issues = validate_workflow(workflow)
+    assert [str(issue) for issue in issues] == [
+        "(root): warning: missing recommended field 'version'"
+    ]
+    assert not has_errors(issues)
+    assert format_issues(issues).startswith("[WARN] 1 warning(s) found")
+
+
+def test_key_replaces_id_and_name_start_are_only_warnings():
+    workflow = {
+        key: value
+        for key, value in WORKFLOW.items()
+        if key not in ("id", "name", "start")
+    }
+    workflow["key"] = "order"
+    issues = validate_workflow(workflow)
+    assert [str(issue) for issue in issues] == [
+        "(root): warning: missing recommended field 'name'",
+        "(root): warning: missing recommended field 'start'",
+    ]
+
+
+def test_missing_id_and_key_is_an_error():
+    workflow = {key: value for key, value in WORKFLOW.items() if key != "id"}
+    issues = validate_workflow(workflow)
+    assert [str(issue) for issue in issues] == [
+        "(root): missing required field 'id' or 'key'"
+    ]
+
+
+def test_operation_without_actions_is_only_a_warning():
+    workflow = _replace(WORKFLOW, ("states", 3, "actions"), [])
+    issues = validate_workflow(workflow)
+    assert [str(issue) for issue in issues] == [
+        "/states/3/actions: warning: operation state must have at least one action"
+    ]
+    assert not has_errors(issues)
+
+
+# (path, valid value, invalid value, pointer, message, warning) for each rule
+RULES = [
+    (
+        ("states", 0, "transition"),
+        {"nextState": "Check"},
+        "Nowhere",
+        "/states/0/transition",
+        "transition to unknown state 'Nowhere'",
+        False,
+    ),
+    (
+        ("states", 2, "onErrors", 0, "errorRef"),
+        "declined",
+        "timeout",
+        "/states/2/onErrors/0",
+        "unknown errorRef 'timeout'",
+        False,
+    ),
+    (
+        ("states", 0, "onEvents", 0, "actions", 0, "functionRef"),
+        "charge",
+        {"refName": "refund"},
+        "/states/0/onEvents/0/actions/0/functionRef",
+        "unknown functionRef.refName 'refund'",
+        False,
+    ),
+    (
+        ("states", 0, "onEvents", 0, "eventRefs"),
+        ["paid"],
+        ["paid", "shipped"],
+        "/states/0/onEvents/0/eventRefs/1",
+        "unknown event 'shipped'",
+        False,
+    ),
+    (
+        ("start",),
+        "Receive",
+        "Check",
+        "/states/0",
+        "state 'Receive' is not reachable from start",
+        True,
+    ),
+    (
+        ("states", 3, "name"),
+        "Done",
+        "Charge",
+        "/states/3/name",
+        "duplicate state name 'Charge'",
+        False,
+    ),
+]
+
+
+@pytest.mark.parametrize("path, valid, invalid, pointer, message, warning", RULES)
+def test_rule_accepts_valid_value(path, valid, invalid, pointer, message, warning):
+    assert validate_workflow(_replace(WORKFLOW, path, valid)) == []
+
+
+@pytest.mark.parametrize("path, valid, invalid, pointer, message, warning", RULES)
+def test_rule_reports_invalid_value(path, valid, invalid, pointer, message, warning):
+    issues = validate_workflow(_replace(WORKFLOW, path, invalid))
+    matching = [issue for issue in issues if issue.path == pointer]
+    assert [(issue.message, issue.warning) for issue in matching] == [
+        (message, warning)
+    ], issues
+    assert has_errors(issues) != warning
@@ -1,13 +1,25 @@
+from .orchestrator_compile_session_workflow import compile_session_workflow
 from .orchestrator_compile_workflow import compile_workflow
+from .orchestrator_compile_workflows_batch import compile_workflows_batch
 from .orchestrator_creation_workflow_rules import creation_workflow_rules
 from .orchestrator_get_sample_workflow import get_sample_workflow
 from .orchestrator_get_schema_rules import get_schema_rules
+from .orchestrator_patch_workflow import patch_workflow
+from .orchestrator_preview_session_workflow import preview_session_workflow
+from .orchestrator_search_sample_workflows import search_sample_workflows
+from .orchestrator_validate_workflow_schema import validate_workflow_schema
 from .orchestrator_workflow_renderer import preview_workflow
 
 __all__ = [
+    compile_session_workflow,
     compile_workflow,
+    compile_workflows_batch,
     creation_workflow_rules,
     get_schema_rules,
     get_sample_workflow,
+    patch_workflow,
+    preview_session_workflow,
     preview_workflow,
+    search_sample_workflows,
+    validate_workflow_schema,
 ]
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Every slot is taken and the wait queue is full."""
+
+
+class AdmissionQueue:
+    """
+    Bounds how many jobs run at once and how many may wait for a slot.
+    Jobs arriving when both are exhausted are rejected immediately instead
+    of piling up.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_waiting: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.running = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Wait for a free slot and hold it for the duration of the block.
+
+        Yields:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            QueueFullError: When no slot is free and the queue is full
+        """
+        if self._semaphore.locked() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} queue is full, retry later")
+
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        wait = time.monotonic() - started
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        self.running += 1
+        try:
+            yield wait
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
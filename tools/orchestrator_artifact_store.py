@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIR = Path(__file__).parent.parent / "assets" / "workflows"
+
+ARTIFACT_MAX_BYTES = int(
+    os.environ.get("ORCHESTRATOR_ARTIFACT_MAX_BYTES", str(512 * 1024 * 1024))
+)
+ARTIFACT_MAX_AGE = float(os.environ.get("ORCHESTRATOR_ARTIFACT_MAX_AGE", "86400"))
+ARTIFACT_SWEEP_INTERVAL = float(
+    os.environ.get("ORCHESTRATOR_ARTIFACT_SWEEP_INTERVAL", "300")
+)
+
+# Seconds after which a *.tmp file, written by a rasterization before its
+# atomic rename, is a leftover of a crashed worker rather than in flight;
+# far longer than any render takes
+TEMP_FILE_MAX_AGE = 600
+
+
+class ArtifactStore:
+    """
+    Directory of generated preview files, served under /static. A periodic
+    sweep deletes files older than `max_age` and then the least recently used
+    ones (by mtime, refreshed with `touch`) until the total is under
+    `max_bytes`. Temporary files being written are left alone.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, max_age: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.bytes = 0
+        self.files = 0
+        self.expired = 0
+        self.evicted = 0
+        self.sweeps = 0
+        self.last_sweep_duration = 0.0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def new_path(self, suffix: str = ".png") -> Path:
+        """Unique path for a new artifact."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / f"{uuid.uuid4()}{suffix}"
+
+    def touch(self, path: str | Path) -> bool:
+        """Mark an artifact as used; False if it no longer exists."""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    def sweep(self):
+        started = time.monotonic()
+        now = time.time()
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                except OSError:
+                    pass
+
+        total = 0
+        kept = []
+        for mtime, size, path in entries:
+            if path.endswith(".tmp"):
+                # Removing it would make the rename of a live preview fail
+                if now - mtime > TEMP_FILE_MAX_AGE and self._remove(path):
+                    self.expired += 1
+                continue
+            if now - mtime > self.max_age:
+                if self._remove(path):
+                    self.expired += 1
+                    continue
+            total += size
+            kept.append((mtime, size, path))
+
+        kept.sort()
+        files = len(kept)
+        for _, size, path in kept:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self.evicted += 1
+                total -= size
+                files -= 1
+
+        self.bytes = total
+        self.files = files
+        self.sweeps += 1
+        self.last_sweep_duration = time.monotonic() - started
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning(f"Cannot remove artifact {path}: {e}")
+            return False
+
+    async def run_sweeper(self, interval: float = ARTIFACT_SWEEP_INTERVAL):
+        """Sweep forever, every `interval` seconds; cancel the task to stop."""
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Artifact sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {
+            "bytes": self.bytes,
+            "files": self.files,
+            "max_bytes": self.max_bytes,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "sweeps": self.sweeps,
+            "last_sweep_duration": self.last_sweep_duration,
+        }
+
+
+artifact_store = ArtifactStore(ARTIFACTS_DIR, ARTIFACT_MAX_BYTES, ARTIFACT_MAX_AGE)
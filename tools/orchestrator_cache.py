@@ -0,0 +1,579 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# SQLite database shared by the worker processes of a host, on local disk or
+# e.g. under /dev/shm; unset to keep every cache per process
+SHARED_CACHE_PATH = os.environ.get("ORCHESTRATOR_SHARED_CACHE_PATH")
+SHARED_CACHE_MAX_BYTES = int(
+    os.environ.get("ORCHESTRATOR_SHARED_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+# Seconds a worker waits for another one computing the same entry before
+# computing it itself
+SHARED_CACHE_LOCK_TIMEOUT = float(
+    os.environ.get("ORCHESTRATOR_SHARED_CACHE_LOCK_TIMEOUT", "60")
+)
+
+# Threads running the second cache tiers' blocking calls, so that a database
+# busy with another worker's write never stalls the event loop
+CACHE_IO_THREADS = 4
+
+_io_executor: ThreadPoolExecutor | None = None
+
+
+async def run_blocking(function, *args):
+    """Run a blocking cache call in the cache I/O threads."""
+    global _io_executor
+
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=CACHE_IO_THREADS, thread_name_prefix="cache-io"
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_executor, function, *args)
+
+
+def canonical_workflow(workflow: str) -> str:
+    """
+    Return a canonical form of a workflow so that formatting-only differences
+    (whitespace, key order) map to the same text. Invalid JSON is only stripped.
+    """
+    try:
+        data = json.loads(workflow)
+    except ValueError:
+        return workflow.strip()
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def workflow_digest(workflow: str, *salt: str) -> str:
+    """Content hash of the canonical workflow, mixed with optional salt values."""
+    digest = hashlib.sha256()
+    for value in salt:
+        digest.update(value.encode("utf-8") + b"\0")
+    digest.update(canonical_workflow(workflow).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with an optional per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: str, value):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """
+    JSON values stored as one file per key. Entries older than `ttl` are
+    ignored and removed; once the directory exceeds `max_bytes` the least
+    recently used files (by mtime, refreshed on every hit) are deleted.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, ttl: float | None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(path.stat().st_size for path in self._files())
+
+    def _files(self):
+        return self.directory.glob("*.json")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _remove(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self._size -= size
+        except OSError:
+            pass
+
+    def get(self, key: str, default=None):
+        path = self._path(key)
+        with self._lock:
+            try:
+                if self.ttl and path.stat().st_mtime + self.ttl < time.time():
+                    self._remove(path)
+                    raise FileNotFoundError(path)
+                value = json.loads(path.read_text(encoding="utf-8"))
+                os.utime(path)
+            except (OSError, ValueError):
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value):
+        path = self._path(key)
+        data = json.dumps(value).encode("utf-8")
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            try:
+                previous = path.stat().st_size if path.exists() else 0
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Cannot write cache entry {path}: {e}")
+                return
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._files():
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                pass
+
+        for _, path in sorted(entries):
+            if self._size <= self.max_bytes:
+                break
+            self._remove(path)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class FileLocks:
+    """
+    Locks by key shared between processes, taken with flock(2) on files of a
+    directory. Keys are spread over `stripes` files, so unrelated keys rarely
+    share a lock and the directory never grows.
+    """
+
+    def __init__(self, directory: str | Path, timeout: float, stripes: int = 1024):
+        self.directory = Path(directory)
+        self.timeout = timeout
+        self.stripes = stripes
+        self.waits = 0
+        self.timeouts = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        """
+        Hold the lock of `key` for the block, polling so the event loop keeps
+        running. Yields True when another holder had to be waited for, i.e.
+        it probably stored what the block is about to compute. After
+        `timeout` seconds the block runs without the lock.
+        """
+        stripe = zlib.crc32(key.encode("utf-8")) % self.stripes
+        fd = os.open(self.directory / f"{stripe}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        locked = waited = False
+        try:
+            deadline = time.monotonic() + self.timeout
+            delay = 0.005
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    pass
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                if time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    logger.warning(f"Gave up waiting for the lock of {key}")
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+            yield waited
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+class SQLiteCache:
+    """
+    JSON values in a SQLite database in WAL mode, shared by every process
+    opening the same file: readers block neither each other nor the writer.
+    Several caches live side by side in it, each under its own namespace.
+    Once the database holds more than `max_bytes` of values, the least
+    recently used entries are deleted, whatever their namespace.
+
+    Database errors (busy, corrupt, full disk) are logged and count as
+    misses, so the cache never fails the call using it. `locks` let the
+    processes compute each missing entry once, see TieredCache.single_flight.
+    """
+
+    # Values stored between two checks of the database size
+    PRUNE_EVERY = 64
+    # Seconds between two updates of the last use time of an entry
+    TOUCH_INTERVAL = 60
+
+    def __init__(
+        self,
+        path: str | Path,
+        namespace: str,
+        max_bytes: int,
+        ttl: float | None = None,
+        lock_timeout: float = SHARED_CACHE_LOCK_TIMEOUT,
+    ):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        self._sets = 0
+        self._local = threading.local()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.locks = FileLocks(f"{self.path}.locks", lock_timeout)
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL, used_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_used_at "
+                "ON cache_entries (used_at)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def _error(self, action: str, e: Exception):
+        self.errors += 1
+        logger.warning(f"Shared cache {action} failed in {self.path}: {e}")
+
+    def get(self, key: str, default=None):
+        now = time.time()
+        value = None
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value, expires_at, used_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is not None:
+                data, expires_at, used_at = row
+                if expires_at is not None and expires_at <= now:
+                    connection.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key),
+                    )
+                else:
+                    value = json.loads(data)
+                    if now - used_at > self.TOUCH_INTERVAL:
+                        connection.execute(
+                            "UPDATE cache_entries SET used_at = ? "
+                            "WHERE namespace = ? AND key = ?",
+                            (now, self.namespace, key),
+                        )
+        except (sqlite3.Error, ValueError) as e:
+            self._error("read", e)
+
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def _insert(self, connection: sqlite3.Connection, key: str, data: str, now: float):
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.namespace,
+                key,
+                data,
+                len(data),
+                now + self.ttl if self.ttl else None,
+                now,
+            ),
+        )
+
+    def set(self, key: str, value):
+        data = json.dumps(value)
+        now = time.time()
+        try:
+            connection = self._connection()
+            self._insert(connection, key, data, now)
+            self._sets += 1
+            if self._sets % self.PRUNE_EVERY == 1:
+                self._prune(connection, now)
+        except sqlite3.Error as e:
+            self._error("write", e)
+
+    def compare_and_set(self, key: str, check, value) -> tuple[bool, Any]:
+        """
+        Store `value` unless another process changed the entry meanwhile:
+        `check` gets the current value, None when there is none, and tells
+        whether it is still the expected one. Read and write are atomic.
+
+        Returns:
+            (stored, current): whether `value` was stored, and the value the
+            entry holds now; (False, None) when the database failed
+        """
+        data = json.dumps(value)
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT value, expires_at FROM cache_entries "
+                    "WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+                current = None
+                if row is not None and (row[1] is None or row[1] > now):
+                    current = json.loads(row[0])
+                stored = check(current)
+                if stored:
+                    self._insert(connection, key, data, now)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            if not stored:
+                return False, current
+            self._sets += 1
+            if self._sets % self.PRUNE_EVERY == 1:
+                self._prune(connection, now)
+        except (sqlite3.Error, ValueError) as e:
+            self._error("write", e)
+            return False, None
+        return True, value
+
+    def _prune(self, connection: sqlite3.Connection, now: float):
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM cache_entries WHERE expires_at <= ?", (now,)
+            )
+            (total,) = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+            excess = total - self.max_bytes
+            evicted = []
+            if excess > 0:
+                for namespace, key, size in connection.execute(
+                    "SELECT namespace, key, size FROM cache_entries ORDER BY used_at"
+                ):
+                    evicted.append((namespace, key))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                connection.executemany(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    evicted,
+                )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        self.evictions += len(evicted)
+
+    def stats(self) -> dict:
+        try:
+            entries, size = (
+                self._connection()
+                .execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries "
+                    "WHERE namespace = ?",
+                    (self.namespace,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            self._error("stats", e)
+            entries = size = None
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "lock_waits": self.locks.waits,
+            "lock_timeouts": self.locks.timeouts,
+        }
+
+
+def shared_cache(namespace: str, ttl: float | None = None) -> SQLiteCache | None:
+    """
+    The `namespace` part of the cache shared by worker processes, or None
+    when ORCHESTRATOR_SHARED_CACHE_PATH is not set.
+    """
+    if not SHARED_CACHE_PATH:
+        return None
+    return SQLiteCache(SHARED_CACHE_PATH, namespace, SHARED_CACHE_MAX_BYTES, ttl)
+
+
+class TieredCache:
+    """
+    An in-memory LRU tier backed by an optional second tier: a DiskCache, or
+    a SQLiteCache shared with the other worker processes.
+
+    Coroutines use `aget` and `aset`, which read and write the second tier in
+    the cache I/O threads instead of on the event loop.
+    """
+
+    def __init__(self, memory: LRUCache, disk: DiskCache | None = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    async def aget(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            value = await run_blocking(self.disk.get, key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    async def aset(self, key: str, value):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await run_blocking(self.disk.set, key, value)
+
+    @asynccontextmanager
+    async def single_flight(self, key: str):
+        """
+        Let one process at a time compute a missing value when the second
+        tier is shared between processes; a no-op otherwise.
+
+        Yields the value another process stored while this one waited for
+        its turn, or None when it is up to the caller to compute and `set`
+        it.
+        """
+        locks = getattr(self.disk, "locks", None)
+        if locks is None:
+            yield None
+            return
+
+        async with locks.hold(key) as waited:
+            value = await run_blocking(self.disk.get, key) if waited else None
+            if value is not None:
+                self.memory.set(key, value)
+            yield value
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -0,0 +1,282 @@
+import asyncio
+import logging
+import time
+
+from .orchestrator_metrics import DEFAULT_BUCKETS, metrics
+from .orchestrator_tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Must match DefinitionFileExecutor.FRAME_MARKER and PHASE_MARKER
+FRAME_MARKER = b"@@workflow-result@@"
+PHASE_MARKER = "@@workflow-phase@@"
+
+# Kogito may log long lines, don't let them break the stream reader
+STREAM_LIMIT = 16 * 1024 * 1024
+
+jvm_spawn_seconds = metrics.histogram(
+    "orchestrator_jvm_spawn_seconds",
+    "Time to start a java process",
+    ["runner"],
+)
+jvm_lifetime_seconds = metrics.histogram(
+    "orchestrator_jvm_lifetime_seconds",
+    "Time from the start of a java process to its exit",
+    ["runner"],
+    buckets=DEFAULT_BUCKETS + (300.0, 3600.0, 86400.0),
+)
+jvm_exits_total = metrics.counter(
+    "orchestrator_jvm_exits_total",
+    "Exited java processes; status is ok, error (non-zero exit code) or killed",
+    ["runner", "status"],
+)
+
+
+async def spawn_jvm(runner: str, *command: str, **kwargs) -> asyncio.subprocess.Process:
+    """Start a java process (`runner` is daemon, oneshot or batch) and time it."""
+    started = time.monotonic()
+    with tracer.span("jvm.spawn", runner=runner):
+        process = await asyncio.create_subprocess_exec(*command, **kwargs)
+    process.started = started
+    process.exit_recorded = False
+    jvm_spawn_seconds.observe(time.monotonic() - started, runner=runner)
+    return process
+
+
+def record_jvm_exit(runner: str, process: asyncio.subprocess.Process, killed=False):
+    """Account for a java process started by `spawn_jvm` once it has exited."""
+    if process.exit_recorded:
+        return
+    process.exit_recorded = True
+    jvm_lifetime_seconds.observe(time.monotonic() - process.started, runner=runner)
+    if killed:
+        status = "killed"
+    else:
+        status = "ok" if process.returncode == 0 else "error"
+    jvm_exits_total.inc(runner=runner, status=status)
+
+
+def fold_executor_phases(logs: str) -> str:
+    """
+    Turn the phase timings the executor writes in its logs
+    ("@@workflow-phase@@ <phase> <OK|ERROR> <start epoch ns> <duration ns>")
+    into spans under the current one, and return the logs without them.
+    """
+    if PHASE_MARKER not in logs:
+        return logs
+
+    lines = []
+    for line in logs.splitlines(keepends=True):
+        if not line.startswith(PHASE_MARKER):
+            lines.append(line)
+            continue
+        try:
+            _, phase, status, start, duration = line.split()
+            start_ns, duration_ns = int(start), int(duration)
+        except ValueError:
+            logger.debug(f"Malformed executor phase marker: {line.rstrip()}")
+            continue
+        tracer.record(
+            f"executor.{phase}",
+            start_ns,
+            start_ns + duration_ns,
+            error=f"{phase} failed" if status != "OK" else None,
+        )
+    return "".join(lines)
+
+
+class CompileDaemonError(RuntimeError):
+    """The compile daemon died or answered with something we cannot parse."""
+
+
+async def drain_stderr(process: asyncio.subprocess.Process):
+    # Kogito logging is redirected to stderr by the executor; it must be
+    # consumed or the JVM blocks once the pipe buffer is full.
+    async for line in process.stderr:
+        logger.debug(f"Compile daemon: {line.decode(errors='replace').rstrip()}")
+
+
+async def read_frame(stream: asyncio.StreamReader) -> tuple[bool, str, str] | None:
+    """
+    Read the next result frame written by the executor in daemon or batch mode,
+    skipping any other output.
+
+    Returns:
+        (success, logs, name) where name is the workflow file in batch mode,
+        or None once the stream is closed
+    """
+    while True:
+        line = await stream.readline()
+        if not line:
+            return None
+        if line.startswith(FRAME_MARKER):
+            break
+        logger.debug(f"Compile daemon: {line.decode(errors='replace').rstrip()}")
+
+    try:
+        _, status, size, *name = line.rstrip(b"\n").split(b" ", 3)
+        logs = await stream.readexactly(int(size))
+    except (ValueError, asyncio.IncompleteReadError):
+        raise CompileDaemonError(f"Malformed compile daemon response: {line!r}")
+
+    return (
+        status == b"OK",
+        logs.decode("utf-8", errors="replace"),
+        name[0].decode("utf-8", errors="replace") if name else "",
+    )
+
+
+class CompileDaemon:
+    """
+    Client for `DefinitionFileExecutor --daemon`, a long-lived JVM that keeps
+    Kogito loaded and compiles workflows sent over stdin.
+
+    Requests are serialized: a daemon compiles one workflow at a time. If the
+    JVM crashes it is restarted and the request retried once; if a request
+    times out the JVM is killed and restarted on the next call.
+    """
+
+    def __init__(self, command: list[str]):
+        self._command = command
+        self._process: asyncio.subprocess.Process | None = None
+        self._stderr_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _start(self):
+        logger.info(f"Starting compile daemon: {' '.join(self._command)}")
+        self._process = await spawn_jvm(
+            "daemon",
+            *self._command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        self._stderr_task = asyncio.create_task(drain_stderr(self._process))
+
+    async def _ensure_running(self):
+        if self._process is not None and self._process.returncode is None:
+            return
+        if self._process is not None:
+            record_jvm_exit("daemon", self._process)
+            self.restarts += 1
+            logger.warning(
+                f"Compile daemon exited with code {self._process.returncode}, "
+                "restarting"
+            )
+        await self._start()
+
+    async def _kill(self):
+        if self._process is None or self._process.returncode is not None:
+            return
+        try:
+            self._process.kill()
+        except ProcessLookupError:
+            pass
+        await self._process.wait()
+        record_jvm_exit("daemon", self._process, killed=True)
+
+    async def stop(self):
+        async with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.close()
+                await asyncio.wait_for(self._process.wait(), timeout=5)
+                record_jvm_exit("daemon", self._process)
+            except (OSError, asyncio.TimeoutError):
+                await self._kill()
+            self._process = None
+
+    async def _request(self, payload: bytes, mode: str) -> tuple[bool, str]:
+        self._process.stdin.write(f"{len(payload)} {mode}\n".encode() + payload)
+        await self._process.stdin.drain()
+
+        frame = await read_frame(self._process.stdout)
+        if frame is None:
+            raise CompileDaemonError("Compile daemon closed its output")
+
+        success, logs, _ = frame
+        return success, fold_executor_phases(logs)
+
+    async def compile(
+        self, workflow: str, timeout: float, mode: str = "validate"
+    ) -> tuple[bool, str]:
+        """
+        Compile a workflow in the warm JVM.
+
+        Args:
+            workflow: The workflow content as a string
+            timeout: Seconds to wait for the result, JVM startup included
+            mode: "validate" or "execute_stubbed", see compile_workflow
+
+        Returns:
+            A tuple of (success: bool, logs: str)
+        """
+        payload = workflow.encode("utf-8")
+        deadline = time.monotonic() + timeout
+
+        async with self._lock:
+            for attempt in range(2):
+                await self._ensure_running()
+                try:
+                    with tracer.span("jvm.compile", runner="daemon", attempt=attempt):
+                        return await asyncio.wait_for(
+                            self._request(payload, mode), deadline - time.monotonic()
+                        )
+                except asyncio.TimeoutError:
+                    await self._kill()
+                    raise TimeoutError("Workflow compilation timed out")
+                except (ConnectionError, CompileDaemonError) as e:
+                    logger.warning(f"Compile daemon failed: {e}")
+                    await self._kill()
+                    if attempt:
+                        raise
+
+
+class CompileDaemonPool:
+    """A fixed set of compile daemons, each one lent to a single request."""
+
+    def __init__(self, command: list[str], size: int):
+        self.daemons = [CompileDaemon(command) for _ in range(size)]
+        self._idle: asyncio.Queue | None = None
+
+    async def compile(
+        self, workflow: str, timeout: float, mode: str = "validate"
+    ) -> tuple[bool, str]:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for daemon in self.daemons:
+                self._idle.put_nowait(daemon)
+
+        with tracer.span("compile.daemon_wait"):
+            daemon = await self._idle.get()
+        try:
+            return await daemon.compile(workflow, timeout, mode)
+        finally:
+            self._idle.put_nowait(daemon)
+
+    @property
+    def restarts(self) -> int:
+        return sum(daemon.restarts for daemon in self.daemons)
+
+    @property
+    def running(self) -> bool:
+        return all(daemon.running for daemon in self.daemons)
+
+    async def warm_up(self, workflow: str, timeout: float):
+        """
+        Start every daemon and have it compile `workflow`, so that the first
+        requests find Kogito loaded and its code paths compiled by the JIT.
+        """
+        await asyncio.gather(
+            *(daemon.compile(workflow, timeout) for daemon in self.daemons)
+        )
+
+    async def stop(self):
+        await asyncio.gather(*(daemon.stop() for daemon in self.daemons))
@@ -0,0 +1,44 @@
+import logging
+
+from .orchestrator_compile_workflow import CompileMode, compile_workflow_text
+from .orchestrator_json_patch import JsonPatchError
+from .orchestrator_service import orchestrator_mcp
+from .orchestrator_session_workspace import NoWorkflowError, workspaces
+
+logger = logging.getLogger(__name__)
+
+
+@orchestrator_mcp.tool()
+async def compile_session_workflow(
+    session_id: str,
+    patch: list[dict] | None = None,
+    mode: CompileMode = "validate",
+) -> (bool, str):
+    """
+    Compile the session's workflow, the last one sent to compile_workflow or
+    preview_workflow, optionally edited first with an RFC 6902 JSON Patch.
+    Only the states the patch touches are pre-validated again, and compiling
+    an unchanged workflow again returns the previous result.
+
+    Args:
+        session_id: The session identifier
+        patch: JSON Patch operations to apply first, e.g.
+            [{"op": "replace", "path": "/start", "value": "Init"}]
+        mode: See compile_workflow
+
+    Returns:
+        A tuple of (success: bool, logs: str)
+    """
+    logger.info(f"orchestrator_compile_session_workflow for session_id='{session_id}'")
+
+    try:
+        workspace = await workspaces.patch(session_id, patch)
+    except (JsonPatchError, NoWorkflowError) as e:
+        return False, f"Error: {e}"
+
+    result = workspace.compile_results.get(mode)
+    if result is not None:
+        logger.info(f"Workspace compile result reused for session_id='{session_id}'")
+        return result
+
+    return await compile_workflow_text(session_id, workspace.text, mode, workspace)
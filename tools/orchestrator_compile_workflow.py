@@ -1,12 +1,101 @@
+import asyncio
+import json
 import logging
 import os
-import subprocess
+import time
 import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
 
+from .orchestrator_admission import AdmissionQueue, QueueFullError
+from .orchestrator_cache import (
+    DiskCache,
+    LRUCache,
+    TieredCache,
+    shared_cache,
+    workflow_digest,
+)
+from .orchestrator_compile_daemon import (
+    CompileDaemonPool,
+    fold_executor_phases,
+    record_jvm_exit,
+    spawn_jvm,
+)
+from .orchestrator_metrics import metrics
 from .orchestrator_service import orchestrator_mcp
+from .orchestrator_session_workspace import SessionWorkspace, workspaces
+from .orchestrator_tracing import tracer
+from .orchestrator_workflow_validator import (
+    format_issues,
+    has_errors,
+    validate_workflow,
+)
 
 logger = logging.getLogger(__name__)
 
+BASE_PATH = Path(__file__).parent.parent / "serverless-workflow"
+
+COMPILE_TIMEOUT = 30
+
+# "validate" builds and processes the workflow without running it;
+# "execute_stubbed" also executes it with every function replaced by a no-op
+CompileMode = Literal["validate", "execute_stubbed"]
+
+# Compile through a warm JVM instead of spawning `java` for every call
+COMPILE_DAEMON_ENABLED = os.environ.get(
+    "ORCHESTRATOR_COMPILE_DAEMON", "true"
+).lower() in ("1", "true", "yes")
+
+# JVMs allowed to compile at once, and compiles allowed to wait for one
+COMPILE_CONCURRENCY = int(os.environ.get("ORCHESTRATOR_COMPILE_CONCURRENCY", "2"))
+COMPILE_QUEUE_LIMIT = int(os.environ.get("ORCHESTRATOR_COMPILE_QUEUE_LIMIT", "16"))
+
+# Compile results cache: memory tier always on, backed by the cache shared by
+# worker processes when configured, else by a disk tier when a directory is
+COMPILE_CACHE_SIZE = int(os.environ.get("ORCHESTRATOR_COMPILE_CACHE_SIZE", "256"))
+COMPILE_CACHE_TTL = float(os.environ.get("ORCHESTRATOR_COMPILE_CACHE_TTL", "3600"))
+COMPILE_CACHE_DIR = os.environ.get("ORCHESTRATOR_COMPILE_CACHE_DIR")
+COMPILE_CACHE_DISK_BYTES = int(
+    os.environ.get("ORCHESTRATOR_COMPILE_CACHE_DISK_BYTES", str(64 * 1024 * 1024))
+)
+
+compile_cache = TieredCache(
+    LRUCache(COMPILE_CACHE_SIZE, ttl=COMPILE_CACHE_TTL),
+    shared_cache("compile", ttl=COMPILE_CACHE_TTL)
+    or (
+        DiskCache(COMPILE_CACHE_DIR, COMPILE_CACHE_DISK_BYTES, ttl=COMPILE_CACHE_TTL)
+        if COMPILE_CACHE_DIR
+        else None
+    ),
+)
+
+compile_queue = AdmissionQueue("compile", COMPILE_CONCURRENCY, COMPILE_QUEUE_LIMIT)
+
+compile_seconds = metrics.histogram(
+    "orchestrator_compile_seconds",
+    "Time spent compiling a workflow in the JVM, queue wait excluded",
+    ["runner", "mode"],
+)
+compile_queue_wait_seconds = metrics.histogram(
+    "orchestrator_compile_queue_wait_seconds",
+    "Time a compilation waited for a free slot",
+)
+
+_compile_daemons = None
+
+# Smallest valid workflow, compiled to warm the JVM up
+WARMUP_WORKFLOW = json.dumps(
+    {
+        "id": "warmup",
+        "version": "1.0",
+        "specVersion": "0.8",
+        "name": "warmup",
+        "start": "Start",
+        "states": [{"name": "Start", "type": "inject", "data": {}, "end": True}],
+    }
+)
+
 
 def get_command():
     base_path = (
@@ -21,47 +110,253 @@ def get_command():
     ]
 
 
-@orchestrator_mcp.tool()
-def compile_workflow(session_id: str, workflow: str) -> (bool, str):
+@lru_cache(maxsize=1)
+def executor_version() -> str:
     """
-    Compile and validate a rhdh orchestrator workflow by writing it to a
-    temporary file and executing the validation command.
+    Identify the executor build: the Kogito runtime jar version plus the
+    modification time of the project jar. Part of every compile cache key, so
+    rebuilding or upgrading Kogito never serves stale results.
+    """
+    target = BASE_PATH / "target"
+    kogito_jars = sorted(
+        jar.name
+        for jar in (target / "dependency").glob(
+            "kogito-serverless-workflow-runtime-*.jar"
+        )
+    )
+    try:
+        project_jar_mtime = str(
+            (target / "my-workflow-project-1.0-SNAPSHOT.jar").stat().st_mtime_ns
+        )
+    except OSError:
+        project_jar_mtime = ""
+    return ",".join(kogito_jars + [project_jar_mtime])
 
-    Args:
-        session_id: The session identifier
-        workflow: The workflow content as a string
 
-    Returns:
-        A tuple of (success: bool, logs: str)
+def get_compile_daemons() -> CompileDaemonPool:
+    """One warm JVM per compile slot, started on first use."""
+    global _compile_daemons
+
+    if _compile_daemons is None:
+        _compile_daemons = CompileDaemonPool(
+            get_command() + ["--daemon"], COMPILE_CONCURRENCY
+        )
+    return _compile_daemons
+
+
+async def warm_up_compiler():
     """
-    logger.info(f"orchestrator_compile_workflow for session_id='{session_id}'")
+    Compile a trivial workflow ahead of the first request: through every
+    compile daemon, or once with a one-shot JVM to fill the OS file cache.
+    """
+    if COMPILE_DAEMON_ENABLED:
+        await get_compile_daemons().warm_up(WARMUP_WORKFLOW, COMPILE_TIMEOUT)
+        return
+    success, logs = await _compile_with_subprocess(WARMUP_WORKFLOW, "validate")
+    if not success:
+        raise RuntimeError(f"Warm-up compilation failed: {logs[-500:]}")
+
 
+def compile_daemons_running() -> bool:
+    return _compile_daemons is not None and _compile_daemons.running
+
+
+async def stop_compile_daemons():
+    if _compile_daemons is not None:
+        await _compile_daemons.stop()
+
+
+async def _compile_with_subprocess(workflow: str, mode: str) -> tuple[bool, str]:
     # Generate unique filename using UUID
     workflow_uuid = str(uuid.uuid4())
     workflow_path = f"/tmp/workflow-{workflow_uuid}.sw.json"
 
     try:
-        with open(workflow_path, "w") as f:
-            f.write(workflow)
+        with tracer.span("compile.write_temp_file"):
+            with open(workflow_path, "w") as f:
+                f.write(workflow)
 
-        cmd = get_command() + [workflow_path]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-        logs = result.stdout + result.stderr
+        cmd = get_command() + ["--mode", mode, workflow_path]
+        process = await spawn_jvm(
+            "oneshot",
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            with tracer.span("jvm.compile", runner="oneshot"):
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), COMPILE_TIMEOUT
+                )
+                logs = fold_executor_phases(
+                    stdout.decode(errors="replace") + stderr.decode(errors="replace")
+                )
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            record_jvm_exit("oneshot", process, killed=True)
+            raise TimeoutError("Workflow compilation timed out")
+        record_jvm_exit("oneshot", process)
 
+        success = process.returncode == 0
+        return success, logs
+    finally:
         try:
             os.remove(workflow_path)
         except OSError:
             pass
 
-        success = result.returncode == 0
+
+@orchestrator_mcp.tool()
+async def compile_workflow(
+    session_id: str, workflow: str, mode: CompileMode = "validate"
+) -> (bool, str):
+    """
+    Compile and validate a rhdh orchestrator workflow with the Kogito
+    executor, either through the warm compile daemon or by writing it to a
+    temporary file and executing the validation command.
+
+    Args:
+        session_id: The session identifier
+        workflow: The workflow content as a string
+        mode: "validate" (default) parses and processes the workflow without
+            running it, so REST calls, sleeps and event waits never happen;
+            "execute_stubbed" also executes it with every function replaced
+            by a no-op, to catch errors in expressions and data flow
+
+    Returns:
+        A tuple of (success: bool, logs: str); warnings of the pre-validation,
+        e.g. a missing `version`, come first in the logs
+    """
+    logger.info(f"orchestrator_compile_workflow for session_id='{session_id}'")
+
+    workspace = await workspaces.record(session_id, workflow)
+    return await compile_workflow_text(session_id, workflow, mode, workspace)
+
+
+async def compile_workflow_text(
+    session_id: str,
+    workflow: str,
+    mode: CompileMode = "validate",
+    workspace: SessionWorkspace | None = None,
+) -> (bool, str):
+    """
+    Compile a workflow like the compile_workflow tool does.
+
+    Args:
+        session_id: The session identifier
+        workflow: The workflow content as a string
+        mode: See compile_workflow
+        workspace: Session workspace holding this workflow: its incremental
+            validation replaces the pre-validation, and it keeps the result
+
+    Returns:
+        A tuple of (success: bool, logs: str)
+    """
+    with tracer.span("compile_workflow", session_id=session_id) as span:
+        span.set_attribute("workflow.bytes", len(workflow))
+        span.set_attribute("compile.mode", mode)
+        success, logs = await _compile_workflow(
+            session_id, workflow, mode, span, workspace
+        )
+        span.set_attribute("compile.success", success)
         return success, logs
 
-    except Exception as e:
+
+async def _compile_workflow(
+    session_id: str,
+    workflow: str,
+    mode: CompileMode,
+    span,
+    workspace: SessionWorkspace | None,
+) -> (bool, str):
+    version = workspace.version if workspace else None
+
+    # Structural errors are reported right away, without paying for a JVM
+    with tracer.span("compile.prevalidate"):
         try:
-            os.remove(workflow_path)
-        except OSError:
-            pass
+            issues = workspace.validate() if workspace else validate_workflow(workflow)
+        except Exception as e:
+            # A validator bug must not hide what Kogito would report
+            logger.error(f"Pre-validation failed, compiling anyway: {e}")
+            issues = []
+    if has_errors(issues):
+        logger.info(
+            f"Workflow rejected by pre-validation for session_id='{session_id}': "
+            f"{len(issues)} issue(s)"
+        )
+        span.set_attribute("compile.outcome", "prevalidation")
+        result = False, format_issues(issues)
+        if workspace:
+            workspace.record_compile(version, mode, result)
+        return result
+    # Warnings go on top of what the executor reports
+    notes = format_issues(issues) if issues else ""
+
+    cache_key = workflow_digest(workflow, executor_version(), mode)
+    cached = await compile_cache.aget(cache_key)
+    if cached is None:
+        # Workers sharing the cache compile a given workflow only once
+        async with compile_cache.single_flight(cache_key) as cached:
+            if cached is None:
+                span.set_attribute("cache.hit", False)
+                return await _compile_uncached(
+                    session_id,
+                    workflow,
+                    mode,
+                    span,
+                    cache_key,
+                    workspace,
+                    version,
+                    notes,
+                )
+
+    span.set_attribute("cache.hit", True)
+    logger.info(f"Compile cache hit for session_id='{session_id}'")
+    success, logs = cached[0], notes + cached[1]
+    if workspace:
+        workspace.record_compile(version, mode, (success, logs))
+    return success, logs
 
+
+async def _compile_uncached(
+    session_id: str,
+    workflow: str,
+    mode: CompileMode,
+    span,
+    cache_key: str,
+    workspace: SessionWorkspace | None,
+    version: int | None,
+    notes: str = "",
+) -> (bool, str):
+    try:
+        async with compile_queue.slot() as wait:
+            logger.info(
+                f"Compiling for session_id='{session_id}' after {wait:.3f}s in queue"
+            )
+            compile_queue_wait_seconds.observe(wait)
+            now = time.time_ns()
+            tracer.record("compile.queue_wait", now - int(wait * 1e9), now)
+            if COMPILE_DAEMON_ENABLED:
+                with compile_seconds.time(runner="daemon", mode=mode):
+                    success, logs = await get_compile_daemons().compile(
+                        workflow, timeout=COMPILE_TIMEOUT, mode=mode
+                    )
+            else:
+                with compile_seconds.time(runner="oneshot", mode=mode):
+                    success, logs = await _compile_with_subprocess(workflow, mode)
+    except QueueFullError as e:
+        logger.warning(f"Compile queue full, rejecting session_id='{session_id}'")
+        span.set_error("compile queue full")
+        return False, f"Busy: {e}"
+    except Exception as e:
+        # Infrastructure failures (timeouts, missing java) are not cached
         logger.error(f"Error compiling workflow: {e}")
+        span.set_error(str(e))
         return False, f"Error: {str(e)}"
+
+    await compile_cache.aset(cache_key, [success, logs])
+    logs = notes + logs
+    if workspace:
+        workspace.record_compile(version, mode, (success, logs))
+    return success, logs
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import math
+import os
+import shutil
+import tempfile
+import time
+from contextlib import suppress
+from pathlib import Path
+
+from fastmcp.server.context import Context
+
+from .orchestrator_admission import QueueFullError
+from .orchestrator_cache import workflow_digest
+from .orchestrator_compile_daemon import (
+    STREAM_LIMIT,
+    drain_stderr,
+    fold_executor_phases,
+    read_frame,
+    record_jvm_exit,
+    spawn_jvm,
+)
+from .orchestrator_compile_workflow import (
+    COMPILE_TIMEOUT,
+    CompileMode,
+    compile_cache,
+    compile_queue,
+    executor_version,
+    get_command,
+)
+from .orchestrator_service import orchestrator_mcp
+from .orchestrator_workflow_validator import (
+    format_issues,
+    has_errors,
+    validate_workflow,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the `parallel` argument, i.e. validation threads in the JVM
+BATCH_MAX_PARALLEL = int(
+    os.environ.get("ORCHESTRATOR_BATCH_MAX_PARALLEL", str(os.cpu_count() or 1))
+)
+
+# Server-side directory the `directory` argument must point into; reading
+# workflows from the server's disk is disabled when unset
+COMPILE_BATCH_ROOT = os.environ.get("ORCHESTRATOR_COMPILE_BATCH_ROOT")
+
+
+def _batch_files(directory: str) -> list[Path]:
+    """
+    The *.sw.json files under a directory of COMPILE_BATCH_ROOT, relative
+    paths being relative to the root. Neither `..` nor a symlink can lead
+    outside of it.
+    """
+    if not COMPILE_BATCH_ROOT:
+        raise ValueError(
+            "Compiling a server-side directory is disabled, "
+            "set ORCHESTRATOR_COMPILE_BATCH_ROOT to enable it"
+        )
+    root = Path(COMPILE_BATCH_ROOT).resolve()
+    path = (root / directory).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"Directory is outside of the batch root: {directory}")
+    if not path.is_dir():
+        raise ValueError(f"Directory not found: {directory}")
+
+    files = []
+    for file in sorted(path.rglob("*.sw.json")):
+        if not file.resolve().is_relative_to(root):
+            logger.warning(f"Skipping {file}, it links outside of the batch root")
+            continue
+        files.append(file)
+    return files
+
+
+def _read_batch_files(directory: str) -> list[tuple[str, str]]:
+    """(path, content) of every workflow file of `directory`, see _batch_files."""
+    return [
+        (str(file), file.read_text(encoding="utf-8"))
+        for file in _batch_files(directory)
+    ]
+
+
+def _write_batch_files(batch_dir: str, pending: dict[str, str]) -> dict[str, str]:
+    """Write `pending` (name -> workflow) to `batch_dir`, return path -> name."""
+    names = {}
+    for index, (name, workflow) in enumerate(pending.items()):
+        path = Path(batch_dir) / f"{index}.sw.json"
+        path.write_text(workflow, encoding="utf-8")
+        names[str(path)] = name
+    return names
+
+
+async def _run_batch(
+    pending: dict[str, str], parallel: int, mode: CompileMode, publish
+):
+    """
+    Validate `pending` (name -> workflow) in a single `--batch` JVM and
+    publish every result as soon as the executor reports it.
+    """
+    # File system calls run in a thread, a slow disk must not stall the loop
+    batch_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="workflow-batch-")
+    try:
+        names = await asyncio.to_thread(_write_batch_files, batch_dir, pending)
+
+        cmd = get_command() + [
+            "--batch",
+            "--parallel",
+            str(parallel),
+            "--mode",
+            mode,
+            *names,
+        ]
+        process = await spawn_jvm(
+            "batch",
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT,
+        )
+        stderr_task = asyncio.create_task(drain_stderr(process))
+
+        deadline = time.monotonic() + COMPILE_TIMEOUT * math.ceil(
+            len(pending) / parallel
+        )
+        finished = False
+        try:
+            while True:
+                frame = await asyncio.wait_for(
+                    read_frame(process.stdout), deadline - time.monotonic()
+                )
+                if frame is None:
+                    finished = True
+                    break
+                success, logs, path = frame
+                logs = fold_executor_phases(logs)
+                if path in names:
+                    await publish(names[path], success, logs, cache=True)
+        except asyncio.TimeoutError:
+            raise TimeoutError("Batch compilation timed out")
+        finally:
+            if finished and process.returncode is None:
+                # Its output is closed, give the JVM a moment to exit on its own
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(process.wait(), 5)
+            killed = process.returncode is None
+            if killed:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+            await process.wait()
+            record_jvm_exit("batch", process, killed=killed)
+            await stderr_task
+    finally:
+        await asyncio.to_thread(shutil.rmtree, batch_dir, ignore_errors=True)
+
+
+@orchestrator_mcp.tool()
+async def compile_workflows_batch(
+    ctx: Context,
+    session_id: str,
+    workflows: list[str] | None = None,
+    directory: str | None = None,
+    parallel: int = 1,
+    mode: CompileMode = "validate",
+) -> list[dict]:
+    """
+    Compile and validate many rhdh orchestrator workflows in a single JVM.
+
+    Use this for regression runs or bulk imports instead of calling
+    compile_workflow once per workflow. Each result is streamed as a progress
+    notification as soon as it is available.
+
+    Args:
+        session_id: The session identifier
+        workflows: Workflow contents as strings
+        directory: Server-side directory searched recursively for *.sw.json,
+            inside ORCHESTRATOR_COMPILE_BATCH_ROOT (relative to it if relative)
+        parallel: Number of workflows validated concurrently in the JVM
+        mode: "validate" or "execute_stubbed", as for compile_workflow
+
+    Returns:
+        list[dict]: One {"name", "success", "logs"} entry per workflow, in input
+        order; name is "workflow-<index>" for inline workflows or the file path,
+        and warnings of the pre-validation come first in the logs
+    """
+    logger.info(f"orchestrator_compile_workflows_batch for session_id='{session_id}'")
+
+    items = [(f"workflow-{i}", workflow) for i, workflow in enumerate(workflows or [])]
+    if directory:
+        items.extend(await asyncio.to_thread(_read_batch_files, directory))
+
+    results = {}
+    keys = {}
+    # Pre-validation warnings, put on top of the logs like compile_workflow does
+    notes = {}
+    # Logs as reported by the executor, for the duplicates of a workflow
+    executor_logs = {}
+
+    async def publish(name: str, success: bool, logs: str, cache: bool = False):
+        if cache:
+            await compile_cache.aset(keys[name], [success, logs])
+        executor_logs[name] = logs
+        logs = notes.get(name, "") + logs
+        results[name] = {"name": name, "success": success, "logs": logs}
+        await ctx.report_progress(len(results), len(items))
+        await ctx.info(f"{name}: {'valid' if success else 'invalid'}")
+
+    # Same short-circuits as compile_workflow: structure first, then cache
+    pending = {}
+    first_by_key = {}
+    duplicates = {}
+    for name, workflow in items:
+        issues = validate_workflow(workflow)
+        if has_errors(issues):
+            await publish(name, False, format_issues(issues))
+            continue
+        if issues:
+            notes[name] = format_issues(issues)
+        keys[name] = workflow_digest(workflow, executor_version(), mode)
+        cached = await compile_cache.aget(keys[name])
+        if cached is not None:
+            await publish(name, *cached)
+            continue
+        # Identical workflows are validated once
+        if keys[name] in first_by_key:
+            duplicates[name] = first_by_key[keys[name]]
+            continue
+        first_by_key[keys[name]] = name
+        pending[name] = workflow
+
+    if pending:
+        parallel = max(1, min(parallel, BATCH_MAX_PARALLEL))
+        try:
+            async with compile_queue.slot():
+                await _run_batch(pending, parallel, mode, publish)
+        except QueueFullError as e:
+            error = f"Busy: {e}"
+        except Exception as e:
+            logger.error(f"Error compiling workflow batch: {e}")
+            error = f"Error: {str(e)}"
+        else:
+            error = "Error: no result reported by the executor"
+
+        for name in pending:
+            if name not in results:
+                await publish(name, False, error)
+        for name, first in duplicates.items():
+            await publish(name, results[first]["success"], executor_logs[first])
+
+    return [results[name] for name, _ in items]
@@ -1,4 +1,7 @@
 import logging
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 
 from .orchestrator_service import orchestrator_mcp
 
@@ -305,8 +308,103 @@ Event states wait for and handle CloudEvents:
 """  # noqa: E501
 
 
+# Names agents are likely to use for sections whose heading says otherwise
+SECTION_ALIASES = {"errors": "error-handling"}
+
+
+@dataclass(frozen=True)
+class RuleSection:
+    """A `##` or `###` section of the rules, subsections included."""
+
+    key: str
+    title: str
+    level: int
+    text: str
+
+
+def section_key(title: str) -> str:
+    """'Function Types & Operations' -> 'function-types-operations'"""
+    title = re.sub(r"\(.*?\)", "", title).rstrip(":")
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def parse_sections(rules: str) -> dict[str, RuleSection]:
+    """Index the `##` and `###` sections of the rules by key, in document order."""
+    lines = rules.splitlines()
+    headings = []
+    in_code = False
+    for i, line in enumerate(lines):
+        if line.startswith("```"):
+            in_code = not in_code
+        elif not in_code and line.startswith("#"):
+            level = len(line) - len(line.lstrip("#"))
+            headings.append((i, level, line[level:].strip()))
+
+    sections = {}
+    for n, (start, level, title) in enumerate(headings):
+        if level not in (2, 3):
+            continue
+        end = next((i for i, lvl, _ in headings[n + 1 :] if lvl <= level), len(lines))
+        key = section_key(title)
+        while key in sections:
+            key += "-2"
+        sections[key] = RuleSection(
+            key, title.rstrip(":"), level, "\n".join(lines[start:end]).strip()
+        )
+    return sections
+
+
+SECTIONS = parse_sections(RULES)
+
+
+def find_section(name: str) -> RuleSection:
+    """
+    Section by key, alias or unambiguous key prefix ("function-types").
+
+    Raises:
+        KeyError: When no section or several sections match
+    """
+    key = section_key(name)
+    key = SECTION_ALIASES.get(key, key)
+    if key in SECTIONS:
+        return SECTIONS[key]
+
+    matches = [k for k in SECTIONS if k.startswith(f"{key}-")]
+    if len(matches) == 1:
+        return SECTIONS[matches[0]]
+    raise KeyError(
+        f"unknown section '{name}', expected one of {', '.join(SECTIONS)}"
+        if not matches
+        else f"ambiguous section '{name}', matches {', '.join(matches)}"
+    )
+
+
+@lru_cache(maxsize=1)
+def rules_summary() -> str:
+    lines = [
+        "# ORCHESTRATOR WORKFLOW CREATION INSTRUCTIONS: SECTIONS",
+        "Fetch the ones you need with creation_workflow_rules(sections=[...]):",
+    ]
+    for section in SECTIONS.values():
+        indent = "  " * (section.level - 2)
+        lines.append(f"{indent}- `{section.key}`: {section.title}")
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=128)
+def rules_sections(keys: tuple[str, ...]) -> str:
+    """The given sections in document order, subsections of a given one skipped."""
+    texts = []
+    for key, section in SECTIONS.items():
+        if key in keys and not any(section.text in text for text in texts):
+            texts.append(section.text)
+    return "\n\n".join(texts) + "\n"
+
+
 @orchestrator_mcp.tool()
-def creation_workflow_rules(session_id: str) -> str:
+def creation_workflow_rules(
+    session_id: str, sections: list[str] | None = None, summary: bool = False
+) -> str:
     """
     **CRITICAL: CALL THIS TOOL FIRST** - Essential orchestrator workflow creation rules.
 
@@ -320,8 +418,27 @@ def creation_workflow_rules(session_id: str) -> str:
 
     **Always use this tool at the start of any workflow-related task to ensure compliance.**
     Contains essential context that prevents common workflow creation errors.
+
+    Without arguments the complete rules are returned. When you already know them,
+    use `summary=True` to list the sections and `sections` to fetch only those you
+    need, e.g. ["functions", "error-handling", "validation-rules"].
+
+    Args:
+        session_id: The session identifier
+        sections: Section keys (or unambiguous prefixes) to return instead of all rules
+        summary: Return the list of sections instead of their content
     """  # noqa: E501
 
     logger.info(f"orchestrator_creation_workflow_rules for session_id='{session_id}'")
 
+    if summary:
+        return rules_summary()
+
+    if sections:
+        try:
+            keys = {find_section(name).key for name in sections}
+        except KeyError as e:
+            return f"Error: {e.args[0]}"
+        return rules_sections(tuple(sorted(keys)))
+
     return RULES
@@ -0,0 +1,289 @@
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+EXAMPLES_DIR = Path(__file__).parent / "examples"
+
+# Seconds between two checks of the examples directory for changes
+EXAMPLES_RELOAD_INTERVAL = float(
+    os.environ.get("ORCHESTRATOR_EXAMPLES_RELOAD_INTERVAL", "2")
+)
+
+INPUT_SUFFIX = "_input.txt"
+OUTPUT_SUFFIX = "_output.txt"
+
+# A term in the user request of an example says more about what it covers
+# than the same term in its workflow JSON
+INPUT_WEIGHT = 2
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have i in is it its of on or "
+    "should that the then this to when which will with".split()
+)
+
+
+def _consonant(word: str, i: int) -> bool:
+    if word[i] in "aeiou":
+        return False
+    # "y" is a vowel after a consonant, as in "retry"
+    return word[i] != "y" or i == 0 or not _consonant(word, i - 1)
+
+
+def _measure(word: str) -> int:
+    """Porter's m: how many vowel-consonant sequences `word` has."""
+    m = 0
+    for i in range(1, len(word)):
+        if _consonant(word, i) and not _consonant(word, i - 1):
+            m += 1
+    return m
+
+
+def _has_vowel(word: str) -> bool:
+    return any(not _consonant(word, i) for i in range(len(word)))
+
+
+def _ends_cvc(word: str) -> bool:
+    """Consonant-vowel-consonant ending, the last one not w, x or y ("hop")."""
+    n = len(word)
+    return (
+        n >= 3
+        and _consonant(word, n - 3)
+        and not _consonant(word, n - 2)
+        and _consonant(word, n - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+def _stem(term: str) -> str:
+    """
+    Steps 1 and 5 of the Porter stemmer: plurals, -ed, -ing, final -y and -e,
+    so "retries" and "retry" or "scheduling" and "schedule" share a stem.
+    """
+    if len(term) <= 2:
+        return term
+
+    # Step 1a: plurals
+    if term.endswith(("sses", "ies")):
+        term = term[:-2]
+    elif term.endswith("s") and not term.endswith("ss"):
+        term = term[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if term.endswith("eed"):
+        if _measure(term[:-3]) > 0:
+            term = term[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if term.endswith(suffix) and _has_vowel(term[: -len(suffix)]):
+                term = term[: -len(suffix)]
+                if term.endswith(("at", "bl", "iz")):
+                    term += "e"
+                elif (
+                    len(term) > 1
+                    and term[-1] == term[-2]
+                    and _consonant(term, len(term) - 1)
+                    and term[-1] not in "lsz"
+                ):
+                    term = term[:-1]
+                elif _measure(term) == 1 and _ends_cvc(term):
+                    term += "e"
+                break
+
+    # Step 1c: final -y after a vowel-holding stem
+    if term.endswith("y") and _has_vowel(term[:-1]):
+        term = term[:-1] + "i"
+
+    # Step 5: final -e and -ll
+    if term.endswith("e"):
+        m = _measure(term[:-1])
+        if m > 1 or (m == 1 and not _ends_cvc(term[:-1])):
+            term = term[:-1]
+    if term.endswith("ll") and _measure(term) > 1:
+        term = term[:-1]
+    return term
+
+
+def tokenize(text: str) -> list[str]:
+    """Stemmed lowercase terms, camelCase and punctuation split, stopwords dropped."""
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text)
+    return [
+        _stem(term)
+        for term in re.findall(r"[a-z0-9]+", text.lower())
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+class WorkflowExample:
+    @classmethod
+    def load(cls, category: str, directory: Path = EXAMPLES_DIR):
+        input_file = directory / f"{category}{INPUT_SUFFIX}"
+        output_file = directory / f"{category}{OUTPUT_SUFFIX}"
+
+        input_text = ""
+        output_text = ""
+
+        try:
+            input_text = input_file.read_text(encoding="utf-8").strip()
+            output_text = output_file.read_text(encoding="utf-8").strip()
+        except FileNotFoundError as e:
+            logger.warning(f"Example workflow file not found: {e}")
+
+        return cls(category, input_text, output_text)
+
+    def __init__(self, category: str, input_text: str, output_text: str):
+        self.category = category
+        self.input = input_text
+        self.output = output_text
+
+    def terms(self) -> Counter:
+        terms = Counter(tokenize(self.category.replace("_", " ")))
+        for term, count in Counter(tokenize(self.input)).items():
+            terms[term] += count * INPUT_WEIGHT
+        terms.update(tokenize(self.output))
+        return terms
+
+    def llm_output(self) -> str:
+        """Render this workflow example into a formatted string for LLM consumption."""
+        output = f"## Workflow Example: {self.category.replace('_', ' ').title()}\n\n"
+
+        output += "<input_example>\n"
+        output += self.input + "\n"
+        output += "</input_example>\n\n"
+
+        output += "<output_example>\n"
+        output += self.output + "\n"
+        output += "</output_example>\n"
+
+        return output
+
+
+class BM25Index:
+    """Inverted index ranking documents for a free-text query with Okapi BM25."""
+
+    def __init__(self, documents: dict[str, Counter], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.lengths = {doc: sum(terms.values()) for doc, terms in documents.items()}
+        self.avg_length = (
+            sum(self.lengths.values()) / len(self.lengths) if self.lengths else 0.0
+        )
+
+        self.postings: dict[str, dict[str, int]] = {}
+        for doc, terms in documents.items():
+            for term, count in terms.items():
+                self.postings.setdefault(term, {})[doc] = count
+
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query: str, k: int) -> list[tuple[str, float]]:
+        """The `k` best matching documents with their score, best first."""
+        scores: Counter = Counter()
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc, tf in self.postings[term].items():
+                norm = 1 - self.b + self.b * self.lengths[doc] / self.avg_length
+                scores[doc] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return scores.most_common(k)
+
+
+class ExampleStore:
+    """
+    The example workflows of a directory, one `<category>_input.txt` and
+    `<category>_output.txt` pair each. Loaded on first use and reloaded when
+    files are added, removed or modified (checked at most every
+    `reload_interval` seconds).
+    """
+
+    def __init__(
+        self,
+        directory: Path = EXAMPLES_DIR,
+        reload_interval: float = EXAMPLES_RELOAD_INTERVAL,
+    ):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked = 0.0
+        # Examples and their index, replaced together on reload
+        self._loaded: tuple[dict[str, WorkflowExample], BM25Index] = (
+            {},
+            BM25Index({}),
+        )
+
+    def _scan(self) -> tuple:
+        files = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith((INPUT_SUFFIX, OUTPUT_SUFFIX)):
+                        stat = entry.stat()
+                        files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            logger.warning(f"Examples directory not found: {self.directory}")
+        return tuple(sorted(files))
+
+    def _refresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._signature is not None
+                and now - self._checked < self.reload_interval
+            ):
+                return
+            self._checked = now
+
+            signature = self._scan()
+            if signature == self._signature:
+                return
+
+            categories = sorted(
+                name[: -len(INPUT_SUFFIX)]
+                for name, _, _ in signature
+                if name.endswith(INPUT_SUFFIX)
+            )
+            examples = {
+                category: WorkflowExample.load(category, self.directory)
+                for category in categories
+            }
+            index = BM25Index(
+                {category: example.terms() for category, example in examples.items()}
+            )
+            self._loaded = (examples, index)
+            self._signature = signature
+            self.reloads += 1
+            logger.info(f"Loaded {len(examples)} example workflows")
+
+    def categories(self) -> list[str]:
+        self._refresh()
+        examples, _ = self._loaded
+        return list(examples)
+
+    def get(self, category: str) -> WorkflowExample | None:
+        self._refresh()
+        examples, _ = self._loaded
+        return examples.get(category)
+
+    def search(self, query: str, k: int = 3) -> list[tuple[WorkflowExample, float]]:
+        """The `k` examples most relevant to `query`, best first."""
+        self._refresh()
+        examples, index = self._loaded
+        return [
+            (examples[category], score) for category, score in index.search(query, k)
+        ]
+
+
+example_store = ExampleStore()
@@ -1,52 +1,76 @@
 import logging
-from pathlib import Path
+from functools import lru_cache
 
+from .orchestrator_cache import shared_cache
+from .orchestrator_schema_artifact import get_schema_artifact
+from .orchestrator_schema_index import SchemaIndex
 from .orchestrator_service import orchestrator_mcp
 
 logger = logging.getLogger(__name__)
 
-SERVERLESS_JSON_PATH = "serverless-workflow/consolidated_workflow_schema.json"
 
-# Cache for schema content
-_schema_cache = None
+@lru_cache(maxsize=1)
+def get_schema_index() -> SchemaIndex:
+    """Index over the consolidated schema, built on first use."""
+    artifact = get_schema_artifact()
+    index = SchemaIndex(artifact.schema, shared_cache("schema"), artifact.sha256)
+    logger.info(
+        f"Indexed {len(index.definitions)} schema definitions, "
+        f"{len(index.state_types)} state types"
+    )
+    return index
+
+
+def _normalize(values: list[str] | None) -> tuple[str, ...]:
+    return tuple(sorted(set(values or ())))
 
 
 @orchestrator_mcp.tool()
-def get_schema_rules(session_id: str) -> str:
+async def get_schema_rules(
+    session_id: str,
+    definitions: list[str] | None = None,
+    state_types: list[str] | None = None,
+    pointers: list[str] | None = None,
+) -> str:
     """
-    Retrieve the complete orchestrator workflow schema for orchestrator operations.
+    Retrieve the orchestrator workflow schema, whole or only the parts you need.
 
-    This tool returns the full consolidated workflow schema from the orchestrator-workflow
-    specification. Use this when you need to understand the complete schema structure,
-    validate workflow definitions, or reference specific schema components.
+    Without filters this tool returns the full consolidated workflow schema from the
+    orchestrator-workflow specification. With any of `definitions`, `state_types` or
+    `pointers` it returns only the matching nodes plus every definition they reference,
+    directly or transitively, which is much smaller. Prefer a filtered query when you
+    have a question about a specific state or component.
 
     Args:
         session_id (str): Session identifier for logging and tracking purposes
+        definitions (list[str], optional): Definition names, e.g. ["functions_function"]
+        state_types (list[str], optional): State types, e.g. ["operation", "switch"]
+        pointers (list[str], optional): JSON Pointers, e.g. ["/properties/functions"]
 
     Returns:
-        str: Complete JSON schema as a string, or error message if schema cannot be loaded
+        str: JSON schema (or schema slice with "definitions", "subtrees" for pointers
+             outside the definitions and "unresolved" dangling references) as a string,
+             or error message if the schema cannot be loaded or a filter is unknown
 
     Note:
-        Only request this when you need schema validation or have specific questions
-        about the workflow structure, as it returns the entire schema document.
+        Only request the full schema when you need schema validation or have broad
+        questions about the workflow structure, as it returns the entire schema document.
     """  # noqa: E501
-    global _schema_cache
-
     logger.info(f"get_filtered_schema_rules for session_id='{session_id}'")
 
-    # Return cached content if available
-    if _schema_cache is not None:
-        return _schema_cache
-
-    # Load and cache the schema
-    input_path = Path(SERVERLESS_JSON_PATH)
-    if not input_path.exists():
-        return "Error: cannot load the orchestrator-workflow schema"
+    if definitions or state_types or pointers:
+        try:
+            return await get_schema_index().query_json(
+                _normalize(definitions), _normalize(state_types), _normalize(pointers)
+            )
+        except KeyError as e:
+            return f"Error: {e.args[0]}"
+        except Exception as e:
+            logger.error(f"Error indexing schema file: {e}")
+            return "Error: cannot read the orchestrator-workflow schema"
 
     try:
-        with open(input_path, "r", encoding="utf-8") as f:
-            _schema_cache = f.read()
-        return _schema_cache
+        return get_schema_artifact().text
     except Exception as e:
         logger.error(f"Error reading schema file: {e}")
         return "Error: cannot read the orchestrator-workflow schema"
@@ -0,0 +1,183 @@
+import copy
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Operation -> member it requires besides "op" and "path"
+OPERATIONS = {
+    "add": "value",
+    "remove": None,
+    "replace": "value",
+    "move": "from",
+    "copy": "from",
+    "test": "value",
+}
+
+
+class JsonPatchError(ValueError):
+    """A patch is malformed or cannot be applied to the document."""
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Reference tokens of an RFC 6901 JSON Pointer, "" being the whole document."""
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise JsonPatchError(f"invalid JSON Pointer {pointer!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _index(container: list, token: str, pointer: str, append: bool = False) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise JsonPatchError(f"invalid array index {token!r} in {pointer!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise JsonPatchError(f"array index {index} out of range in {pointer!r}")
+    return index
+
+
+def _resolve(document: Any, tokens: list[str], pointer: str) -> Any:
+    node = document
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f"path {pointer!r} does not exist")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, pointer)]
+        else:
+            raise JsonPatchError(f"path {pointer!r} does not exist")
+    return node
+
+
+def _parent(document: Any, pointer: str) -> tuple[Any, str]:
+    tokens = parse_pointer(pointer)
+    if not tokens:
+        raise JsonPatchError("the whole document has no parent")
+    return _resolve(document, tokens[:-1], pointer), tokens[-1]
+
+
+def _add(document: Any, pointer: str, value: Any) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(document, pointer)
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, pointer, append=True), value)
+    else:
+        raise JsonPatchError(f"cannot add to {pointer!r}: parent is not a container")
+    return document
+
+
+def _remove(document: Any, pointer: str) -> tuple[Any, Any]:
+    parent, token = _parent(document, pointer)
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"path {pointer!r} does not exist")
+        return document, parent.pop(token)
+    if isinstance(parent, list):
+        return document, parent.pop(_index(parent, token, pointer))
+    raise JsonPatchError(f"path {pointer!r} does not exist")
+
+
+def _replace(document: Any, pointer: str, value: Any) -> Any:
+    if pointer == "":
+        return value
+    parent, token = _parent(document, pointer)
+    if isinstance(parent, dict) and token in parent:
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent[_index(parent, token, pointer)] = value
+    else:
+        raise JsonPatchError(f"path {pointer!r} does not exist")
+    return document
+
+
+def _operation(operation: Any, position: int) -> tuple[str, str]:
+    if not isinstance(operation, dict):
+        raise JsonPatchError(f"operation {position} is not an object")
+    op = operation.get("op")
+    if op not in OPERATIONS:
+        raise JsonPatchError(f"operation {position} has unknown op {op!r}")
+    if "path" not in operation:
+        raise JsonPatchError(f"operation {position} has no path")
+    member = OPERATIONS[op]
+    if member is not None and member not in operation:
+        raise JsonPatchError(f"operation {position} ({op}) has no {member}")
+    return op, operation["path"]
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """Equality as RFC 6902 `test` defines it: 1 == 1.0, but true != 1."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(map(_json_equal, a, b))
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return False
+    return a == b
+
+
+def apply_patch(document: Any, patch: list[dict]) -> tuple[Any, list[str]]:
+    """
+    Apply an RFC 6902 JSON Patch. The patch is atomic: `document` is never
+    modified and nothing is returned unless every operation succeeds.
+
+    Args:
+        document: The JSON document, e.g. a parsed workflow
+        patch: The operations, e.g. [{"op": "replace", "path": "/start",
+            "value": "init"}]
+
+    Returns:
+        (patched copy of the document, JSON Pointers of every location the
+        patch changed, `from` locations of moves included)
+
+    Raises:
+        JsonPatchError: When the patch is malformed, a path does not exist or
+            a `test` operation fails
+    """
+    if not isinstance(patch, list):
+        raise JsonPatchError("a JSON Patch must be an array of operations")
+
+    result = copy.deepcopy(document)
+    changed = []
+    for position, operation in enumerate(patch):
+        op, path = _operation(operation, position)
+        parse_pointer(path)
+
+        if op == "add":
+            result = _add(result, path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            result, _ = _remove(result, path)
+        elif op == "replace":
+            result = _replace(result, path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            source = operation["from"]
+            if path.startswith(source + "/"):
+                raise JsonPatchError(f"cannot move {source!r} into one of its children")
+            if source == "":
+                raise JsonPatchError("cannot move the whole document")
+            result, value = _remove(result, source)
+            result = _add(result, path, value)
+            changed.append(source)
+        elif op == "copy":
+            source = operation["from"]
+            value = _resolve(result, parse_pointer(source), source)
+            result = _add(result, path, copy.deepcopy(value))
+        elif op == "test":
+            actual = _resolve(result, parse_pointer(path), path)
+            if not _json_equal(actual, operation["value"]):
+                raise JsonPatchError(f"test failed at {path!r}")
+            continue
+
+        changed.append(path)
+
+    return result, changed
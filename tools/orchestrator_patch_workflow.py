@@ -0,0 +1,52 @@
+import logging
+
+from .orchestrator_json_patch import JsonPatchError
+from .orchestrator_service import orchestrator_mcp
+from .orchestrator_session_workspace import NoWorkflowError, workspaces
+from .orchestrator_workflow_validator import format_issues, has_errors
+
+logger = logging.getLogger(__name__)
+
+
+@orchestrator_mcp.tool()
+async def patch_workflow(session_id: str, patch: list[dict]) -> (bool, str):
+    """
+    Edit the session's workflow with an RFC 6902 JSON Patch instead of
+    resending it, and check the result against the structural rules. Only
+    the states the patch touches are checked again.
+
+    The session's workflow is the last one sent to compile_workflow or
+    preview_workflow; start from a new one with
+    [{"op": "add", "path": "", "value": {...workflow...}}]. The patch is
+    atomic: if any operation fails, the workflow is left unchanged.
+
+    Args:
+        session_id: The session identifier
+        patch: JSON Patch operations, e.g.
+            [{"op": "replace", "path": "/states/1/transition", "value": "Done"}]
+
+    Returns:
+        A tuple of (valid: bool, report: str) where the report gives the new
+        workflow version and the structural errors and warnings found, if
+        any; warnings alone leave the workflow valid
+    """
+    logger.info(f"orchestrator_patch_workflow for session_id='{session_id}'")
+
+    try:
+        workspace = await workspaces.patch(session_id, patch)
+    except (JsonPatchError, NoWorkflowError) as e:
+        logger.info(f"Rejected patch for session_id='{session_id}': {e}")
+        return False, f"Error: {e}"
+
+    try:
+        issues = workspace.validate()
+    except Exception as e:
+        logger.error(f"Error validating workflow for session_id='{session_id}': {e}")
+        return False, f"Error: {e}"
+    header = (
+        f"Workflow version {workspace.version}, "
+        f"{workspace.revalidated} state(s) checked again\n"
+    )
+    if issues:
+        return not has_errors(issues), header + format_issues(issues)
+    return True, header + "No structural errors found\n"
@@ -0,0 +1,45 @@
+import logging
+from typing import Literal
+
+from fastmcp.server.context import Context
+
+from .orchestrator_artifact_store import artifact_store
+from .orchestrator_service import orchestrator_mcp
+from .orchestrator_session_workspace import workspaces
+from .orchestrator_workflow_renderer import preview_url, preview_workflow_text
+
+logger = logging.getLogger(__name__)
+
+
+@orchestrator_mcp.tool()
+async def preview_session_workflow(
+    ctx: Context,
+    session_id: str,
+    patch: list[dict] | None = None,
+    mode: Literal["full", "fast"] = "full",
+) -> str:
+    """
+    Generate a PNG preview of the session's workflow, the last one sent to
+    compile_workflow or preview_workflow, optionally edited first with an
+    RFC 6902 JSON Patch.
+
+    Args:
+        session_id: Session identifier for tracking
+        patch: JSON Patch operations to apply first, e.g.
+            [{"op": "remove", "path": "/states/2"}]
+        mode: See preview_workflow
+
+    Returns:
+        str: URL of the PNG image
+    """
+    logger.info(f"orchestrator_preview_session_workflow for session_id='{session_id}'")
+
+    # Patch errors propagate like an invalid workflow does in preview_workflow
+    workspace = await workspaces.patch(session_id, patch)
+
+    png_path = workspace.preview_paths.get(mode)
+    if png_path is not None and artifact_store.touch(png_path):
+        logger.info(f"Workspace preview reused for session {session_id}")
+        return preview_url(ctx, png_path)
+
+    return await preview_workflow_text(ctx, session_id, workspace.text, mode, workspace)
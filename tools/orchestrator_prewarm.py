@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Subsystems warmed up in the background when the server starts, comma
+# separated (schema, examples, browser, compiler), or "none"; the server only
+# reports ready once all of them are warm
+PREWARM = os.environ.get("ORCHESTRATOR_PREWARM", "schema,examples,browser")
+
+COLD = "cold"
+WARMING = "warming"
+WARM = "warm"
+FAILED = "failed"
+
+
+class Subsystem:
+    """
+    Something the first request would otherwise pay to load, e.g. the
+    browser. `is_warm` tells whether it is loaded, however that happened:
+    warmed up here or by a request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        warm_up: Callable[[], Awaitable],
+        is_warm: Callable[[], bool],
+    ):
+        self.name = name
+        self.warm_up = warm_up
+        self.is_warm = is_warm
+        self.state = COLD
+        self.error: str | None = None
+        self.seconds: float | None = None
+
+    async def run(self):
+        self.state = WARMING
+        started = time.monotonic()
+        try:
+            await self.warm_up()
+            self.state = WARM
+            logger.info(f"Warmed up {self.name} in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            self.state = FAILED
+            self.error = str(e)
+            logger.error(f"Cannot warm up {self.name}: {e}")
+        finally:
+            self.seconds = time.monotonic() - started
+
+    def status(self) -> dict:
+        status = {"state": WARM if self.is_warm() else self.state}
+        if self.seconds is not None:
+            status["seconds"] = round(self.seconds, 3)
+        if self.error and status["state"] != WARM:
+            status["error"] = self.error
+        return status
+
+
+class Prewarmer:
+    """
+    Warms the `required` subsystems up concurrently in background tasks, so
+    the server accepts connections right away, and tells when they are all
+    warm, i.e. when the server is ready for traffic.
+    """
+
+    def __init__(self, subsystems: list[Subsystem], required: str = PREWARM):
+        self.subsystems = {subsystem.name: subsystem for subsystem in subsystems}
+        names = [name.strip() for name in required.split(",") if name.strip()]
+        if names == ["none"]:
+            names = []
+        for name in names:
+            if name not in self.subsystems:
+                logger.warning(
+                    f"Unknown subsystem {name!r} in ORCHESTRATOR_PREWARM, "
+                    f"expected some of {', '.join(self.subsystems)}"
+                )
+        self.required = [name for name in names if name in self.subsystems]
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self.subsystems[name].run()) for name in self.required
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def status(self) -> tuple[bool, dict]:
+        """
+        Returns:
+            (whether every required subsystem is warm, state of every
+            subsystem with `required` set on the ones waited for)
+        """
+        subsystems = {}
+        for name, subsystem in self.subsystems.items():
+            subsystems[name] = subsystem.status()
+            subsystems[name]["required"] = name in self.required
+        ready = all(subsystems[name]["state"] == WARM for name in self.required)
+        return ready, subsystems
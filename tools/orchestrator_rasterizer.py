@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from .orchestrator_metrics import metrics
+from .orchestrator_tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# "thread" or "process"; cairo releases the GIL for most of the work, a process
+# pool isolates very large diagrams completely
+RASTER_EXECUTOR = os.environ.get("ORCHESTRATOR_RASTER_EXECUTOR", "thread")
+RASTER_WORKERS = int(os.environ.get("ORCHESTRATOR_RASTER_WORKERS", "2"))
+# Jobs allowed to wait for a worker before new ones are rejected
+RASTER_QUEUE_LIMIT = int(os.environ.get("ORCHESTRATOR_RASTER_QUEUE_LIMIT", "16"))
+
+
+raster_seconds = metrics.histogram(
+    "orchestrator_raster_seconds",
+    "Time spent by cairosvg converting a preview SVG to PNG, file write included",
+)
+
+
+class RasterizerBusyError(RuntimeError):
+    """Every worker is busy and the wait queue is full."""
+
+
+def svg_to_png_file(svg: str, png_path: str) -> float:
+    """
+    Rasterize SVG content and write it to `png_path` atomically.
+
+    Returns:
+        float: Seconds it took, measured in the worker
+    """
+    # Imported on first use: cairosvg loads the native cairo library
+    import cairosvg
+
+    started = time.perf_counter()
+    png_bytes = cairosvg.svg2png(bytestring=svg.encode("utf-8"))
+
+    tmp_path = f"{png_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png_bytes)
+    os.replace(tmp_path, png_path)
+    return time.perf_counter() - started
+
+
+class Rasterizer:
+    """
+    Runs SVG to PNG conversion and the file write in a worker pool, so a large
+    diagram never blocks the event loop serving every other session.
+    """
+
+    def __init__(
+        self,
+        workers: int = RASTER_WORKERS,
+        executor: str = RASTER_EXECUTOR,
+        queue_limit: int = RASTER_QUEUE_LIMIT,
+    ):
+        self.workers = workers
+        self.executor = executor
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self.rejected = 0
+        self._pool: Executor | None = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="rasterizer"
+                )
+        return self._pool
+
+    async def rasterize(self, svg: str, png_path: str | Path):
+        """
+        Write the PNG rendering of `svg` to `png_path`.
+
+        Raises:
+            RasterizerBusyError: When `workers + queue_limit` jobs are pending
+        """
+        if self.pending >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise RasterizerBusyError(
+                "Too many previews are being rendered, retry later"
+            )
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            elapsed = await loop.run_in_executor(
+                self._get_pool(), svg_to_png_file, svg, str(png_path)
+            )
+            raster_seconds.observe(elapsed)
+            tracer.span_attribute("raster.worker_seconds", elapsed)
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = (
+    Path(__file__).parent.parent
+    / "serverless-workflow"
+    / "consolidated_workflow_schema.json"
+)
+SCHEMA_MANIFEST_PATH = SCHEMA_PATH.with_suffix(".manifest.json")
+
+SCHEMA_FORMATS = ("raw", "min")
+
+
+class SchemaVariant:
+    """One representation of the schema, ready to be sent as is."""
+
+    def __init__(self, body: bytes, encoding: str | None = None):
+        self.body = body
+        self.encoding = encoding
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+class SchemaArtifact:
+    """
+    The consolidated workflow schema, loaded once with every representation
+    served by the MCP server precomputed: the file as generated ("raw"),
+    without whitespace ("min"), and both gzip-compressed.
+    """
+
+    def __init__(self, raw: bytes, manifest: dict | None = None):
+        self.schema = json.loads(raw)
+        self.sha256 = hashlib.sha256(raw).hexdigest()
+
+        if manifest is None:
+            logger.warning("No schema manifest, run consolidate_schemas.py")
+        elif manifest.get("sha256") != self.sha256:
+            logger.warning(
+                "Schema manifest does not match the schema, "
+                "run consolidate_schemas.py again"
+            )
+            manifest = None
+        self.version = (
+            manifest["version"] if manifest else f"unknown+{self.sha256[:12]}"
+        )
+
+        minified = json.dumps(self.schema, separators=(",", ":")).encode("utf-8")
+        self.text = minified.decode("utf-8")
+        self.variants: dict[tuple[str, bool], SchemaVariant] = {}
+        for name, body in (("raw", raw), ("min", minified)):
+            self.variants[(name, False)] = SchemaVariant(body)
+            self.variants[(name, True)] = SchemaVariant(
+                gzip.compress(body, compresslevel=9, mtime=0), "gzip"
+            )
+
+    @classmethod
+    def load(
+        cls, path: Path = SCHEMA_PATH, manifest_path: Path = SCHEMA_MANIFEST_PATH
+    ) -> "SchemaArtifact":
+        raw = path.read_bytes()
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            manifest = None
+        return cls(raw, manifest)
+
+    def variant(self, name: str = "min", gzipped: bool = False) -> SchemaVariant:
+        return self.variants[(name, gzipped)]
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "sha256": self.sha256,
+            "bytes": {
+                f"{name}{'.gz' if gzipped else ''}": len(variant.body)
+                for (name, gzipped), variant in self.variants.items()
+            },
+        }
+
+
+@lru_cache(maxsize=1)
+def get_schema_artifact() -> SchemaArtifact:
+    """The schema artifact, loaded on first use (the server preloads it)."""
+    artifact = SchemaArtifact.load()
+    logger.info(f"Loaded workflow schema {artifact.version} from {SCHEMA_PATH}")
+    return artifact
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+from collections import deque
+from typing import Any, Iterator
+
+from .orchestrator_cache import LRUCache, SQLiteCache, TieredCache
+
+logger = logging.getLogger(__name__)
+
+DEFINITIONS_REF = "#/definitions/"
+
+SCHEMA_QUERY_CACHE_SIZE = 256
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _refs(node: Any) -> Iterator[str]:
+    """Every `$ref` value found under `node`."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def _definition_of(pointer: str) -> str | None:
+    """Name of the definition a local reference points into, if any."""
+    if not pointer.startswith(DEFINITIONS_REF):
+        return None
+    return _unescape(pointer[len(DEFINITIONS_REF) :].split("/", 1)[0])
+
+
+class SchemaIndex:
+    """
+    Lookup structures over the consolidated workflow schema, built once so
+    that slices of it can be served without walking the whole document:
+    the direct `$ref`s of every definition and the definitions describing
+    each state type. Serialized slices are cached, and shared with the other
+    worker processes through `shared` if given.
+    """
+
+    def __init__(
+        self, schema: dict, shared: SQLiteCache | None = None, version: str = ""
+    ):
+        self.schema = schema
+        self.version = version
+        self.definitions: dict[str, Any] = schema.get("definitions", {})
+        self.refs = {
+            name: sorted(set(_refs(definition)))
+            for name, definition in self.definitions.items()
+        }
+        self.state_types = self._index_state_types()
+        self._slices = TieredCache(LRUCache(SCHEMA_QUERY_CACHE_SIZE), shared)
+
+    def _index_state_types(self) -> dict[str, list[str]]:
+        # Only the definitions the root `states` array actually uses
+        states = self.schema.get("properties", {}).get("states")
+        if states is not None:
+            names, _ = self.closure(_refs(states))
+        else:
+            names = set(self.definitions)
+
+        state_types: dict[str, list[str]] = {}
+        for name in sorted(names):
+            properties = self.definitions[name].get("properties", {})
+            state_type = properties.get("type", {}).get("const")
+            if isinstance(state_type, str):
+                state_types.setdefault(state_type, []).append(name)
+        return state_types
+
+    def resolve(self, pointer: str) -> Any:
+        """
+        Resolve a JSON Pointer against the schema. Accepts "/a/b", "#/a/b"
+        and the empty pointer for the whole document.
+
+        Raises:
+            KeyError: When the pointer does not exist in the schema
+        """
+        path = pointer[1:] if pointer.startswith("#") else pointer
+        if path and not path.startswith("/"):
+            raise KeyError(pointer)
+
+        node = self.schema
+        for token in path.split("/")[1:]:
+            token = _unescape(token)
+            try:
+                if isinstance(node, list):
+                    node = node[int(token)]
+                else:
+                    node = node[token]
+            except (KeyError, IndexError, ValueError, TypeError):
+                raise KeyError(pointer) from None
+        return node
+
+    def closure(self, refs) -> tuple[set[str], set[str]]:
+        """
+        Definitions reachable from `refs`, following `$ref`s transitively.
+
+        Returns:
+            (names of the definitions, references that point nowhere)
+        """
+        names: set[str] = set()
+        unresolved: set[str] = set()
+        queue = deque(refs)
+        while queue:
+            ref = queue.popleft()
+            name = _definition_of(ref)
+            if name is None:
+                continue
+            if name not in self.definitions:
+                unresolved.add(ref)
+                continue
+            if name not in names:
+                names.add(name)
+                queue.extend(self.refs[name])
+        return names, unresolved
+
+    def query(
+        self,
+        definitions=(),
+        state_types=(),
+        pointers=(),
+    ) -> dict:
+        """
+        Slice of the schema holding the requested nodes and every definition
+        they depend on, so all of its `$ref`s still resolve.
+
+        Args:
+            definitions: Definition names, e.g. "workflow_operationstate"
+            state_types: State types, e.g. "operation" or "switch"
+            pointers: JSON Pointers into the schema, e.g. "/properties/functions"
+
+        Raises:
+            KeyError: When a name, state type or pointer is unknown
+        """
+        roots: list[str] = []
+        subtrees: dict[str, Any] = {}
+
+        for name in definitions:
+            if name not in self.definitions:
+                raise KeyError(f"unknown definition '{name}'")
+            roots.append(f"{DEFINITIONS_REF}{name}")
+
+        for state_type in state_types:
+            if state_type not in self.state_types:
+                raise KeyError(
+                    f"unknown state type '{state_type}', expected one of "
+                    f"{', '.join(sorted(self.state_types))}"
+                )
+            roots.extend(f"{DEFINITIONS_REF}{n}" for n in self.state_types[state_type])
+
+        for pointer in pointers:
+            try:
+                node = self.resolve(pointer)
+            except KeyError:
+                raise KeyError(f"unknown pointer '{pointer}'") from None
+            name = _definition_of(pointer if pointer.startswith("#") else f"#{pointer}")
+            if name is not None and pointer.rstrip("/").count("/") == 2:
+                roots.append(f"{DEFINITIONS_REF}{name}")
+            else:
+                subtrees[pointer] = node
+                roots.extend(_refs(node))
+
+        names, unresolved = self.closure(roots)
+        result = {"$schema": self.schema.get("$schema")}
+        if subtrees:
+            result["subtrees"] = subtrees
+        result["definitions"] = {name: self.definitions[name] for name in sorted(names)}
+        if unresolved:
+            result["unresolved"] = sorted(unresolved)
+        return result
+
+    async def query_json(
+        self,
+        definitions: tuple[str, ...],
+        state_types: tuple[str, ...],
+        pointers: tuple[str, ...],
+    ) -> str:
+        """The slice returned by `query` as compact JSON, cached."""
+        key = hashlib.sha256(
+            json.dumps([self.version, definitions, state_types, pointers]).encode()
+        ).hexdigest()
+        text = await self._slices.aget(key)
+        if text is None:
+            text = json.dumps(
+                self.query(definitions, state_types, pointers), separators=(",", ":")
+            )
+            await self._slices.aset(key, text)
+        return text
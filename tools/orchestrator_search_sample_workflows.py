@@ -0,0 +1,42 @@
+import logging
+
+from .orchestrator_example_store import example_store
+from .orchestrator_service import orchestrator_mcp
+
+logger = logging.getLogger(__name__)
+
+MAX_RESULTS = 10
+
+
+@orchestrator_mcp.tool()
+def search_sample_workflows(session_id: str, query: str, k: int = 3) -> str:
+    """
+    Find the sample workflows most relevant to a request.
+
+    Searches the inputs and workflows of every example in the library and returns
+    the best matches with their example input and workflow output. Prefer this over
+    get_sample_workflow when you don't know which category fits.
+
+    Args:
+        session_id (str): Session identifier for logging and tracking purposes
+        query (str): Free-text description of the workflow to build, e.g.
+            "call a REST API every day and retry on errors"
+        k (int): Number of examples to return (1-10)
+
+    Returns:
+        str: the matching examples, best first, or a message when none matches
+    """
+    logger.info(f"orchestrator_search_sample_workflows for session_id='{session_id}'")
+
+    results = example_store.search(query, max(1, min(k, MAX_RESULTS)))
+    if not results:
+        return (
+            "No sample workflow matches this request, available categories: "
+            f"{', '.join(example_store.categories())}"
+        )
+
+    return "\n".join(
+        f"<!-- category: {example.category}, score: {score:.2f} -->\n"
+        f"{example.llm_output()}"
+        for example, score in results
+    )
@@ -0,0 +1,315 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .orchestrator_cache import SQLiteCache, run_blocking, shared_cache
+from .orchestrator_json_patch import apply_patch, parse_pointer
+from .orchestrator_workflow_validator import ValidationIssue, WorkflowGraph
+
+logger = logging.getLogger(__name__)
+
+# Seconds a session workspace is kept without being used
+SESSION_IDLE_TTL = float(os.environ.get("ORCHESTRATOR_SESSION_IDLE_TTL", "1800"))
+
+# Workspaces kept at most, least recently used ones are dropped first
+SESSION_MAX = int(os.environ.get("ORCHESTRATOR_SESSION_MAX", "256"))
+
+
+class NoWorkflowError(LookupError):
+    """The session has no workflow to patch, compile or preview yet."""
+
+
+class SessionWorkspace:
+    """
+    The workflow a session is iterating on, with its structural validation
+    and the compile and preview results of its current version.
+
+    Validation is incremental: once a workflow has been checked, a patch only
+    gets the states it touched checked again, as long as it does not rename,
+    add, remove or reorder states or change the function, error and event
+    names they may refer to. Workflow-wide rules (start state, reachability,
+    duplicate names) are always checked again since they are cheap.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.workflow: dict | None = None
+        self.version = 0
+        self.last_used = time.monotonic()
+        # Compile results and preview PNG paths of the current version, by mode
+        self.compile_results: dict[str, tuple[bool, str]] = {}
+        self.preview_paths: dict[str, str] = {}
+        self.revalidated = 0
+        # Held while the workflow is synced with the shared copy and changed
+        self.lock = asyncio.Lock()
+
+        self._issues: list[ValidationIssue] | None = None
+        self._state_issues: dict[int, list[ValidationIssue]] = {}
+        self._signature = None
+        # Pointers changed since the last validation, None when unknown
+        self._changed: list[str] | None = None
+
+    @property
+    def text(self) -> str:
+        if self.workflow is None:
+            raise NoWorkflowError(f"No workflow in session {self.session_id!r}")
+        return json.dumps(self.workflow, ensure_ascii=False)
+
+    def set_workflow(self, workflow: dict):
+        """Replace the workflow, e.g. with one sent in full to compile_workflow."""
+        if workflow == self.workflow:
+            return
+        self._update(workflow, None)
+
+    def apply_patch(self, patch: list[dict]) -> list[str]:
+        """
+        Apply an RFC 6902 JSON Patch to the workflow. A patch replacing the
+        whole document ("path": "") also starts a session.
+
+        Returns:
+            list[str]: JSON Pointers of the locations the patch changed
+
+        Raises:
+            JsonPatchError: When the patch cannot be applied; nothing changes
+            NoWorkflowError: When there is no workflow to patch yet
+        """
+        if self.workflow is None and not (
+            patch
+            and isinstance(patch[0], dict)
+            and patch[0].get("path") == ""
+            and patch[0].get("op") in ("add", "replace")
+        ):
+            raise NoWorkflowError(f"No workflow in session {self.session_id!r}")
+
+        workflow, changed = apply_patch(self.workflow, patch)
+        if not isinstance(workflow, dict):
+            raise NoWorkflowError("The patched workflow is not a JSON object")
+        if changed:
+            self._update(
+                workflow, None if self._changed is None else self._changed + changed
+            )
+        return changed
+
+    def load(self, workflow: dict, version: int):
+        """Take over the version saved by another worker process."""
+        self._update(workflow, None)
+        self.version = version
+
+    def record_compile(self, version: int, mode: str, result: tuple[bool, str]):
+        """Keep a compile result, unless the workflow changed while compiling."""
+        if version == self.version:
+            self.compile_results[mode] = result
+
+    def record_preview(self, version: int, mode: str, png_path: str):
+        """Keep a preview, unless the workflow changed while rendering."""
+        if version == self.version:
+            self.preview_paths[mode] = png_path
+
+    def _update(self, workflow: dict, changed: list[str] | None):
+        self.workflow = workflow
+        self.version += 1
+        self.compile_results.clear()
+        self.preview_paths.clear()
+        self._issues = None
+        self._changed = changed
+
+    def _changed_states(self) -> set[int] | None:
+        """Indexes of the states changed since the last validation, None for all."""
+        if self._changed is None:
+            return None
+        indexes = set()
+        for pointer in self._changed:
+            tokens = parse_pointer(pointer)
+            if not tokens:
+                return None
+            if tokens[0] != "states":
+                continue
+            if len(tokens) == 1 or not tokens[1].isdigit():
+                return None
+            indexes.add(int(tokens[1]))
+        return indexes
+
+    def validate(self) -> list[ValidationIssue]:
+        """Structural issues of the current workflow, see validate_workflow."""
+        if self.workflow is None:
+            raise NoWorkflowError(f"No workflow in session {self.session_id!r}")
+        if self._issues is not None:
+            self.revalidated = 0
+            return self._issues
+
+        graph = WorkflowGraph(self.workflow)
+        signature = (
+            tuple((name, index) for name, (index, _) in graph.states.items()),
+            tuple(graph.duplicates),
+            graph.functions,
+            graph.errors,
+            graph.events,
+        )
+        changed = self._changed_states() if signature == self._signature else None
+
+        state_issues = {}
+        for index, state in graph.states.values():
+            if changed is None or index in changed or index not in self._state_issues:
+                state_issues[index] = graph.check_state(index, state)
+        self.revalidated = len(state_issues)
+        for index, state in graph.states.values():
+            if index not in state_issues:
+                state_issues[index] = self._state_issues[index]
+
+        self._issues = graph.check_workflow() + [
+            issue for index in sorted(state_issues) for issue in state_issues[index]
+        ]
+        self._state_issues = state_issues
+        self._signature = signature
+        self._changed = []
+        return self._issues
+
+
+class WorkspaceStore:
+    """
+    Session workspaces by session id. Workspaces idle for `idle_ttl` seconds
+    are dropped, and the least recently used ones once there are more than
+    `max_sessions`.
+
+    With a `shared` cache, every new version of a workflow is saved to it, so
+    that a session keeps its workflow whichever worker process serves it.
+    Compile results and previews are found through the shared compile and
+    render caches instead.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_sessions: int = SESSION_MAX,
+        shared: SQLiteCache | None = None,
+    ):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.shared = shared
+        self.evicted = 0
+        self._workspaces: OrderedDict[str, SessionWorkspace] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float):
+        # Least recently used first, so expired workspaces are at the front
+        while self._workspaces:
+            workspace = next(iter(self._workspaces.values()))
+            if (
+                now - workspace.last_used < self.idle_ttl
+                and len(self._workspaces) <= self.max_sessions
+            ):
+                break
+            self._workspaces.popitem(last=False)
+            self.evicted += 1
+            logger.info(f"Dropped the workspace of session_id='{workspace.session_id}'")
+
+    def _workspace(self, session_id: str) -> SessionWorkspace:
+        now = time.monotonic()
+        with self._lock:
+            workspace = self._workspaces.pop(session_id, None)
+            if workspace is None:
+                workspace = SessionWorkspace(session_id)
+            workspace.last_used = now
+            self._workspaces[session_id] = workspace
+            self._evict(now)
+        return workspace
+
+    async def _load_saved(self, workspace: SessionWorkspace):
+        """Take over the version saved by another worker process, if any."""
+        if self.shared is None:
+            return
+        saved = await run_blocking(self.shared.get, workspace.session_id)
+        if saved is not None and saved["version"] != workspace.version:
+            workspace.load(saved["workflow"], saved["version"])
+
+    async def get(self, session_id: str) -> SessionWorkspace:
+        """The workspace of a session, created empty if needed."""
+        workspace = self._workspace(session_id)
+        async with workspace.lock:
+            await self._load_saved(workspace)
+        return workspace
+
+    async def _change(self, session_id: str, change) -> SessionWorkspace:
+        """
+        Apply `change` to the workspace of a session and save the new version.
+        The shared copy is compared and set: when another worker process
+        saved a version meanwhile, that one is taken over and `change` is
+        applied to it again, so concurrent edits are never lost.
+        """
+        workspace = self._workspace(session_id)
+        async with workspace.lock:
+            await self._load_saved(workspace)
+            while True:
+                version = workspace.version
+                change(workspace)
+                if self.shared is None or workspace.version == version:
+                    return workspace
+
+                def unchanged(saved, version=version):
+                    return saved is None or saved["version"] == version
+
+                stored, saved = await run_blocking(
+                    self.shared.compare_and_set,
+                    session_id,
+                    unchanged,
+                    {"workflow": workspace.workflow, "version": workspace.version},
+                )
+                if stored or saved is None:
+                    return workspace
+                logger.info(
+                    f"Workflow of session_id='{session_id}' changed in another "
+                    f"worker, applying the change to version {saved['version']}"
+                )
+                workspace.load(saved["workflow"], saved["version"])
+
+    async def record(self, session_id: str, workflow: str) -> SessionWorkspace | None:
+        """
+        Make a workflow sent in full the session's current one. Returns None,
+        and keeps the previous one, when it is not a JSON object.
+        """
+        try:
+            parsed = json.loads(workflow)
+        except ValueError:
+            return None
+        if not isinstance(parsed, dict):
+            return None
+        return await self._change(
+            session_id, lambda workspace: workspace.set_workflow(parsed)
+        )
+
+    async def patch(
+        self, session_id: str, patch: list[dict] | None
+    ) -> SessionWorkspace:
+        """
+        The workspace of a session, its workflow updated by a JSON Patch if
+        one is given.
+
+        Raises:
+            JsonPatchError: When the patch cannot be applied
+            NoWorkflowError: When the session has no workflow yet
+        """
+        if patch:
+            return await self._change(
+                session_id, lambda workspace: workspace.apply_patch(patch)
+            )
+        workspace = await self.get(session_id)
+        if workspace.workflow is None:
+            raise NoWorkflowError(f"No workflow in session {session_id!r}")
+        return workspace
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._evict(time.monotonic())
+            return {
+                "sessions": len(self._workspaces),
+                "evicted": self.evicted,
+                "max_sessions": self.max_sessions,
+                "idle_ttl": self.idle_ttl,
+            }
+
+
+workspaces = WorkspaceStore(shared=shared_cache("session", ttl=SESSION_IDLE_TTL))
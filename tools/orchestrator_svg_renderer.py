@@ -0,0 +1,416 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from xml.sax.saxutils import escape
+
+logger = logging.getLogger(__name__)
+
+START = "__start__"
+END = "__end__"
+
+CHAR_WIDTH = 7
+LINE_HEIGHT = 16
+NODE_PADDING = 10
+NODE_MIN_WIDTH = 150
+NODE_MAX_CHARS = 36
+NODE_MAX_DETAILS = 4
+TERMINAL_RADIUS = 14
+LAYER_GAP = 70
+NODE_GAP = 40
+MARGIN = 30
+BACK_EDGE_OFFSET = 60
+
+STATE_COLORS = {
+    "operation": "#e3f2fd",
+    "switch": "#fff3e0",
+    "event": "#f3e5f5",
+    "sleep": "#eceff1",
+    "parallel": "#e8f5e9",
+    "foreach": "#e0f7fa",
+    "inject": "#f1f8e9",
+    "callback": "#fce4ec",
+}
+
+EDGE_STYLES = {
+    "transition": ("#455a64", ""),
+    "condition": ("#ef6c00", ""),
+    "error": ("#c62828", ' stroke-dasharray="6 4"'),
+    "compensation": ("#6a1b9a", ' stroke-dasharray="2 3"'),
+}
+
+
+@dataclass
+class _Node:
+    name: str
+    type: str = ""
+    details: list[str] = field(default_factory=list)
+    layer: int = 0
+    order: float = 0.0
+    x: float = 0.0
+    y: float = 0.0
+
+    @property
+    def terminal(self) -> bool:
+        return self.name in (START, END)
+
+    @property
+    def label(self) -> str:
+        return _truncate(self.name)
+
+    @property
+    def width(self) -> float:
+        if self.terminal:
+            return TERMINAL_RADIUS * 2
+        chars = max(len(line) for line in [self.label, *self.details])
+        return max(NODE_MIN_WIDTH, chars * CHAR_WIDTH + 2 * NODE_PADDING)
+
+    @property
+    def height(self) -> float:
+        if self.terminal:
+            return TERMINAL_RADIUS * 2
+        return (2 + len(self.details)) * LINE_HEIGHT + NODE_PADDING
+
+
+@dataclass
+class _Edge:
+    source: str
+    target: str
+    kind: str
+    label: str = ""
+
+
+def _truncate(text, limit: int = NODE_MAX_CHARS) -> str:
+    text = str(text)
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _ref(value, key: str):
+    return value.get(key) if isinstance(value, dict) else value
+
+
+def _action_label(action: dict) -> str:
+    if "functionRef" in action:
+        return f"call {_ref(action['functionRef'], 'refName')}"
+    if "subFlowRef" in action:
+        return f"subflow {_ref(action['subFlowRef'], 'workflowId')}"
+    if "eventRef" in action:
+        return f"event {_ref(action['eventRef'], 'triggerEventRef')}"
+    return action.get("name", "action")
+
+
+def _state_details(state: dict) -> list[str]:
+    state_type = state.get("type")
+    details = []
+
+    if state_type == "foreach":
+        details.append(f"for each {state.get('inputCollection', '')}")
+    elif state_type == "parallel":
+        for branch in state.get("branches") or []:
+            actions = len(branch.get("actions") or [])
+            details.append(f"║ {branch.get('name', 'branch')} ({actions} actions)")
+    elif state_type == "event":
+        for on_event in state.get("onEvents") or []:
+            details.append(f"on {', '.join(on_event.get('eventRefs') or [])}")
+    elif state_type == "sleep":
+        details.append(f"sleep {state.get('duration', '')}")
+    elif state_type == "callback":
+        details.append(f"wait {state.get('eventRef', '')}")
+
+    if state_type != "parallel":
+        actions = list(state.get("actions") or [])
+        for on_event in state.get("onEvents") or []:
+            actions.extend(on_event.get("actions") or [])
+        if isinstance(state.get("action"), dict):
+            actions.append(state["action"])
+        details.extend(_action_label(action) for action in actions)
+
+    if len(details) > NODE_MAX_DETAILS:
+        hidden = len(details) - NODE_MAX_DETAILS + 1
+        details = details[: NODE_MAX_DETAILS - 1] + [f"+{hidden} more"]
+    return [_truncate(detail) for detail in details]
+
+
+class WorkflowLayout:
+    """
+    Layered (Sugiyama style) layout of a 0.8 serverless workflow: states are
+    nodes, transitions/conditions/onErrors are edges. Cycles are broken by
+    ignoring DFS back edges, nodes are layered by longest path from start,
+    ordered within their layer by barycenter and then centered.
+    """
+
+    def __init__(self, workflow: dict):
+        self.nodes: dict[str, _Node] = {START: _Node(START), END: _Node(END)}
+        self.edges: list[_Edge] = []
+        self.back_edges: set[int] = set()
+
+        states = [s for s in workflow.get("states") or [] if isinstance(s, dict)]
+        for state in states:
+            if state.get("name") not in self.nodes:
+                self.nodes[state.get("name")] = _Node(
+                    state.get("name"), state.get("type", ""), _state_details(state)
+                )
+
+        for state in states:
+            self._add_state_edges(state)
+
+        start = _ref(workflow.get("start"), "stateName")
+        if start is None and states:
+            start = states[0].get("name")
+        if start in self.nodes:
+            self.edges.append(_Edge(START, start, "transition"))
+
+        self._assign_layers()
+        self._order_layers()
+        self._place()
+
+    def _edge(self, source, target, kind, label=""):
+        if target in self.nodes:
+            self.edges.append(_Edge(source, target, kind, _truncate(label, 24)))
+
+    def _add_state_edges(self, state: dict):
+        name = state.get("name")
+        if state.get("end"):
+            self._edge(name, END, "transition")
+        if "transition" in state:
+            self._edge(name, _ref(state["transition"], "nextState"), "transition")
+
+        for key, label_key in (
+            ("dataConditions", "condition"),
+            ("eventConditions", "eventRef"),
+        ):
+            for condition in state.get(key) or []:
+                label = condition.get("name") or condition.get(label_key, "")
+                if condition.get("end"):
+                    self._edge(name, END, "condition", label)
+                elif "transition" in condition:
+                    target = _ref(condition["transition"], "nextState")
+                    self._edge(name, target, "condition", label)
+
+        default = state.get("defaultCondition")
+        if isinstance(default, dict):
+            if default.get("end"):
+                self._edge(name, END, "condition", "default")
+            elif "transition" in default:
+                target = _ref(default["transition"], "nextState")
+                self._edge(name, target, "condition", "default")
+
+        for handler in state.get("onErrors") or []:
+            label = handler.get("errorRef") or ", ".join(handler.get("errorRefs", []))
+            if handler.get("end"):
+                self._edge(name, END, "error", label)
+            elif "transition" in handler:
+                target = _ref(handler["transition"], "nextState")
+                self._edge(name, target, "error", label)
+
+        if "compensatedBy" in state:
+            self._edge(name, state["compensatedBy"], "compensation", "compensate")
+
+    def _assign_layers(self):
+        outgoing: dict[str, list[int]] = {name: [] for name in self.nodes}
+        for index, edge in enumerate(self.edges):
+            outgoing[edge.source].append(index)
+
+        # Iterative DFS from start, then from anything left unreachable, to
+        # find the edges closing a cycle
+        discovery: list[str] = []
+        state = {}
+        for root in [START, *self.nodes]:
+            if root in state or root == END:
+                continue
+            state[root] = "open"
+            discovery.append(root)
+            stack = [(root, iter(outgoing[root]))]
+            while stack:
+                node, pending = stack[-1]
+                for index in pending:
+                    target = self.edges[index].target
+                    if state.get(target) == "open":
+                        self.back_edges.add(index)
+                    elif target not in state:
+                        state[target] = "open"
+                        discovery.append(target)
+                        stack.append((target, iter(outgoing[target])))
+                        break
+                else:
+                    state[node] = "done"
+                    stack.pop()
+
+        # Longest path layering over the remaining DAG (Kahn's algorithm)
+        incoming = {name: 0 for name in self.nodes}
+        for index, edge in enumerate(self.edges):
+            if index not in self.back_edges:
+                incoming[edge.target] += 1
+
+        ready = [name for name in discovery if incoming[name] == 0]
+        while ready:
+            name = ready.pop()
+            for index in outgoing[name]:
+                if index in self.back_edges:
+                    continue
+                target = self.nodes[self.edges[index].target]
+                target.layer = max(target.layer, self.nodes[name].layer + 1)
+                incoming[target.name] -= 1
+                if incoming[target.name] == 0:
+                    ready.append(target.name)
+
+        # The end marker always sits below every state
+        self.nodes[END].layer = 1 + max(
+            node.layer for node in self.nodes.values() if node.name != END
+        )
+
+        for order, name in enumerate(discovery + [END]):
+            self.nodes[name].order = order
+
+    def _layers(self) -> list[list[_Node]]:
+        layers: list[list[_Node]] = [[] for _ in range(self.nodes[END].layer + 1)]
+        for node in self.nodes.values():
+            layers[node.layer].append(node)
+        return [sorted(layer, key=lambda n: n.order) for layer in layers]
+
+    def _order_layers(self, sweeps: int = 2):
+        neighbours: dict[str, list[str]] = {name: [] for name in self.nodes}
+        for index, edge in enumerate(self.edges):
+            if index not in self.back_edges:
+                neighbours[edge.target].append(edge.source)
+                neighbours[edge.source].append(edge.target)
+
+        layers = self._layers()
+        for _ in range(sweeps):
+            for layer in layers[1:] + layers[-2::-1]:
+                for node in layer:
+                    orders = [self.nodes[n].order for n in neighbours[node.name]]
+                    if orders:
+                        node.order = sum(orders) / len(orders)
+                layer.sort(key=lambda n: n.order)
+                for position, node in enumerate(layer):
+                    node.order = position
+
+    def _place(self):
+        layers = self._layers()
+        widths = [
+            sum(node.width for node in layer) + NODE_GAP * (len(layer) - 1)
+            for layer in layers
+        ]
+        self.width = max(widths) + 2 * MARGIN + BACK_EDGE_OFFSET
+
+        y = MARGIN
+        for layer, layer_width in zip(layers, widths):
+            x = MARGIN + (max(widths) - layer_width) / 2
+            for node in layer:
+                node.x, node.y = x, y
+                x += node.width + NODE_GAP
+            y += max(node.height for node in layer) + LAYER_GAP
+        self.height = y - LAYER_GAP + MARGIN
+
+    def _svg_node(self, node: _Node) -> list[str]:
+        if node.terminal:
+            cx, cy = node.x + TERMINAL_RADIUS, node.y + TERMINAL_RADIUS
+            fill = "#43a047" if node.name == START else "#263238"
+            label = "Start" if node.name == START else "End"
+            parts = [
+                f'<circle cx="{cx}" cy="{cy}" r="{TERMINAL_RADIUS}" fill="{fill}"/>',
+                f'<text x="{cx + TERMINAL_RADIUS + 6}" y="{cy + 4}">{label}</text>',
+            ]
+            if node.name == END:
+                parts.insert(
+                    0,
+                    f'<circle cx="{cx}" cy="{cy}" r="{TERMINAL_RADIUS + 3}" '
+                    'fill="none" stroke="#263238"/>',
+                )
+            return parts
+
+        fill = STATE_COLORS.get(node.type, "#ffffff")
+        text_x = node.x + NODE_PADDING
+        parts = [
+            f'<rect x="{node.x}" y="{node.y}" width="{node.width}" '
+            f'height="{node.height}" rx="6" fill="{fill}" stroke="#546e7a"/>',
+            f'<text x="{text_x}" y="{node.y + LINE_HEIGHT}" '
+            f'font-weight="bold">{escape(node.label)}</text>',
+            f'<text x="{text_x}" y="{node.y + 2 * LINE_HEIGHT}" fill="#607d8b" '
+            f'font-style="italic">{escape(node.type)}</text>',
+        ]
+        for line, detail in enumerate(node.details, start=3):
+            parts.append(
+                f'<text x="{text_x}" y="{node.y + line * LINE_HEIGHT}">'
+                f"{escape(detail)}</text>"
+            )
+        return parts
+
+    def _svg_edge(self, index: int, edge: _Edge, repeat: int) -> list[str]:
+        source, target = self.nodes[edge.source], self.nodes[edge.target]
+        color, dash = EDGE_STYLES[edge.kind]
+
+        if index in self.back_edges:
+            # Loop back up along the right side of both nodes
+            x1, y1 = source.x + source.width, source.y + source.height / 2
+            x2, y2 = target.x + target.width, target.y + target.height / 2
+            bend = max(x1, x2) + BACK_EDGE_OFFSET
+            path = f"M {x1} {y1} C {bend} {y1}, {bend} {y2}, {x2} {y2}"
+            label_x, label_y = bend - BACK_EDGE_OFFSET / 4, (y1 + y2) / 2
+        else:
+            x1, y1 = source.x + source.width / 2, source.y + source.height
+            x2, y2 = target.x + target.width / 2, target.y
+            middle = (y1 + y2) / 2
+            path = f"M {x1} {y1} C {x1} {middle}, {x2} {middle}, {x2} {y2}"
+            label_x, label_y = (x1 + x2) / 2 + 4, middle
+
+        # Stack the labels of parallel edges between the same two states
+        label_y += repeat * LINE_HEIGHT
+
+        parts = [
+            f'<path d="{path}" fill="none" stroke="{color}" stroke-width="1.5"'
+            f'{dash} marker-end="url(#arrow-{edge.kind})"/>'
+        ]
+        if edge.label:
+            parts.append(
+                f'<text x="{label_x}" y="{label_y}" fill="{color}" '
+                f'font-size="11">{escape(edge.label)}</text>'
+            )
+        return parts
+
+    def to_svg(self) -> str:
+        markers = [
+            f'<marker id="arrow-{kind}" viewBox="0 0 10 10" refX="10" refY="5" '
+            'markerWidth="8" markerHeight="8" orient="auto-start-reverse">'
+            f'<path d="M 0 0 L 10 5 L 0 10 z" fill="{color}"/></marker>'
+            for kind, (color, _) in EDGE_STYLES.items()
+        ]
+        parts = [
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'width="{self.width}" height="{self.height}" '
+            f'viewBox="0 0 {self.width} {self.height}" '
+            'font-family="sans-serif" font-size="12">',
+            f"<defs>{''.join(markers)}</defs>",
+            '<rect width="100%" height="100%" fill="#ffffff"/>',
+        ]
+        seen: dict[tuple[str, str], int] = {}
+        for index, edge in enumerate(self.edges):
+            repeat = seen.get((edge.source, edge.target), 0)
+            seen[(edge.source, edge.target)] = repeat + 1
+            parts.extend(self._svg_edge(index, edge, repeat))
+        for node in self.nodes.values():
+            parts.extend(self._svg_node(node))
+        parts.append("</svg>")
+        return "\n".join(parts)
+
+
+def render_workflow_svg(workflow: str | dict) -> str:
+    """
+    Render a serverless workflow diagram as SVG without a browser.
+
+    Args:
+        workflow: The workflow as a JSON string or an already parsed dict
+
+    Returns:
+        str: SVG document
+    """
+    if isinstance(workflow, str):
+        workflow = json.loads(workflow)
+    if not isinstance(workflow, dict):
+        raise ValueError("Workflow must be a JSON object")
+
+    layout = WorkflowLayout(workflow)
+    logger.info(
+        f"Native layout: {len(layout.nodes) - 2} states, {len(layout.edges)} edges"
+    )
+    return layout.to_svg()
@@ -0,0 +1,222 @@
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Where finished spans go: unset or empty to disable tracing, "stdout", or the
+# path of a file spans are appended to
+TRACE_EXPORT = os.environ.get("ORCHESTRATOR_TRACE_EXPORT", "")
+
+SERVICE_NAME = os.environ.get("OTEL_SERVICE_NAME", "orchestrator-mcp")
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SESSION_ATTRIBUTE = "session.id"
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+def _attribute_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict) -> list[dict]:
+    return [
+        {"key": key, "value": _attribute_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+class Span:
+    """One timed operation of a trace, in the shape OpenTelemetry expects."""
+
+    def __init__(
+        self,
+        name: str,
+        parent: "Span | None" = None,
+        start_ns: int | None = None,
+        attributes: dict | None = None,
+    ):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = start_ns if start_ns is not None else time.time_ns()
+        self.end_ns: int | None = None
+        # Every span of a trace carries the session of its root
+        self.attributes = {}
+        if parent and SESSION_ATTRIBUTE in parent.attributes:
+            self.attributes[SESSION_ATTRIBUTE] = parent.attributes[SESSION_ATTRIBUTE]
+        self.attributes.update(attributes or {})
+        self.status = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, message: str):
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, message: str):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """
+    Writes finished spans as OTLP/JSON lines, the format read by the
+    OpenTelemetry Collector `otlpjsonfile` receiver: one
+    ExportTraceServiceRequest per line.
+    """
+
+    def __init__(self, target: str):
+        self.target = target
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _stream(self):
+        if self.target == "stdout":
+            return sys.stdout
+        if self._file is None:
+            self._file = open(self.target, "a", encoding="utf-8")
+        return self._file
+
+    def export(self, spans: list[Span]):
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": _attributes({"service.name": SERVICE_NAME})
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": __name__},
+                                "spans": [span.to_otlp() for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            },
+            separators=(",", ":"),
+        )
+        with self._lock:
+            try:
+                stream = self._stream()
+                stream.write(line + "\n")
+                stream.flush()
+            except OSError as e:
+                logger.error(f"Cannot export spans to {self.target}: {e}")
+
+
+class Tracer:
+    """
+    Creates spans nested by context: a span opened while another one is
+    current (in the same task, or a task created from it) becomes its child.
+    Spans are exported as soon as they end; a backend assembles the trace.
+    """
+
+    def __init__(self, exporter: SpanExporter | None):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, session_id: str | None = None, **attributes):
+        """
+        Time the block as a span, marked as an error if it raises.
+
+        Args:
+            name: Name of the operation, e.g. "compile_workflow"
+            session_id: Session the operation belongs to, set on root spans
+            attributes: Span attributes; None values are left out
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        if session_id is not None:
+            attributes[SESSION_ATTRIBUTE] = session_id
+        span = Span(name, _current_span.get(), attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def span_attribute(self, key: str, value: Any):
+        """Set an attribute on the current span, if any."""
+        span = _current_span.get()
+        if span is not None:
+            span.set_attribute(key, value)
+
+    def record(self, name: str, start_ns: int, end_ns: int, error=None, **attributes):
+        """
+        Add an already finished operation, e.g. timed by another process, as
+        a child of the current span. Ignored when there is no current span.
+        """
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            return
+        span = Span(name, parent, start_ns, attributes)
+        if error:
+            span.set_error(error)
+        self._finish(span, end_ns)
+
+    def _finish(self, span: Span, end_ns: int | None = None):
+        span.end_ns = end_ns if end_ns is not None else time.time_ns()
+        self.exporter.export([span])
+
+
+tracer = Tracer(SpanExporter(TRACE_EXPORT) if TRACE_EXPORT else None)
@@ -0,0 +1,122 @@
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from .orchestrator_get_schema_rules import get_schema_index
+from .orchestrator_service import orchestrator_mcp
+from .orchestrator_workflow_validator import ValidationIssue, format_issues
+
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# jsonschema messages embed the offending instance, which can be a whole state
+MAX_MESSAGE_LENGTH = 300
+
+
+@lru_cache(maxsize=1)
+def get_schema_validator():
+    """Validator for the consolidated schema, compiled on first use."""
+    from jsonschema.validators import validator_for
+
+    schema = get_schema_index().schema
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema, format_checker=cls.FORMAT_CHECKER)
+
+
+def _pointer(error: "ValidationError") -> str:
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1")
+        for part in error.absolute_path
+    )
+
+
+def _leaf_errors(error: "ValidationError") -> list["ValidationError"]:
+    """
+    Replace an anyOf/oneOf failure by the errors of the branch that came
+    closest to matching, since "is not valid under any of the given schemas"
+    does not say what to fix: the one whose errors are the deepest, then the
+    fewest. A branch whose `const` failed (e.g. a state of another type) is
+    only used when nothing better is available.
+    """
+    if not error.context:
+        return [error]
+
+    branches: dict = {}
+    for sub in error.context:
+        branches.setdefault(sub.relative_schema_path[0], []).append(sub)
+
+    best = min(
+        branches.values(),
+        key=lambda errors: (
+            any(e.validator == "const" for e in errors),
+            -max(len(e.absolute_path) for e in errors),
+            len(errors),
+        ),
+    )
+    return [leaf for sub in best for leaf in _leaf_errors(sub)]
+
+
+def check_workflow_schema(workflow: str | dict) -> list[ValidationIssue]:
+    """
+    Validate a workflow against the consolidated orchestrator-workflow schema.
+
+    Args:
+        workflow: The workflow as a JSON string or an already parsed dict
+
+    Returns:
+        list[ValidationIssue]: Every schema violation found, empty if none
+    """
+    if isinstance(workflow, str):
+        try:
+            workflow = json.loads(workflow)
+        except json.JSONDecodeError as e:
+            return [ValidationIssue("", f"invalid JSON: {e}")]
+
+    issues = {}
+    for error in get_schema_validator().iter_errors(workflow):
+        for leaf in _leaf_errors(error):
+            message = leaf.message
+            if len(message) > MAX_MESSAGE_LENGTH:
+                message = message[: MAX_MESSAGE_LENGTH - 3] + "..."
+            issue = ValidationIssue(_pointer(leaf), message)
+            issues[str(issue)] = issue
+
+    return sorted(issues.values(), key=lambda issue: issue.path)
+
+
+@orchestrator_mcp.tool()
+def validate_workflow_schema(session_id: str, workflow: str) -> (bool, str):
+    """
+    Validate a rhdh orchestrator workflow against the orchestrator-workflow JSON
+    schema. Much faster than compile_workflow, use it to catch malformed
+    workflows (missing or misspelled properties, wrong types) before compiling.
+
+    Args:
+        session_id: The session identifier
+        workflow: The workflow content as a string
+
+    Returns:
+        A tuple of (success: bool, logs: str) where logs lists every violation
+        with the JSON Pointer of the offending value
+    """
+    logger.info(f"orchestrator_validate_workflow_schema for session_id='{session_id}'")
+
+    started = time.monotonic()
+    try:
+        issues = check_workflow_schema(workflow)
+    except Exception as e:
+        logger.error(f"Schema validation failed for session_id='{session_id}': {e}")
+        return False, "Error: cannot load the orchestrator-workflow schema"
+
+    logger.info(
+        f"Schema validation for session_id='{session_id}' found {len(issues)} "
+        f"issue(s) in {(time.monotonic() - started) * 1000:.1f}ms"
+    )
+    if issues:
+        return False, format_issues(issues, "schema violation")
+    return True, "Workflow matches the orchestrator-workflow schema"
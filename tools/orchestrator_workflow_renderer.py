@@ -1,91 +1,504 @@
+import asyncio
 import json
 import logging
-import uuid
+import os
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
+from typing import Literal
 
-import cairosvg
 from fastmcp.server.context import Context
-from playwright.async_api import async_playwright
 
+from .orchestrator_artifact_store import artifact_store
+from .orchestrator_cache import LRUCache, TieredCache, shared_cache, workflow_digest
+from .orchestrator_metrics import metrics
+from .orchestrator_rasterizer import Rasterizer
 from .orchestrator_service import orchestrator_mcp
+from .orchestrator_session_workspace import SessionWorkspace, workspaces
+from .orchestrator_svg_renderer import render_workflow_svg
+from .orchestrator_tracing import tracer
 
 logger = logging.getLogger(__name__)
 
+# Pages loaded with the editor, i.e. how many previews can render at once
+RENDER_PAGES = int(os.environ.get("ORCHESTRATOR_RENDER_PAGES", "2"))
+
+# Rendered previews remembered by workflow content hash, and shared with the
+# other worker processes when a shared cache is configured
+RENDER_CACHE_SIZE = int(os.environ.get("ORCHESTRATOR_RENDER_CACHE_SIZE", "128"))
+
+# Renders a page serves before a fresh one loads the editor in its place, and
+# JS heap size past which it is replaced sooner; 0 disables either limit
+RENDER_PAGE_MAX_RENDERS = int(
+    os.environ.get("ORCHESTRATOR_RENDER_PAGE_MAX_RENDERS", "200")
+)
+RENDER_PAGE_MAX_HEAP_MB = float(
+    os.environ.get("ORCHESTRATOR_RENDER_PAGE_MAX_HEAP_MB", "512")
+)
+
+# Seconds between health checks of the browser and its idle pages, 0 disables
+RENDER_HEALTH_INTERVAL = float(
+    os.environ.get("ORCHESTRATOR_RENDER_HEALTH_INTERVAL", "30")
+)
+
+# Seconds a page has to answer a health or heap check
+HEALTH_CHECK_TIMEOUT = 5
+
+# Longest wait, in seconds, between two attempts to restart a broken browser
+RESTART_MAX_DELAY = 60
+
+# Attempts to load a replacement page, one second apart and doubling, before
+# a browser that is still connected is restarted anyway
+PAGE_REPLACE_ATTEMPTS = 3
+
+JS_HEAP_SIZE = "performance.memory ? performance.memory.usedJSHeapSize : 0"
+
+_renderer = None
+
+browser_init_seconds = metrics.histogram(
+    "orchestrator_browser_init_seconds",
+    "Time to launch the browser and load the editor in every renderer page",
+)
+render_seconds = metrics.histogram(
+    "orchestrator_render_seconds",
+    "Time to draw a preview SVG, waiting for a free page included; "
+    "engine is browser or native",
+    ["engine"],
+)
+browser_restarts = metrics.counter(
+    "orchestrator_browser_restarts_total",
+    "Renderer browser restarts; reason is crash or unresponsive",
+    ["reason"],
+)
+page_recycles = metrics.counter(
+    "orchestrator_render_page_recycles_total",
+    "Renderer pages replaced by a fresh one; "
+    "reason is renders, heap, crash or unresponsive",
+    ["reason"],
+)
+
+
+class RendererCrashedError(RuntimeError):
+    """The page or the browser a render ran on died during the render."""
+
+
+class RendererPage:
+    """A page of the pool, with what tells when it is due for replacement."""
+
+    def __init__(self, page, generation: int):
+        self.page = page
+        # Browser launch the page belongs to, see WorkflowRenderer._generation
+        self.generation = generation
+        self.renders = 0
+        self.crashed = False
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, _):
+        self.crashed = True
+        logger.error("Renderer page crashed")
+
+    @property
+    def broken(self) -> bool:
+        return self.crashed or self.page.is_closed()
+
 
 class WorkflowRenderer:
-    def __init__(self):
+    """
+    Renders workflows with the editor loaded in a pool of browser pages.
+
+    The pool is supervised: a page is replaced by a fresh one after
+    RENDER_PAGE_MAX_RENDERS renders, once its JS heap grows past
+    RENDER_PAGE_MAX_HEAP_MB, or when it crashes or stops answering. A browser
+    that crashed is launched again by the next render or health check, and a
+    render interrupted by a crash is retried once on a fresh page.
+    """
+
+    def __init__(self, pages: int = RENDER_PAGES):
         self.html_path = (
             Path(__file__).parent.parent / "assets" / "workflow-renderer" / "index.html"
         )
-        self.workflows_dir = Path(__file__).parent.parent / "assets" / "workflows"
+        self.artifacts = artifact_store
+        self.pages = pages
         self._browser = None
-        self._page = None
         self._playwright = None
+        self._pool: asyncio.Queue | None = None
+        self._init_lock = asyncio.Lock()
+        self._cache = TieredCache(LRUCache(RENDER_CACHE_SIZE), shared_cache("render"))
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.inflight_joins = 0
+        self._rasterizer = Rasterizer()
+
+        # Incremented at every browser launch, pages of an older one are dropped
+        self._generation = 0
+        self._needs_restart = False
+        self._closing = False
+        self._supervisor: asyncio.Task | None = None
+        self._replacing: set[asyncio.Task] = set()
+        self.restarts: dict[str, int] = {}
+        self.recycles: dict[str, int] = {}
 
     async def __init_browser(self):
         """
-        Initialize browser and load the workflow renderer page just once
+        Initialize browser and load the workflow renderer pages just once,
+        or again when the browser crashed or stopped answering
 
         Context: editor.js is 20MB, (yes, you read correct) and
         we need to cached if not the timeouts happens)
         """
 
-        if self._browser is None:
+        async with self._init_lock:
+            if self.ready and not self._needs_restart:
+                return
+            if self._closing:
+                raise RuntimeError("The renderer is shut down")
+
+            if self._browser is not None:
+                reason = "unresponsive" if self._browser.is_connected() else "crash"
+                logger.warning(f"Restarting the renderer browser ({reason})")
+                browser_restarts.inc(reason=reason)
+                self.restarts[reason] = self.restarts.get(reason, 0) + 1
+                await self.__close_browser()
+
+            # Imported on first use, only servers rendering previews need it
+            from playwright.async_api import async_playwright
+
             logger.info("Initializing browser...")
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch()
-            self._page = await self._browser.new_page()
+            try:
+                with browser_init_seconds.time(), tracer.span("browser.init"):
+                    if self._playwright is None:
+                        self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch()
+                    self._browser.on("disconnected", self._on_disconnected)
+                    self._generation += 1
+
+                    pages = await asyncio.gather(
+                        *(self.__new_page() for _ in range(self.pages))
+                    )
+            except Exception:
+                # Start over from scratch on the next attempt
+                await self.__close_browser()
+                await self.__stop_playwright()
+                raise
+            self._needs_restart = False
+
+            # Pages of a previous browser still in the pool are dead; callers
+            # waiting for a page keep waiting on the same queue
+            if self._pool is None:
+                self._pool = asyncio.Queue()
+            while not self._pool.empty():
+                self._pool.get_nowait()
+            for page in pages:
+                self._pool.put_nowait(page)
+            logger.info(f"Browser initialized with {len(pages)} renderer pages")
+
+            if self._supervisor is None and RENDER_HEALTH_INTERVAL > 0:
+                self._supervisor = asyncio.create_task(self._supervise())
+
+    def _on_disconnected(self, browser):
+        if browser is self._browser and not self._closing:
+            logger.error("Renderer browser disconnected")
+
+    async def __close_browser(self):
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            with suppress(Exception):
+                await browser.close()
+
+    async def __stop_playwright(self):
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            with suppress(Exception):
+                await playwright.stop()
+
+    async def __new_page(self) -> RendererPage:
+        generation = self._generation
+        page = await self._browser.new_page()
+
+        page.on(
+            "console",
+            lambda msg: logger.info(f"Browser console [{msg.type}]: {msg.text}"),
+        )
+        page.on("pageerror", lambda err: logger.error(f"Browser error: {err}"))
 
-            self._page.on(
-                "console",
-                lambda msg: logger.info(f"Browser console [{msg.type}]: {msg.text}"),
-            )
-            self._page.on(
-                "pageerror", lambda err: logger.error(f"Browser error: {err}")
-            )
+        logger.info(f"Loading HTML file: file://{self.html_path.absolute()}")
+        await page.goto(f"file://{self.html_path.absolute()}")
 
-            logger.info(f"Loading HTML file: file://{self.html_path.absolute()}")
-            await self._page.goto(f"file://{self.html_path.absolute()}")
+        # Wait for editor to initialize
+        logger.info("Waiting for editor to initialize...")
+        await page.wait_for_function("typeof render_workflow === 'function'")
+        await page.wait_for_function("ready(); EditorIsReady === true")
+        return RendererPage(page, generation)
 
-            # Wait for editor to initialize
-            logger.info("Waiting for editor to initialize...")
-            await self._page.wait_for_function("typeof render_workflow === 'function'")
-            await self._page.wait_for_function("ready(); EditorIsReady === true")
-            logger.info("Browser initialized and page loaded")
+    @asynccontextmanager
+    async def _acquire_page(self):
+        """
+        Borrow a loaded page for one render. Each page has its own
+        #renderWorkflow container, so concurrent renders never share DOM;
+        callers wait here once every page is busy.
+
+        Raises:
+            RendererCrashedError: When the render failed because the page or
+                the browser died
+        """
+        await self.__init_browser()
+
+        with tracer.span("browser.acquire_page"):
+            page = await self._pool.get()
+        try:
+            yield page.page
+        except Exception as e:
+            if page.broken or not self.ready:
+                raise RendererCrashedError(f"Renderer browser crashed: {e}") from e
+            raise
+        finally:
+            page.renders += 1
+            await self.__release(page)
+
+    async def __release(self, page: RendererPage):
+        if page.generation != self._generation:
+            # The browser was restarted meanwhile and the pool refilled
+            return
+        reason = await self.__recycle_reason(page)
+        if reason is None:
+            self._pool.put_nowait(page)
+        else:
+            self.__recycle(page, reason)
+
+    async def __recycle_reason(self, page: RendererPage) -> str | None:
+        """Why a page should be replaced before its next render, if it should."""
+        if page.broken:
+            return "crash"
+        if RENDER_PAGE_MAX_RENDERS and page.renders >= RENDER_PAGE_MAX_RENDERS:
+            return "renders"
+        if RENDER_PAGE_MAX_HEAP_MB:
+            try:
+                heap = await asyncio.wait_for(
+                    page.page.evaluate(JS_HEAP_SIZE), HEALTH_CHECK_TIMEOUT
+                )
+            except Exception:
+                return "crash" if page.broken or not self.ready else "unresponsive"
+            if heap > RENDER_PAGE_MAX_HEAP_MB * 1024 * 1024:
+                return "heap"
+        return None
+
+    def __recycle(self, page: RendererPage, reason: str):
+        """Close a page and load a fresh one in its place in the background."""
+        logger.info(
+            f"Replacing a renderer page ({reason}) after {page.renders} renders"
+        )
+        page_recycles.inc(reason=reason)
+        self.recycles[reason] = self.recycles.get(reason, 0) + 1
+        task = asyncio.create_task(self.__replace_page(page))
+        self._replacing.add(task)
+        task.add_done_callback(self._replacing.discard)
+
+    async def __replace_page(self, page: RendererPage):
+        """
+        Load a fresh page in place of `page`, backing off between attempts.
+        The pool stays a page short meanwhile; the browser is only restarted
+        once it disconnected or after PAGE_REPLACE_ATTEMPTS failures in a row.
+        """
+        with suppress(Exception):
+            await page.page.close()
+
+        delay = 1
+        for attempt in range(1, PAGE_REPLACE_ATTEMPTS + 1):
+            if self._closing or page.generation != self._generation:
+                # A restart meanwhile loaded a full set of pages
+                return
+            if not self.ready:
+                break
+            try:
+                with tracer.span("browser.replace_page", attempt=attempt):
+                    fresh = await self.__new_page()
+            except Exception as e:
+                logger.error(
+                    f"Cannot load a renderer page (attempt {attempt} of "
+                    f"{PAGE_REPLACE_ATTEMPTS}): {e}"
+                )
+            else:
+                if fresh.generation == self._generation:
+                    self._pool.put_nowait(fresh)
+                else:
+                    with suppress(Exception):
+                        await fresh.page.close()
+                return
+            if not self.ready or attempt == PAGE_REPLACE_ATTEMPTS:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_MAX_DELAY)
+
+        if self._closing or page.generation != self._generation:
+            return
+        # Callers may all be waiting for the missing page: only a restart,
+        # which loads a full set of pages, gives it back
+        logger.error("Cannot replace a renderer page, restarting the browser")
+        self._needs_restart = True
+        await self.__restart()
+
+    async def __restart(self):
+        """Restart the browser until it works, backing off between attempts."""
+        delay = 1
+        while not self._closing:
+            try:
+                await self.__init_browser()
+                return
+            except Exception as e:
+                logger.error(
+                    f"Cannot restart the renderer browser, retrying in {delay}s: {e}"
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_MAX_DELAY)
+
+    async def _supervise(self):
+        while True:
+            await asyncio.sleep(RENDER_HEALTH_INTERVAL)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"Renderer health check failed: {e}")
+
+    async def check_health(self):
+        """
+        Restart the browser if it crashed or a page could not be replaced,
+        else make sure every idle page still answers. Busy pages are checked
+        when they are released.
+        """
+        if not self.ready or self._needs_restart:
+            await self.__init_browser()
+            return
+
+        for _ in range(self._pool.qsize()):
+            try:
+                page = self._pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if page.generation != self._generation:
+                continue
+            try:
+                await asyncio.wait_for(page.page.evaluate("1"), HEALTH_CHECK_TIMEOUT)
+            except Exception:
+                self.__recycle(page, "crash" if page.broken else "unresponsive")
+            else:
+                self._pool.put_nowait(page)
 
     @property
-    def browser(self):
-        return self._browser
+    def ready(self) -> bool:
+        """Whether the browser is up, i.e. previews render without launching it."""
+        return self._browser is not None and self._browser.is_connected()
 
-    async def render_workflow_to_png_file(self, workflow_data: str) -> str:
+    async def warm_up(self):
+        """Start the browser and load the editor pages ahead of the first preview."""
+        await self.__init_browser()
+
+    async def close(self):
+        """Stop supervising and shut the browser down."""
+        self._closing = True
+        tasks = list(self._replacing)
+        if self._supervisor is not None:
+            tasks.append(self._supervisor)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        async with self._init_lock:
+            await self.__close_browser()
+            await self.__stop_playwright()
+
+    def browser_stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "pages": self.pages,
+            "idle_pages": self._pool.qsize() if self._pool is not None else 0,
+            "launches": self._generation,
+            "restarts": dict(self.restarts),
+            "page_recycles": dict(self.recycles),
+        }
+
+    async def render_workflow_to_png_file(
+        self, workflow_data: str, native: bool = False
+    ) -> str:
         """
         Render workflow data to PNG file and return the file path
 
+        Identical workflows (same canonical JSON) are rendered once: later
+        calls get the cached file, and calls arriving while the first render
+        is still running wait for it instead of starting their own.
+
         Args:
             workflow_data (str): JSON string of workflow data
+            native (bool): Lay out the diagram in Python instead of the
+                browser editor; falls back to the browser if that fails
 
         Returns:
             str: Path to the saved PNG file
         """
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        png_path = self.workflows_dir / f"{file_id}.png"
-
-        # Ensure the directory exists
-        self.workflows_dir.mkdir(parents=True, exist_ok=True)
-
-        svg = await self.render_workflow_to_svg(workflow_data)
-        png_bytes = cairosvg.svg2png(bytestring=svg.encode("utf-8"))
-
-        # Save to file
-        with open(png_path, "wb") as f:
-            f.write(png_bytes)
+        key = workflow_digest(workflow_data, "native" if native else "browser")
+
+        png_path = await self._cache.aget(key)
+        if png_path is not None and self.artifacts.touch(png_path):
+            tracer.span_attribute("render.cached", True)
+            return png_path
+
+        task = self._inflight.get(key)
+        tracer.span_attribute("render.joined", task is not None)
+        if task is None:
+            task = asyncio.ensure_future(self._render_once(key, workflow_data, native))
+            task.add_done_callback(lambda t: self._render_done(key, t))
+            self._inflight[key] = task
+        else:
+            self.inflight_joins += 1
+
+        # A cancelled caller must not cancel a render other callers wait for
+        return await asyncio.shield(task)
+
+    def _render_done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+
+    async def _render_once(self, key: str, workflow_data: str, native: bool) -> str:
+        # Workers sharing the cache render a given workflow only once
+        async with self._cache.single_flight(key) as png_path:
+            if png_path is not None and self.artifacts.touch(png_path):
+                return png_path
+            png_path = await self._render_png_file(workflow_data, native)
+            await self._cache.aset(key, png_path)
+            return png_path
+
+    def cache_stats(self) -> dict:
+        stats = self._cache.stats()
+        stats["inflight"] = len(self._inflight)
+        stats["inflight_joins"] = self.inflight_joins
+        return stats
+
+    def raster_stats(self) -> dict:
+        return self._rasterizer.stats()
+
+    async def _render_png_file(self, workflow_data: str, native: bool) -> str:
+        png_path = self.artifacts.new_path(".png")
+
+        svg = None
+        if native:
+            try:
+                with (
+                    render_seconds.time(engine="native"),
+                    tracer.span("render.native_layout"),
+                ):
+                    svg = render_workflow_svg(workflow_data)
+            except Exception as e:
+                logger.warning(f"Native rendering failed, using the browser: {e}")
+        if svg is None:
+            with render_seconds.time(engine="browser"), tracer.span("render.browser"):
+                svg = await self.render_workflow_to_svg(workflow_data)
+
+        # Rasterize and save off the event loop
+        with tracer.span("render.rasterize") as span:
+            span.set_attribute("svg.bytes", len(svg))
+            await self._rasterizer.rasterize(svg, png_path)
 
         return str(png_path)
 
     async def render_workflow_to_svg(self, workflow_data: str) -> str:
         """
-        Render workflow data to SVG using headless browser
+        Render workflow data to SVG using headless browser. A render the
+        browser crashed during is tried again once, on a fresh page.
 
         Args:
             workflow_data (str): JSON string of workflow data
@@ -95,33 +508,11 @@ class WorkflowRenderer:
         """
         logger.info("Starting workflow rendering process...")
 
-        await self.__init_browser()
-
         try:
-            await self._page.evaluate(f"""
-                let workflow_data = {workflow_data};
-                render_workflow(
-                    document.getElementById("renderWorkflow"),
-                    JSON.stringify(workflow_data)
-                );
-            """)
-
-            # Get the SVG content
-            await self._page.wait_for_function(
-                "document.getElementById('renderWorkflow')."
-                "querySelector('svg') !== null"
-            )
-            svg_content = await self._page.evaluate(
-                "document.getElementById('renderWorkflow').innerHTML"
-            )
-        except Exception as e:
-            logger.error(f"Error calling render_workflow: {e}")
-            # Try to get any error messages from the page
-            errors = await self._page.evaluate(
-                "document.querySelector('#renderWorkflow').innerHTML"
-            )
-            logger.info(f"Container content: {errors}")
-            raise
+            svg_content = await self.__render_svg(workflow_data)
+        except RendererCrashedError as e:
+            logger.warning(f"{e}, rendering again")
+            svg_content = await self.__render_svg(workflow_data)
 
         logger.info(
             f"SVG generated, length: "
@@ -129,24 +520,100 @@ class WorkflowRenderer:
         )
         return svg_content
 
+    async def __render_svg(self, workflow_data: str) -> str:
+        async with self._acquire_page() as page:
+            try:
+                # The page is reused, drop the previous render so that the
+                # wait below only matches this workflow's SVG
+                with tracer.span("page.evaluate"):
+                    await page.evaluate(f"""
+                        let workflow_data = {workflow_data};
+                        let container = document.getElementById("renderWorkflow");
+                        container.innerHTML = "";
+                        render_workflow(container, JSON.stringify(workflow_data));
+                    """)
+
+                # Get the SVG content
+                with tracer.span("page.wait_for_function"):
+                    await page.wait_for_function(
+                        "document.getElementById('renderWorkflow')."
+                        "querySelector('svg') !== null"
+                    )
+                with tracer.span("page.extract_svg"):
+                    return await page.evaluate(
+                        "document.getElementById('renderWorkflow').innerHTML"
+                    )
+            except Exception as e:
+                logger.error(f"Error calling render_workflow: {e}")
+                # Try to get any error messages from the page, unless it died
+                with suppress(Exception):
+                    errors = await asyncio.wait_for(
+                        page.evaluate(
+                            "document.querySelector('#renderWorkflow').innerHTML"
+                        ),
+                        HEALTH_CHECK_TIMEOUT,
+                    )
+                    logger.info(f"Container content: {errors}")
+                raise
+
+
+def get_renderer() -> WorkflowRenderer:
+    """Process-wide renderer, so the browser and its pages are loaded once."""
+    global _renderer
+
+    if _renderer is None:
+        _renderer = WorkflowRenderer()
+    return _renderer
+
+
+async def stop_renderer():
+    if _renderer is not None:
+        await _renderer.close()
+
 
 @orchestrator_mcp.tool()
-async def preview_workflow(ctx: Context, session_id: str, workflow: str) -> str:
+async def preview_workflow(
+    ctx: Context,
+    session_id: str,
+    workflow: str,
+    mode: Literal["full", "fast"] = "full",
+) -> str:
     """
     Generate PNG preview of a orchestrator workflow.
 
     Args:
         session_id: Session identifier for tracking
         workflow: JSON string representing the serverless workflow
+        mode: "full" renders with the workflow editor (highest fidelity),
+            "fast" draws a simplified diagram without starting a browser
 
     Returns:
         str: URL of the PNG image
     """
+    workspace = await workspaces.record(session_id, workflow)
+    return await preview_workflow_text(ctx, session_id, workflow, mode, workspace)
+
+
+def preview_url(ctx: Context, png_path: str) -> str:
+    """URL a client of this request can fetch a preview from."""
     host = ctx.get_http_request().url
     hostname = host.hostname
     if hostname == "host.docker.internal":
         hostname = "localhost"
+    return f"http://{hostname}:{host.port}/static/{Path(png_path).name}"
+
 
+async def preview_workflow_text(
+    ctx: Context,
+    session_id: str,
+    workflow: str,
+    mode: Literal["full", "fast"] = "full",
+    workspace: SessionWorkspace | None = None,
+) -> str:
+    """
+    Render a workflow like the preview_workflow tool does. When given, the
+    session workspace holding this workflow keeps the preview.
+    """
     try:
         logger.info(f"Generating workflow preview for session {session_id}")
 
@@ -157,12 +624,17 @@ async def preview_workflow(ctx: Context, session_id: str, workflow: str) -> str:
             logger.error(f"Invalid JSON workflow: {e}")
             raise ValueError(f"Invalid JSON workflow: {e}")
 
-        # Create renderer and generate PNG file
-        renderer = WorkflowRenderer()
-        png_path = await renderer.render_workflow_to_png_file(workflow)
+        version = workspace.version if workspace else None
+
+        # Generate PNG file with the shared renderer
+        with tracer.span("preview_workflow", session_id=session_id, mode=mode):
+            png_path = await get_renderer().render_workflow_to_png_file(
+                workflow, native=mode == "fast"
+            )
+        if workspace:
+            workspace.record_preview(version, mode, png_path)
 
-        filename = Path(png_path).name
-        image_url = f"http://{hostname}:{host.port}/static/{filename}"
+        image_url = preview_url(ctx, png_path)
 
         logger.info(
             f"Successfully generated PNG for session {session_id} at {image_url}"
@@ -0,0 +1,396 @@
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Root fields the workflow schema requires, each given by alternative names
+ROOT_FIELDS = (("id", "key"), ("specVersion",), ("states",))
+
+# Root fields that the creation rules mark as mandatory but that the schema
+# and Kogito do without (`start` defaults to the first state): a missing one
+# is only a warning and never stops a compile
+RECOMMENDED_ROOT_FIELDS = ("version", "name", "start")
+
+STATE_TYPES = (
+    "sleep",
+    "event",
+    "operation",
+    "parallel",
+    "switch",
+    "inject",
+    "foreach",
+    "callback",
+)
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """
+    A structural problem found in a workflow, located by JSON Pointer.
+    Warnings break a creation rule that Kogito does not enforce.
+    """
+
+    path: str
+    message: str
+    state: str | None = None
+    warning: bool = False
+
+    def __str__(self):
+        prefix = "warning: " if self.warning else ""
+        return f"{self.path or '(root)'}: {prefix}{self.message}"
+
+
+def has_errors(issues: list[ValidationIssue]) -> bool:
+    """Whether any of the issues is more than a warning."""
+    return any(not issue.warning for issue in issues)
+
+
+# Arrays of objects a state may hold, with the name of one element
+STATE_ARRAYS = {
+    "actions": "action",
+    "branches": "branch",
+    "onEvents": "onEvents entry",
+    "onErrors": "onErrors entry",
+    "dataConditions": "data condition",
+    "eventConditions": "event condition",
+}
+
+
+def _name(value, key: str):
+    """Reference values can be a plain name or an object holding it."""
+    if isinstance(value, dict):
+        return value.get(key)
+    return value
+
+
+def _names(definitions) -> set[str] | None:
+    """Names of root functions/errors/events, None if defined by an URI."""
+    if definitions is None:
+        return set()
+    if not isinstance(definitions, list):
+        return None
+    return {
+        d["name"]
+        for d in definitions
+        if isinstance(d, dict) and isinstance(d.get("name"), str)
+    }
+
+
+def _objects(value):
+    """Yield (index, item) for the objects of an array, skipping anything else."""
+    if isinstance(value, list):
+        for i, item in enumerate(value):
+            if isinstance(item, dict):
+                yield i, item
+
+
+def _shape_issues(state: dict, path: str):
+    """Yield (pointer, message) for arrays and elements of the wrong type."""
+    containers = [(path, state)]
+    for key in ("branches", "onEvents"):
+        containers.extend(
+            (f"{path}/{key}/{i}", item) for i, item in _objects(state.get(key))
+        )
+    for container_path, container in containers:
+        for key, element in STATE_ARRAYS.items():
+            if container is not state and key != "actions":
+                continue
+            value = container.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, list):
+                yield f"{container_path}/{key}", f"{key} must be an array"
+                continue
+            for i, item in enumerate(value):
+                if not isinstance(item, dict):
+                    yield f"{container_path}/{key}/{i}", f"{element} must be an object"
+
+
+def _actions(state: dict, path: str):
+    """Yield (pointer, action) for every action of a state, at any depth."""
+    for i, action in _objects(state.get("actions")):
+        yield f"{path}/actions/{i}", action
+    for i, branch in _objects(state.get("branches")):
+        for j, action in _objects(branch.get("actions")):
+            yield f"{path}/branches/{i}/actions/{j}", action
+    for i, on_event in _objects(state.get("onEvents")):
+        for j, action in _objects(on_event.get("actions")):
+            yield f"{path}/onEvents/{i}/actions/{j}", action
+    if isinstance(state.get("action"), dict):
+        yield f"{path}/action", state["action"]
+
+
+def _transitions(state: dict, path: str):
+    """
+    Yield (pointer, target) for every outgoing edge of a state. Targets are
+    state names unless the workflow is malformed: callers check the type.
+    """
+    if "transition" in state:
+        yield f"{path}/transition", _name(state["transition"], "nextState")
+    for i, handler in _objects(state.get("onErrors")):
+        if "transition" in handler:
+            target = _name(handler["transition"], "nextState")
+            yield f"{path}/onErrors/{i}/transition", target
+    for key in ("dataConditions", "eventConditions"):
+        for i, condition in _objects(state.get(key)):
+            if "transition" in condition:
+                target = _name(condition["transition"], "nextState")
+                yield f"{path}/{key}/{i}/transition", target
+    default = state.get("defaultCondition")
+    if isinstance(default, dict) and "transition" in default:
+        target = _name(default["transition"], "nextState")
+        yield f"{path}/defaultCondition/transition", target
+    if "compensatedBy" in state:
+        yield f"{path}/compensatedBy", state["compensatedBy"]
+
+
+def _event_refs(state: dict, path: str):
+    """Yield (pointer, event name) for every event a state refers to."""
+    for i, on_event in _objects(state.get("onEvents")):
+        refs = on_event.get("eventRefs")
+        if not isinstance(refs, list):
+            refs = [] if refs is None else [refs]
+        for j, ref in enumerate(refs):
+            yield f"{path}/onEvents/{i}/eventRefs/{j}", ref
+    for i, condition in _objects(state.get("eventConditions")):
+        if "eventRef" in condition:
+            yield f"{path}/eventConditions/{i}/eventRef", condition["eventRef"]
+    if "eventRef" in state:
+        yield f"{path}/eventRef", state["eventRef"]
+    for action_path, action in _actions(state, path):
+        event_ref = action.get("eventRef")
+        if isinstance(event_ref, dict):
+            for key in ("triggerEventRef", "resultEventRef"):
+                if key in event_ref:
+                    yield f"{action_path}/eventRef/{key}", event_ref[key]
+
+
+class WorkflowGraph:
+    """
+    Index of a workflow's states, functions, errors and events, built in a
+    single pass so that every rule can be checked with dictionary lookups.
+    """
+
+    def __init__(self, workflow: dict):
+        self.workflow = workflow
+        self.states: dict[str, tuple[int, dict]] = {}
+        self.duplicates: list[tuple[int, str]] = []
+        self.functions = _names(workflow.get("functions"))
+        self.errors = _names(workflow.get("errors"))
+        self.events = _names(workflow.get("events"))
+        self.start = _name(workflow.get("start"), "stateName")
+        if not isinstance(self.start, str):
+            self.start = None
+        self.malformed: list[int] = []
+
+        states = workflow.get("states")
+        for index, state in enumerate(states if isinstance(states, list) else []):
+            if not isinstance(state, dict):
+                self.malformed.append(index)
+                continue
+            # States without a usable name are indexed like unnamed ones
+            name = state.get("name")
+            if not isinstance(name, str):
+                name = None
+            if name in self.states:
+                self.duplicates.append((index, name))
+            else:
+                self.states[name] = (index, state)
+
+        # Without a `start`, workflows start with their first state
+        if "start" not in workflow and isinstance(states, list) and states:
+            first = states[0]
+            if isinstance(first, dict) and isinstance(first.get("name"), str):
+                self.start = first["name"]
+
+    def reachable(self) -> set[str]:
+        """Names of the states reachable from `start`."""
+        if self.start is None or self.start not in self.states:
+            return set()
+
+        seen = {self.start}
+        queue = deque([self.start])
+        while queue:
+            index, state = self.states[queue.popleft()]
+            for _, target in _transitions(state, f"/states/{index}"):
+                if (
+                    isinstance(target, str)
+                    and target in self.states
+                    and target not in seen
+                ):
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def check_state(self, index: int, state: dict) -> list[ValidationIssue]:
+        """Check the rules that only depend on a single state."""
+        path = f"/states/{index}"
+        name = state.get("name")
+        if not isinstance(name, str):
+            name = None
+        issues = []
+
+        def issue(pointer, message, warning=False):
+            issues.append(ValidationIssue(pointer, message, name, warning))
+
+        if "name" in state and state["name"] is not None and name is None:
+            issue(f"{path}/name", "state name must be a string")
+        elif not name:
+            issue(path, "state has no name")
+        for pointer, message in _shape_issues(state, path):
+            issue(pointer, message)
+        if state.get("type") not in STATE_TYPES:
+            issue(f"{path}/type", f"unknown state type {state.get('type')!r}")
+
+        has_end = bool(state.get("end"))
+        if state.get("type") != "switch" and not has_end and "transition" not in state:
+            issue(path, "state must either have `end: true` or a `transition`")
+
+        if state.get("type") == "operation" and not state.get("actions"):
+            issue(
+                f"{path}/actions",
+                "operation state must have at least one action",
+                warning=True,
+            )
+        if state.get("type") == "event" and not state.get("onEvents"):
+            issue(f"{path}/onEvents", "event state must have at least one onEvents")
+
+        for pointer, target in _transitions(state, path):
+            if not isinstance(target, str):
+                issue(pointer, "transition target must be a state name")
+            elif target not in self.states:
+                issue(pointer, f"transition to unknown state {target!r}")
+
+        for i, handler in _objects(state.get("onErrors")):
+            refs = handler.get("errorRefs") or [handler.get("errorRef")]
+            if not isinstance(refs, list):
+                refs = [refs]
+            for ref in refs:
+                if not isinstance(ref, str):
+                    issue(f"{path}/onErrors/{i}", "errorRef must be an error name")
+                elif self.errors is not None and ref not in self.errors:
+                    issue(f"{path}/onErrors/{i}", f"unknown errorRef {ref!r}")
+
+        if self.functions is not None:
+            for action_path, action in _actions(state, path):
+                if "functionRef" not in action:
+                    continue
+                ref = _name(action["functionRef"], "refName")
+                if not isinstance(ref, str):
+                    issue(
+                        f"{action_path}/functionRef",
+                        "functionRef.refName must be a function name",
+                    )
+                elif ref not in self.functions:
+                    issue(
+                        f"{action_path}/functionRef",
+                        f"unknown functionRef.refName {ref!r}",
+                    )
+
+        if self.events is not None:
+            for pointer, ref in _event_refs(state, path):
+                if not isinstance(ref, str):
+                    issue(pointer, "event reference must be an event name")
+                elif ref not in self.events:
+                    issue(pointer, f"unknown event {ref!r}")
+
+        return issues
+
+    def check_workflow(self) -> list[ValidationIssue]:
+        """Check the rules that depend on the workflow as a whole."""
+        issues = []
+
+        for fields in ROOT_FIELDS:
+            if not any(field in self.workflow for field in fields):
+                names = " or ".join(repr(field) for field in fields)
+                issues.append(ValidationIssue("", f"missing required field {names}"))
+        for field in RECOMMENDED_ROOT_FIELDS:
+            if field not in self.workflow:
+                issues.append(
+                    ValidationIssue(
+                        "", f"missing recommended field {field!r}", warning=True
+                    )
+                )
+
+        if not isinstance(self.workflow.get("states"), list) or not self.states:
+            issues.append(ValidationIssue("/states", "workflow must have states"))
+            return issues
+
+        for index in self.malformed:
+            issues.append(
+                ValidationIssue(f"/states/{index}", "state must be an object")
+            )
+
+        start_given = "start" in self.workflow
+        if start_given and self.start is None:
+            issues.append(ValidationIssue("/start", "start must be a state name"))
+        elif start_given and self.start not in self.states:
+            issues.append(
+                ValidationIssue("/start", f"start state {self.start!r} does not exist")
+            )
+
+        for index, name in self.duplicates:
+            issues.append(
+                ValidationIssue(
+                    f"/states/{index}/name", f"duplicate state name {name!r}", name
+                )
+            )
+
+        if self.start is not None and self.start in self.states:
+            reachable = self.reachable()
+            for name, (index, state) in self.states.items():
+                if name not in reachable and not state.get("usedForCompensation"):
+                    issues.append(
+                        ValidationIssue(
+                            f"/states/{index}",
+                            f"state {name!r} is not reachable from start",
+                            name,
+                            warning=True,
+                        )
+                    )
+
+        return issues
+
+    def validate(self) -> list[ValidationIssue]:
+        issues = self.check_workflow()
+        for name, (index, state) in self.states.items():
+            issues.extend(self.check_state(index, state))
+        return issues
+
+
+def validate_workflow(workflow: str | dict) -> list[ValidationIssue]:
+    """
+    Check a workflow against the structural rules of the creation guidelines
+    (start state, transitions, errorRef/functionRef/event references,
+    unreachable states, ...) without starting the JVM.
+
+    Args:
+        workflow: The workflow as a JSON string or an already parsed dict
+
+    Returns:
+        list[ValidationIssue]: Every rule violation found, empty if none;
+        the ones Kogito accepts anyway are warnings, see has_errors
+    """
+    if isinstance(workflow, str):
+        try:
+            workflow = json.loads(workflow)
+        except json.JSONDecodeError as e:
+            return [ValidationIssue("", f"invalid JSON: {e}")]
+
+    if not isinstance(workflow, dict):
+        return [ValidationIssue("", "workflow must be a JSON object")]
+
+    return WorkflowGraph(workflow).validate()
+
+
+def format_issues(issues: list[ValidationIssue], kind: str = "structural error") -> str:
+    """Render validation issues like the executor reports invalid workflows."""
+    errors = sum(not issue.warning for issue in issues)
+    if errors:
+        lines = [f"[ERROR] Workflow is not valid: {errors} {kind}(s) found"]
+    else:
+        lines = [f"[WARN] {len(issues)} warning(s) found"]
+    lines.extend(f"  {issue}" for issue in issues)
+    return "\n".join(lines) + "\n"